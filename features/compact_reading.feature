@@ -0,0 +1,30 @@
+Feature: Compact fixed-point readings
+  As a developer running the collector at high sample rates
+  I want readings stored as fixed-point integers at fixed sensor positions
+  So that every cycle allocates less while dictionary style code keeps working
+
+  Scenario: Store temperatures as milli-degrees
+    Given I have a reading for sensors T1, T2, T3 and T4
+    When I set T1 to 85.1234 degrees
+    Then T1 should be stored as 85123 milli-degrees
+    And T1 should read 85.123 degrees
+    And the reading should only contain T1
+
+  Scenario: Dictionary view for backward compatibility
+    Given I have a reading for sensors T1, T2, T3 and T4
+    When I set all sensors to 85.0, 45.0, 15.0 and 55.0 degrees
+    Then the reading should equal the dictionary of the same temperatures
+    And the JSON encoding should decode to the same temperatures
+
+  Scenario: Collector readings share one sensor index
+    Given I have a collector with the dry-run backend
+    When I read all temperatures twice
+    And I add the efficiencies to the first reading
+    Then both readings should share the sensor index of the collector
+    And the first reading should contain the efficiency
+    And the exchanger view should hold the first reading's temperatures by role
+
+  Scenario: Compact messages use the fixed-point values
+    Given I have a reading for sensors T1, T2, T3 and T4
+    When I set all sensors to 85.004, 45.016, 15.0 and 55.5 degrees
+    Then the compact row should hold 8500, 4502, 1500 and 5550 centi-degrees
@@ -0,0 +1,46 @@
+Feature: Headless collector command line
+  As a system administrator
+  I want to run the collector unattended with options instead of prompts
+  So that it can run as a service and be profiled without hardware
+
+  Scenario: Run a bounded number of cycles without prompts
+    Given I have a file log sink option
+    When I run the collector with the mock backend for 3 cycles
+    Then the command should succeed
+    And the log file should contain 3 readings
+
+  Scenario: Read the buses in acquisition processes
+    Given I have a file log sink option
+    When I run the collector with the mock backend and bus processes for 3 cycles
+    Then the command should succeed
+    And the log file should contain at least 2 readings
+
+  Scenario: Profile the dry-run backend
+    Given I have a SQLite sink option
+    When I run the collector with the dry-run backend in profile mode for 5 cycles
+    Then the command should succeed
+    And the profile should report 5 calls of the read, efficiency and dispatch stages
+    And the profile should report 5 readings written by the sqlite sink
+
+  Scenario: Dry-run sensors are deterministic
+    Given I have a collector with the dry-run backend
+    When I read all temperatures twice
+    Then both readings should be identical
+
+  Scenario: Reject an unknown sink
+    Given I have a sink option "carrier-pigeon"
+    When I run the collector with the mock backend for 1 cycles
+    Then the command should fail
+
+  Scenario: Stop the registered sinks when startup fails
+    Given I have a file log sink option
+    And I have a sink option "carrier-pigeon" after it
+    When I run the collector with the mock backend for 1 cycles
+    Then the command should fail
+    And no sink worker thread should be left running
+
+  Scenario: Publish a plant config with one named exchanger as exchanger readings
+    Given I have a collector with a plant config of exchanger "hx1"
+    When I publish a reading through the pubsub sink path
+    Then the exchanger readings of "hx1" should have been published
+    And no plain temperature message should have been published
@@ -0,0 +1,37 @@
+Feature: Local live dashboard
+  As a plant operator on the LAN
+  I want live readings, history queries and pushed updates from the Pi
+  So that many viewers can watch without extra sensor reads or cloud round-trips
+
+  Scenario: Latest reading
+    Given I have a dashboard with 3 readings
+    When I request "/latest"
+    Then the response reading should have cursor 3
+
+  Scenario: Delta history since a cursor
+    Given I have a dashboard with 5 readings
+    When I request "/history?since=2"
+    Then the response should contain readings 3 to 5
+    And the response cursor should be 5
+    And the response should not be a reset
+
+  Scenario: History by time range
+    Given I have a dashboard with 5 readings
+    When I request the history from the second to the fourth reading time
+    Then the response should contain readings 2 to 3
+
+  Scenario: Cursor of readings that left the history
+    Given I have a dashboard keeping 3 of 6 readings
+    When I request "/history?since=1"
+    Then the response should contain readings 4 to 6
+    And the response should be a reset
+
+  Scenario: Server-sent events resume from the last event ID
+    Given I have a dashboard with 4 readings
+    When I open the event stream with last event ID 2
+    Then I should receive events 3 to 4
+    And a new reading should be pushed as event 5
+
+  Scenario: Listen on localhost unless configured
+    Given I have a dashboard started with the default listen address
+    Then the dashboard should only listen on "127.0.0.1"
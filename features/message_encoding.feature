@@ -0,0 +1,32 @@
+Feature: Compact message encoding
+  As a heat exchanger monitoring system on a metered cellular link
+  I want temperature messages encoded compactly
+  So that fewer bytes are sent per sample
+
+  Scenario: Encode a sample as fixed-point centi-degrees
+    Given I have temperature readings 85.004, 45.5, 15.25 and 55.0 at epoch 1761498647.757
+    When I build a compact row
+    Then the row should be 1761498647757, 8500, 4550, 1525 and 5500
+
+  Scenario: Delta encode a batch of samples
+    Given I have a batch of 5 samples taken 5 seconds apart
+    When I delta encode the batch
+    Then every row after the first should hold differences
+    And decoding the batch should restore the samples
+
+  Scenario: Round trip a batch through the binary format
+    Given I have a batch of 5 samples taken 5 seconds apart
+    When I pack the batch as binary
+    Then the binary message should be smaller than the verbose JSON
+    And decoding the binary message should give 5 samples
+
+  Scenario: Fall back to absolute rows for large deltas
+    Given I have a batch of 2 samples 400 degrees apart
+    When I pack the batch as binary
+    Then decoding the binary message should give 2 samples
+    And the decoded temperatures should match the samples
+
+  Scenario: Decode a compact JSON batch message
+    Given I have a batch of 3 samples taken 5 seconds apart
+    When I decode a compact batch message of the batch
+    Then I should get 3 verbose samples with temp1 to temp4
@@ -0,0 +1,36 @@
+Feature: Multi-exchanger plant configuration
+  As a plant room monitoring system
+  I want sensors grouped into named exchangers on several 1-Wire buses
+  So that one collector can monitor many heat exchangers
+
+  Background:
+    Given I have a plant config with exchangers "hx1" and "hx2" on buses "bus1" and "bus2"
+
+  Scenario: Parse the plant config
+    When I parse the plant config
+    Then it should have 8 sensors named by exchanger and role
+    And bus "bus1" should hold the sensors of "hx1"
+    And sensor "hx2.T4" should be on bus "bus1"
+
+  Scenario: Flat config is a single default exchanger
+    Given I have a flat config with sensors "T1", "T2", "T3", "T4"
+    When I parse the plant config
+    Then exchanger "default" should map role "T1" to sensor "T1"
+    And its efficiency key should be "Efficiency"
+
+  Scenario: Read buses in parallel
+    Given I have a plant temperature collector with slow sensors
+    When I read temperatures from all sensors
+    Then I should get readings from 8 sensors
+    And the buses should have been read on separate threads
+
+  Scenario: Calculate efficiency per exchanger
+    Given I have a plant temperature collector
+    When I read temperatures and add the efficiencies
+    Then "hx1.Efficiency" and "hx2.Efficiency" should be set
+    And the exchanger readings of "hx2" should have roles "T1", "T2", "T3", "T4" and "Efficiency"
+
+  Scenario: Binary batches carry the exchanger names
+    Given I have compact rows for exchangers "hx1" and "hx2"
+    When I pack the rows as binary and decode them
+    Then the decoded readings should be for exchangers "hx1" and "hx2"
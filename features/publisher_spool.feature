@@ -0,0 +1,68 @@
+Feature: Publisher spool
+  As a heat exchanger monitoring system on an unreliable uplink
+  I want unsent temperature readings to be spooled on disk
+  So that no readings are lost while the connection is down
+
+  Background:
+    Given I have a spooling publisher with a stub uplink
+
+  Scenario: Spool readings while the uplink is down
+    Given the uplink is down
+    When I publish 3 temperature readings
+    Then 3 readings should be spooled
+    And no messages should have been sent
+
+  Scenario: Backfill spooled readings once the uplink returns
+    Given the uplink is down
+    When I publish 5 temperature readings
+    And the uplink comes back
+    And I publish 1 temperature readings
+    Then the live reading should be sent before the backfill
+    And 5 readings should have been backfilled in 1 batch
+    And 0 readings should be spooled
+
+  Scenario: Backfill one batch per live reading
+    Given the uplink is down
+    When I publish 250 temperature readings
+    And the uplink comes back
+    And I publish 1 temperature readings
+    Then the live reading should be sent before the backfill
+    And 100 readings should have been backfilled in 1 batch
+    And 150 readings should be spooled
+
+  Scenario: Spool survives a restart
+    Given the uplink is down
+    When I publish 4 temperature readings
+    And the spool is reopened
+    Then 4 readings should be spooled
+
+  Scenario: Spool size is bounded
+    Given the spool holds at most 10 messages
+    And the uplink is down
+    When I publish 25 temperature readings
+    Then at most 10 readings should be spooled
+    And the newest reading should still be spooled
+
+  Scenario: Backfill compact readings after a restart with the json encoding
+    Given the uplink uses the compact encoding
+    And the uplink is down
+    When I publish 3 temperature readings
+    And the publisher restarts with the json encoding
+    And I publish 1 temperature readings
+    Then 3 readings should have been backfilled as json samples
+    And 0 readings should be spooled
+
+  Scenario: Backfill json readings after a restart with the binary encoding
+    Given the uplink uses the json encoding
+    And the uplink is down
+    When I publish 3 temperature readings
+    And the publisher restarts with the binary encoding
+    And I publish 1 temperature readings
+    Then 3 readings should have been backfilled as binary rows
+    And 0 readings should be spooled
+
+  Scenario: Discard an unreadable spooled payload
+    Given the uplink uses the binary encoding
+    And the spool holds an unreadable payload
+    When I publish 1 temperature readings
+    Then 0 readings should be spooled
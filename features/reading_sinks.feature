@@ -0,0 +1,50 @@
+Feature: Reading sinks
+  As a heat exchanger monitoring system
+  I want readings fanned out to several sinks on isolated workers
+  So that a slow or failing sink never delays acquisition or the other sinks
+
+  Background:
+    Given I have a temperature collector with mock sensors
+
+  Scenario: Fan out readings to several sinks
+    Given the collector has a "fast" recording sink
+    And the collector has a "second" recording sink
+    When I dispatch 10 readings
+    And the sinks are closed
+    Then sink "fast" should have written 10 readings
+    And sink "second" should have written 10 readings
+
+  Scenario: Slow sink does not delay acquisition or other sinks
+    Given the collector has a "fast" recording sink
+    And the collector has a slow "slow" sink with a queue of 2
+    When I dispatch 20 readings
+    Then dispatching should not have waited for the slow sink
+    And the sinks are closed
+    And sink "fast" should have written 20 readings
+    And sink "slow" should have dropped readings
+
+  Scenario: Failing sink with retry policy recovers
+    Given the collector has a "flaky" sink failing 2 times with retry policy
+    When I dispatch 1 readings
+    And the sinks are closed
+    Then sink "flaky" should have written 1 readings
+    And sink "flaky" should have 2 errors
+
+  Scenario: Callback sink keeps reading timestamps and does not repeat a partial batch
+    Given the collector has a "publish" callback sink failing once at reading 3 with retry policy
+    When I dispatch 5 readings taken one second apart
+    And the sinks are closed
+    Then the callback should have been called once per reading with its timestamp
+    And sink "publish" should have 1 errors
+
+  Scenario: Store readings in SQLite
+    Given the collector has a SQLite sink
+    When I dispatch 3 readings
+    And the sinks are closed
+    Then the SQLite database should hold 15 values
+
+  Scenario: Log readings to a file
+    Given the collector has a file log sink
+    When I dispatch 3 readings
+    And the sinks are closed
+    Then the log file should have 3 lines with efficiency
@@ -0,0 +1,66 @@
+Feature: Shared-memory reading ring
+  As a heat exchanger monitoring system on a multi-core Pi
+  I want acquisition processes to write readings into shared memory
+  So that other processes can read them without blocking acquisition
+
+  Scenario: Read records written to a ring
+    Given I have a reading ring with sensors "T1", "T2" and capacity 8
+    When I write 3 records to the ring
+    Then a reader should read 3 records since cursor 0
+    And the reader cursor should be 3
+    And the latest record should have T1 in degrees
+
+  Scenario: Lagging reader skips overwritten records
+    Given I have a reading ring with sensors "T1", "T2" and capacity 8
+    When I write 20 records to the ring
+    Then a reader should read 8 records since cursor 0
+    And the reader should have missed 12 records
+
+  Scenario: Failed sensor reads are left out
+    Given I have a reading ring with sensors "T1", "T2" and capacity 8
+    When I write a record without "T2"
+    Then the latest record should only have "T1"
+
+  Scenario: Acquire every bus in its own process
+    Given I have a plant config file with buses "bus1" and "bus2"
+    When I start multi-process acquisition
+    Then both bus rings should receive records
+    And the merged readings should have 8 sensors
+    And stopping the acquisition should remove the rings
+
+  Scenario: Reuse a stale ring left by a crashed run
+    Given I have a reading ring with sensors "T1", "T2" and capacity 8
+    When I write 3 records to the ring
+    And the writer crashes without removing the ring
+    And I create the ring again with sensors "T1", "T2" and capacity 8
+    Then the new writer should continue after 3 records
+
+  Scenario: Replace a stale ring with a different layout
+    Given I have a reading ring with sensors "T1", "T2" and capacity 8
+    When I write 3 records to the ring
+    And the writer crashes without removing the ring
+    And I create the ring again with sensors "T1", "T3" and capacity 8
+    Then the new writer should start an empty ring with sensors "T1" and "T3"
+
+  Scenario: Restart a dead acquisition process
+    Given I have a plant config file with buses "bus1" and "bus2"
+    When I start multi-process acquisition
+    And the acquisition process of "bus1" is killed
+    Then the acquisition process of "bus1" should be restarted
+    And both bus rings should receive new records
+    And stopping the acquisition should remove the rings
+
+  Scenario: Dispatch every ring record once with its own timestamp
+    Given I have a plant config file with buses "bus1" and "bus2"
+    When I start multi-process acquisition
+    And I read the acquired records twice
+    Then no record should have been read twice
+    And every record should keep its acquisition timestamp
+    And stopping the acquisition should remove the rings
+
+  Scenario: Restart a bus process when its sensors change
+    Given I have a plant config file with buses "bus1" and "bus2"
+    When I start multi-process acquisition
+    And the sensors of "bus2" are remapped in the config file
+    Then reading the records should restart the acquisition of "bus2" only
+    And stopping the acquisition should remove the rings
@@ -60,4 +60,12 @@ Feature: Temperature Collector
   Scenario: Test cold sensor temperature consistency
     Given I have a mock DS18B20 sensor with ID "567890123456789"
     When I get the temperature reading
-    Then the temperature should be between 10 and 20 degrees
\ No newline at end of file
+    Then the temperature should be between 10 and 20 degrees
+
+  Scenario: Hot-reload device mapping from the config file
+    Given I have a temperature collector watching a config file
+    When the config file remaps "T4", removes "T3" and adds "T5"
+    Then the config change should be detected
+    And reloading should report added "T5", removed "T3" and remapped "T4"
+    And sensor "T1" should keep its sensor object
+    And sensors "T1", "T2", "T4", "T5" should be configured
@@ -0,0 +1,45 @@
+Feature: Temperature subscriber
+  As a consumer of heat exchanger data
+  I want a subscriber that decodes, batches and fans out readings
+  So that many local consumers can keep up with many exchangers
+
+  Background:
+    Given I have a local websocket server standing in for Web PubSub
+
+  Scenario: Fan out decoded readings to several consumers
+    Given the server sends 2000 compact temperature messages
+    And I have a subscriber with a callback consumer and a queue consumer
+    When the subscriber runs until the server closes
+    Then both consumers should receive 2000 typed readings in order
+    And the readings should arrive in fewer batches than messages
+
+  Scenario: Reconnect and resume without duplicates
+    Given the server sends readings 1 to 5 and drops the connection
+    And the server then resends readings 3 to 8
+    And I have a subscriber with a callback consumer and a queue consumer
+    When the subscriber runs until the server closes
+    Then both consumers should receive 8 typed readings in order
+    And the subscriber should have reconnected once
+
+  Scenario: Slow consumer does not block the others
+    Given the server sends 200 compact temperature messages
+    And I have a subscriber with a fast consumer and a slow dropping consumer
+    When the subscriber runs until the server closes
+    Then the fast consumer should receive 200 typed readings
+    And the slow consumer should have dropped readings
+
+  Scenario: Deliver a spool backlog older than the live reading
+    Given the server sends reading 10 and then a backlog batch of readings 7 to 9
+    And the server then resends readings 9 to 10
+    And I have a subscriber with a callback consumer and a queue consumer
+    When the subscriber runs until the server closes
+    Then both consumers should receive readings 10, 7, 8 and 9
+    And the subscriber should have skipped 2 duplicates
+
+  Scenario: Back off when the websocket URL cannot be fetched
+    Given the server sends readings 1 to 3 and drops the connection
+    And fetching the websocket URL fails once
+    And I have a subscriber with a callback consumer and a queue consumer
+    When the subscriber runs until the server closes
+    Then both consumers should receive 3 typed readings in order
+    And the subscriber should have reconnected once
@@ -0,0 +1,40 @@
+Feature: Streaming thermal analytics
+  As a heat exchanger maintenance engineer
+  I want heat duty, LMTD, NTU and a fouling trend computed on the Pi
+  So that maintenance alerts do not need a cloud batch job
+
+  Scenario: Log mean temperature difference
+    Given I have temperature readings 90, 50, 20 and 40
+    When I calculate the LMTD
+    Then the LMTD should be approximately 39.15 K
+
+  Scenario: Heat duty, UA and NTU with configured flows
+    Given I have thermal analytics with hot and cold flows of 0.5 kg/s
+    When I compute the values for temperature readings 85, 45, 15 and 55
+    Then the heat duty should be approximately 83720 W
+    And the UA should be approximately 2790.7 W/K
+    And the NTU should be approximately 1.333
+
+  Scenario: Window summary
+    Given I have thermal analytics with a window of 60 seconds
+    When I add a reading every 10 seconds for 70 seconds
+    Then 1 window should have closed with 6 samples
+    And the window mean effectiveness should be approximately 57.1 percent
+
+  Scenario: Detect fouling from the effectiveness trend
+    Given I have thermal analytics with hourly windows and a fouling alert
+    When the effectiveness drops 1 percent per day for 10 days
+    Then the effectiveness trend should be approximately -1.0 percent per day
+    And exactly 1 fouling alert should have been raised
+
+  Scenario: Stable exchanger raises no alert
+    Given I have thermal analytics with hourly windows and a fouling alert
+    When the effectiveness stays constant for 10 days
+    Then no fouling alert should have been raised
+
+  Scenario: Crossed temperatures do not distort the UA trend
+    Given I have thermal analytics with flows of 0.5 kg/s, hourly windows and a fouling alert
+    When the temperatures stay constant for 4 days
+    And the temperatures cross for one hour
+    Then the windows should trend the UA
+    And no fouling alert should have been raised
@@ -0,0 +1,327 @@
+"""
+Compact wire encoding for published temperature messages
+
+A sample is encoded as a row of integers:
+    [epoch_ms, temp1, temp2, temp3, temp4]
+with temperatures in fixed-point centi-degrees, optionally followed by the
+exchanger name for plant configurations. Batches are delta encoded,
+the first row is absolute and every following row holds the difference to
+the previous one. Rows are sent as compact JSON arrays or packed binary.
+"""
+
+import json
+import struct
+import time
+from datetime import datetime
+from typing import List, Mapping, NamedTuple, Optional, Union
+
+# Message data fields, in row order after the timestamp
+FIELDS = ('temp1', 'temp2', 'temp3', 'temp4')
+# Sensor names feeding the fields
+SENSORS = ('T1', 'T2', 'T3', 'T4')
+
+ENCODINGS = ('json', 'compact', 'binary')
+
+COMPACT_MESSAGE = 'temperature_compact'
+COMPACT_BATCH = 'temperature_compact_batch'
+
+BINARY_VERSION = 1
+FLAG_DELTA = 0x01
+FLAG_EXCHANGERS = 0x02  # rows are followed by one length-prefixed UTF-8 name per row
+_HEADER = struct.Struct('<BBH')      # version, flags, row count
+_ROW = struct.Struct('<q4i')         # epoch_ms, 4x centi-degrees
+_DELTA_ROW = struct.Struct('<i4h')   # dt_ms, 4x centi-degree deltas
+_NAME_LENGTH = struct.Struct('<B')
+_INT16 = (-0x8000, 0x7FFF)
+_INT32 = (-0x80000000, 0x7FFFFFFF)
+
+
+class TemperatureReading(NamedTuple):
+    """Typed temperature sample decoded from a published message"""
+    timestamp: float  # epoch seconds
+    temp1: float
+    temp2: float
+    temp3: float
+    temp4: float
+    exchanger: str = ''
+
+
+def to_centi(value: float) -> int:
+    """Convert degrees to fixed-point centi-degrees"""
+    return int(round(value * 100))
+
+
+def sample_row(temperatures: Mapping, timestamp: Optional[float] = None,
+               exchanger: Optional[str] = None) -> list:
+    """
+    Build a compact row from sensor readings
+
+    Args:
+        temperatures: Reading (therm.reading) or dictionary with T1..T4 readings
+        timestamp: Epoch seconds (default: now)
+        exchanger: Exchanger name appended to the row
+
+    Returns:
+        [epoch_ms, temp1, temp2, temp3, temp4(, exchanger)] with temperatures in centi-degrees
+    """
+    if timestamp is None:
+        timestamp = time.time()
+    milli = getattr(temperatures, 'milli', None)
+    if milli is not None:
+        # Fixed-point reading, scale the stored milli-degrees without going through floats
+        values = [(milli(name) + 5) // 10 for name in SENSORS]
+    else:
+        values = [to_centi(temperatures[name]) for name in SENSORS]
+    row = [int(round(timestamp * 1000))] + values
+    if exchanger is not None:
+        row.append(exchanger)
+    return row
+
+
+def row_to_sample(row: List[int]) -> dict:
+    """
+    Convert a compact row back to the verbose message data format
+
+    Args:
+        row: [epoch_ms, temp1, temp2, temp3, temp4]
+
+    Returns:
+        Dictionary with temp1..temp4 in degrees and an ISO timestamp
+    """
+    sample = {field: value / 100 for field, value in zip(FIELDS, row[1:5])}
+    sample['timestamp'] = datetime.fromtimestamp(row[0] / 1000).isoformat()
+    if len(row) > 5:
+        sample['exchanger'] = row[5]
+    return sample
+
+
+def sample_to_row(sample: Mapping) -> list:
+    """
+    Convert a verbose message data payload to a compact row, reverse of row_to_sample
+
+    Args:
+        sample: Dictionary with temp1..temp4 in degrees and an ISO timestamp
+
+    Returns:
+        [epoch_ms, temp1, temp2, temp3, temp4(, exchanger)] with temperatures in centi-degrees
+    """
+    row = [int(round(datetime.fromisoformat(sample['timestamp']).timestamp() * 1000))]
+    row.extend(to_centi(float(sample[field])) for field in FIELDS)
+    if sample.get('exchanger') is not None:
+        row.append(sample['exchanger'])
+    return row
+
+
+def convert_payload(payload: Union[list, dict], encoding: str) -> Union[list, dict]:
+    """
+    Convert a message data payload to the payload format of an encoding
+
+    Verbose payloads are dictionaries, compact and binary payloads are rows,
+    so a payload stored under one encoding (e.g. in the publisher spool) can
+    be sent under another.
+
+    Args:
+        payload: Verbose sample or compact row
+        encoding: Target encoding, one of ENCODINGS
+
+    Returns:
+        Payload in the target format
+
+    Raises:
+        ValueError: If the encoding is unknown or the payload is malformed
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding {encoding!r}, expected one of {ENCODINGS}")
+    if isinstance(payload, list):
+        if len(payload) not in (5, 6) or not all(isinstance(value, int) for value in payload[:5]):
+            raise ValueError(f"Malformed compact row {payload!r}")
+        return row_to_sample(payload) if encoding == 'json' else payload
+    if not isinstance(payload, dict):
+        raise ValueError(f"Malformed payload {payload!r}")
+    return payload if encoding == 'json' else sample_to_row(payload)
+
+
+def encode_rows(rows: List[List[int]], delta: bool = True) -> List[List[int]]:
+    """
+    Delta encode a batch of rows
+
+    Args:
+        rows: Absolute rows, oldest first
+        delta: Encode every row but the first as difference to its predecessor
+
+    Returns:
+        Encoded rows
+    """
+    if not delta or len(rows) < 2:
+        return [list(row) for row in rows]
+    encoded = [list(rows[0])]
+    for previous, row in zip(rows, rows[1:]):
+        # zip stops at the numeric fields, an exchanger name is carried as is
+        encoded.append([value - last for value, last in zip(row[:5], previous)] + list(row[5:]))
+    return encoded
+
+
+def decode_rows(encoded: List[List[int]], delta: bool = True) -> List[List[int]]:
+    """
+    Reverse encode_rows
+
+    Args:
+        encoded: Encoded rows
+        delta: Rows are delta encoded
+
+    Returns:
+        Absolute rows
+    """
+    if not delta or len(encoded) < 2:
+        return [list(row) for row in encoded]
+    rows = [list(encoded[0])]
+    for row in encoded[1:]:
+        rows.append([value + last for value, last in zip(row[:5], rows[-1])] + list(row[5:]))
+    return rows
+
+
+def _fits_delta_row(row: List[int]) -> bool:
+    """Check if a delta row fits the packed delta layout"""
+    return (_INT32[0] <= row[0] <= _INT32[1]
+            and all(_INT16[0] <= value <= _INT16[1] for value in row[1:5]))
+
+
+def pack_rows(rows: list, delta: bool = True) -> bytes:
+    """
+    Pack absolute rows into the binary wire format
+
+    Delta rows use 16-bit temperature differences; if any difference does
+    not fit, the batch falls back to absolute rows. Exchanger names are
+    appended after the rows.
+
+    Args:
+        rows: Absolute rows, oldest first
+        delta: Try delta encoding
+
+    Returns:
+        Packed bytes
+    """
+    encoded = encode_rows(rows, delta)
+    if delta and len(encoded) > 1 and not all(_fits_delta_row(row) for row in encoded[1:]):
+        delta = False
+        encoded = rows
+    delta = delta and len(encoded) > 1
+    named = any(len(row) > 5 for row in rows)
+    flags = (FLAG_DELTA if delta else 0) | (FLAG_EXCHANGERS if named else 0)
+
+    parts = [_HEADER.pack(BINARY_VERSION, flags, len(rows))]
+    if rows:
+        parts.append(_ROW.pack(*encoded[0][:5]))
+    row_format = _DELTA_ROW if delta else _ROW
+    parts.extend(row_format.pack(*row[:5]) for row in encoded[1:])
+    if named:
+        for row in rows:
+            name = (row[5] if len(row) > 5 else '').encode()
+            parts.append(_NAME_LENGTH.pack(len(name)) + name)
+    return b''.join(parts)
+
+
+def unpack_rows(data: bytes) -> list:
+    """
+    Unpack the binary wire format into absolute rows
+
+    Args:
+        data: Packed bytes
+
+    Returns:
+        Absolute rows
+    """
+    version, flags, count = _HEADER.unpack_from(data, 0)
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary message version {version}")
+    if count == 0:
+        return []
+
+    offset = _HEADER.size
+    encoded = [list(_ROW.unpack_from(data, offset))]
+    offset += _ROW.size
+    row_format = _DELTA_ROW if flags & FLAG_DELTA else _ROW
+    for _ in range(count - 1):
+        encoded.append(list(row_format.unpack_from(data, offset)))
+        offset += row_format.size
+    rows = decode_rows(encoded, bool(flags & FLAG_DELTA))
+
+    if flags & FLAG_EXCHANGERS:
+        for row in rows:
+            (length,) = _NAME_LENGTH.unpack_from(data, offset)
+            offset += _NAME_LENGTH.size
+            row.append(bytes(data[offset:offset + length]).decode())
+            offset += length
+    return rows
+
+
+def decode_message(message: Union[str, bytes, dict]) -> List[dict]:
+    """
+    Decode any published temperature message into verbose samples
+
+    Handles verbose JSON (temperature_message / temperature_batch), compact
+    JSON arrays (temperature_compact / temperature_compact_batch) and the
+    binary format.
+
+    Args:
+        message: Raw websocket message or parsed JSON
+
+    Returns:
+        List of sample dictionaries with temp1..temp4 and timestamp
+    """
+    if isinstance(message, (bytes, bytearray, memoryview)):
+        return [row_to_sample(row) for row in unpack_rows(bytes(message))]
+    if isinstance(message, str):
+        message = json.loads(message)
+
+    message_type = message.get('type')
+    data = message.get('data')
+    if message_type == 'temperature_message':
+        return [data]
+    if message_type == 'temperature_batch':
+        return list(data)
+    if message_type == COMPACT_MESSAGE:
+        return [row_to_sample(data)]
+    if message_type == COMPACT_BATCH:
+        return [row_to_sample(row) for row in decode_rows(data['rows'], data.get('delta', True))]
+    raise ValueError(f"Unknown temperature message type {message_type!r}")
+
+
+def _row_to_reading(row: list) -> TemperatureReading:
+    """Convert a compact row to a typed reading"""
+    return TemperatureReading(row[0] / 1000, row[1] / 100, row[2] / 100, row[3] / 100, row[4] / 100,
+                              row[5] if len(row) > 5 else '')
+
+
+def _sample_to_reading(sample: dict) -> TemperatureReading:
+    """Convert a verbose sample to a typed reading"""
+    return TemperatureReading(datetime.fromisoformat(sample['timestamp']).timestamp(),
+                              *(float(sample[field]) for field in FIELDS),
+                              sample.get('exchanger', ''))
+
+
+def decode_readings(message: Union[str, bytes, dict]) -> List[TemperatureReading]:
+    """
+    Decode any published temperature message into typed readings
+
+    Same formats as decode_message, but compact and binary rows are
+    converted directly without building verbose dictionaries.
+
+    Args:
+        message: Raw websocket message or parsed JSON
+
+    Returns:
+        List of TemperatureReading, oldest first
+    """
+    if isinstance(message, (bytes, bytearray, memoryview)):
+        return [_row_to_reading(row) for row in unpack_rows(bytes(message))]
+    if isinstance(message, str):
+        message = json.loads(message)
+
+    message_type = message.get('type')
+    data = message.get('data')
+    if message_type == COMPACT_MESSAGE:
+        return [_row_to_reading(data)]
+    if message_type == COMPACT_BATCH:
+        return [_row_to_reading(row) for row in decode_rows(data['rows'], data.get('delta', True))]
+    return [_sample_to_reading(sample) for sample in decode_message(message)]
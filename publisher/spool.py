@@ -0,0 +1,240 @@
+"""
+Offline store-and-forward spool for the temperature publisher
+Readings that could not be sent are kept in a SQLite (WAL) file and
+drained in batches once the uplink is back
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import List, Tuple
+
+from .encoding import convert_payload
+
+log = logging.getLogger(__name__)
+
+
+class ReadingSpool:
+    """
+    Disk-backed FIFO of unsent message payloads with bounded size.
+    When a bound is exceeded the oldest entries are discarded.
+    """
+
+    def __init__(self, path: str = "spool.db", max_messages: int = 500000,
+                 max_bytes: int = 64 * 1024 * 1024):
+        """
+        Open (or create) the spool
+
+        Args:
+            path: Path to the SQLite spool file
+            max_messages: Maximum number of spooled messages
+            max_bytes: Maximum total payload size in bytes
+        """
+        self.path = path
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS spool ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL)"
+        )
+        self._count, self._bytes = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM spool"
+        ).fetchone()
+        if self._count:
+            log.info(f"Spool {path} holds {self._count} unsent messages")
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the spooled payloads"""
+        return self._bytes
+
+    def append(self, payload: dict):
+        """
+        Append one message payload to the spool
+
+        Args:
+            payload: JSON serializable payload
+        """
+        text = json.dumps(payload, separators=(',', ':'))
+        with self._lock:
+            self._db.execute("INSERT INTO spool (payload) VALUES (?)", (text,))
+            self._count += 1
+            self._bytes += len(text)
+            self._enforce_bounds()
+
+    def peek(self, limit: int) -> List[Tuple[int, dict]]:
+        """
+        Get the oldest spooled payloads without removing them
+
+        Args:
+            limit: Maximum number of payloads
+
+        Returns:
+            List of (id, payload) tuples, oldest first
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, payload FROM spool ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        return [(row_id, json.loads(text)) for row_id, text in rows]
+
+    def ack(self, last_id: int):
+        """
+        Remove all payloads up to and including last_id
+
+        Args:
+            last_id: Id of the last successfully sent payload
+        """
+        with self._lock:
+            count, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM spool WHERE id <= ?",
+                (last_id,)
+            ).fetchone()
+            self._db.execute("DELETE FROM spool WHERE id <= ?", (last_id,))
+            self._count -= count
+            self._bytes -= size
+
+    def _enforce_bounds(self):
+        """Drop the oldest payloads until the spool is within its bounds"""
+        while self._count > self.max_messages or (self._bytes > self.max_bytes and self._count > 1):
+            excess = max(self._count - self.max_messages, 1)
+            # Drop in chunks of at least 1% to keep trimming cheap
+            excess = max(excess, self._count // 100)
+            count, size, last_id = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0), MAX(id) FROM "
+                "(SELECT id, payload FROM spool ORDER BY id LIMIT ?)", (excess,)
+            ).fetchone()
+            self._db.execute("DELETE FROM spool WHERE id <= ?", (last_id,))
+            self._count -= count
+            self._bytes -= size
+            log.warning(f"Spool full, discarded {count} oldest messages")
+
+    def close(self):
+        """Close the spool file"""
+        with self._lock:
+            self._db.close()
+
+
+class SpoolingPublisher:
+    """
+    Store-and-forward wrapper around a TemperaturePublisher.
+    Live readings are always sent first, each followed by at most one
+    backfill batch limited by backfill_rate so they never starve live messages.
+    """
+
+    def __init__(self, publisher, spool: ReadingSpool, batch_size: int = 500,
+                 backfill_rate: float = 1000.0):
+        """
+        Initialize the spooling publisher
+
+        Args:
+            publisher: Publisher providing build_message, build_exchanger_samples,
+                       send_message and publish_batch
+            spool: Spool for unsent payloads
+            batch_size: Maximum number of payloads per backfill message
+            backfill_rate: Maximum number of backfilled payloads per second
+        """
+        self.publisher = publisher
+        self.spool = spool
+        self.batch_size = batch_size
+        self.backfill_rate = backfill_rate
+        self._tokens = float(batch_size)
+        self._last_refill = time.monotonic()
+
+    def publish_temperature(self, temperatures: dict, timestamp: float = None):
+        """
+        Publish temperature data, spooling it if the uplink is down
+
+        Args:
+            temperatures: Dictionary of temperature readings
+            timestamp: Epoch time the readings were taken (default: now)
+        """
+        message = self.publisher.build_message(temperatures, timestamp=timestamp)
+        if message is None:
+            return
+
+        try:
+            self.publisher.send_message(message)
+        except Exception as e:
+            log.warning(f"Publish failed, spooling reading ({len(self.spool) + 1} unsent): {e}")
+            self.spool.append(message['data'])
+            return
+
+        if len(self.spool):
+            self.backfill()
+
+    def publish_exchangers(self, exchanger_readings: dict, timestamp: float = None):
+        """
+        Publish the readings of several exchangers in one batch, spooling them if the uplink is down
+
+        Args:
+            exchanger_readings: Dictionary with exchanger names as keys and
+                                {T1..T4: temperature} as values
+            timestamp: Epoch time the readings were taken (default: now)
+        """
+        samples = self.publisher.build_exchanger_samples(exchanger_readings, timestamp)
+        if not samples:
+            return
+
+        try:
+            self.publisher.publish_batch(samples)
+        except Exception as e:
+            log.warning(f"Publish failed, spooling {len(samples)} readings ({len(self.spool) + len(samples)} unsent): {e}")
+            for sample in samples:
+                self.spool.append(sample)
+            return
+
+        if len(self.spool):
+            self.backfill()
+
+    def backfill(self) -> int:
+        """
+        Send at most one batch of spooled payloads within the backfill rate budget.
+        Called after every successful live publish, so live readings never wait
+        for more than one backfill message.
+
+        Returns:
+            Number of payloads sent
+        """
+        now = time.monotonic()
+        burst = max(float(self.batch_size), self.backfill_rate)
+        self._tokens = min(self._tokens + (now - self._last_refill) * self.backfill_rate, burst)
+        self._last_refill = now
+        if not len(self.spool) or self._tokens < 1:
+            return 0
+
+        batch = self.spool.peek(min(self.batch_size, int(self._tokens)))
+        # The spool may hold payloads of another encoding (e.g. from before a
+        # restart with a different configuration), send them in the current one
+        encoding = getattr(self.publisher, 'encoding', 'json')
+        payloads = []
+        for row_id, payload in batch:
+            try:
+                payloads.append(convert_payload(payload, encoding))
+            except (KeyError, TypeError, ValueError) as e:
+                # Never let one unreadable payload block the spool
+                log.error(f"Discarding unreadable spooled message {row_id}: {e}")
+        try:
+            if payloads:
+                self.publisher.publish_batch(payloads)
+        except Exception as e:
+            log.warning(f"Backfill failed, {len(self.spool)} messages remain spooled: {e}")
+            return 0
+        self.spool.ack(batch[-1][0])
+        self._tokens -= len(batch)
+
+        log.info(f"Backfilled {len(payloads)} spooled messages, {len(self.spool)} remaining")
+        return len(payloads)
@@ -0,0 +1,252 @@
+"""
+High-throughput temperature subscriber
+Decodes received messages into typed readings, batches them and fans the
+batches out to local consumers. The websocket is reconnected with backoff.
+"""
+
+import asyncio
+import inspect
+import random
+import time
+import logging
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set, Union
+
+import websockets
+
+from .encoding import TemperatureReading, decode_readings
+
+log = logging.getLogger(__name__)
+
+# Backpressure policies for a full consumer queue
+POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+
+class Consumer:
+    """
+    One local consumer of reading batches with its own bounded queue.
+    The target is either a callable (sync or async) called with each batch,
+    or an asyncio.Queue the batches are put into.
+    """
+
+    def __init__(self, name: str, target: Union[Callable, asyncio.Queue],
+                 maxsize: int = 100, policy: str = 'drop_oldest'):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy {policy!r}, expected one of {POLICIES}")
+        self.name = name
+        self.target = target
+        self.policy = policy
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+
+    async def offer(self, batch: List[TemperatureReading]):
+        """Queue a batch according to the backpressure policy"""
+        if self.policy == 'block':
+            await self.queue.put(batch)
+            return
+        if self.queue.full():
+            if self.policy == 'drop_newest':
+                self.dropped += len(batch)
+                return
+            self.dropped += len(self.queue.get_nowait())
+            self.queue.task_done()
+        self.queue.put_nowait(batch)
+
+    async def run(self):
+        """Deliver queued batches to the target"""
+        while True:
+            batch = await self.queue.get()
+            try:
+                if isinstance(self.target, asyncio.Queue):
+                    await self.target.put(batch)
+                else:
+                    result = self.target(batch)
+                    if inspect.isawaitable(result):
+                        await result
+                self.delivered += len(batch)
+            except Exception as e:
+                self.errors += 1
+                log.error(f"Consumer {self.name} failed: {e}")
+            finally:
+                self.queue.task_done()
+
+    def stats(self) -> Dict[str, int]:
+        """Delivery counters"""
+        return {'delivered': self.delivered, 'dropped': self.dropped,
+                'errors': self.errors, 'queued': self.queue.qsize()}
+
+
+class StreamingSubscriber:
+    """
+    Websocket subscriber with reconnect, batching and local fan-out.
+    Readings are deduplicated by (exchanger, epoch ms) over the last
+    dedup_window readings of every exchanger, so a backlog resent after a
+    reconnect is not delivered twice. Older readings that were never seen
+    (e.g. the publisher spool backfill, sent after the live reading) are
+    delivered, so consumers may receive readings out of timestamp order.
+    """
+
+    def __init__(self, url_factory: Callable[[], str], batch_size: int = 500,
+                 batch_interval: float = 0.1, min_backoff: float = 0.5,
+                 max_backoff: float = 60.0, dedup_window: int = 65536):
+        """
+        Initialize the subscriber
+
+        Args:
+            url_factory: Returns the websocket URL, called on every (re)connect
+                         so access tokens can be refreshed
+            batch_size: Maximum readings per batch
+            batch_interval: Maximum seconds a reading waits for its batch
+            min_backoff: First reconnect delay in seconds
+            max_backoff: Maximum reconnect delay in seconds
+            dedup_window: Recent readings remembered per exchanger to skip duplicates
+        """
+        self.url_factory = url_factory
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.consumers: Dict[str, Consumer] = {}
+        self.received = 0
+        self.decode_errors = 0
+        self.reconnects = 0
+        self.duplicates = 0
+        self.dedup_window = dedup_window
+        # Recently delivered epoch ms per exchanger, the deque gives the eviction order
+        self._seen: Dict[str, Set[int]] = {}
+        self._seen_order: Dict[str, Deque[int]] = {}
+        self._batch: List[TemperatureReading] = []
+        self._batch_started = 0.0
+
+    def add_consumer(self, name: str, target: Union[Callable, asyncio.Queue],
+                     maxsize: int = 100, policy: str = 'drop_oldest') -> Consumer:
+        """
+        Register a local consumer
+
+        Args:
+            name: Consumer name
+            target: Callable (sync or async) or asyncio.Queue receiving batches
+            maxsize: Maximum queued batches
+            policy: 'block' to apply backpressure to the websocket,
+                    'drop_oldest' or 'drop_newest' to drop batches when full
+
+        Returns:
+            The registered consumer
+        """
+        consumer = Consumer(name, target, maxsize, policy)
+        self.consumers[name] = consumer
+        return consumer
+
+    def stats(self) -> Dict[str, dict]:
+        """Subscriber and per-consumer counters"""
+        return {
+            'received': self.received,
+            'decode_errors': self.decode_errors,
+            'reconnects': self.reconnects,
+            'duplicates': self.duplicates,
+            'consumers': {name: consumer.stats() for name, consumer in self.consumers.items()},
+        }
+
+    async def _handle(self, message):
+        """Decode one message and add its new readings to the current batch"""
+        try:
+            readings = decode_readings(message)
+        except (ValueError, KeyError, TypeError) as e:
+            self.decode_errors += 1
+            log.warning(f"Could not decode message: {e}")
+            return
+
+        new_readings = [reading for reading in readings if self._first_seen(reading)]
+        self.duplicates += len(readings) - len(new_readings)
+        if not new_readings:
+            return
+        readings = new_readings
+        self.received += len(readings)
+
+        if not self._batch:
+            self._batch_started = time.monotonic()
+        self._batch.extend(readings)
+        if len(self._batch) >= self.batch_size:
+            await self._flush()
+
+    def _first_seen(self, reading: TemperatureReading) -> bool:
+        """Remember a reading, False if it was already delivered"""
+        seen = self._seen.get(reading.exchanger)
+        if seen is None:
+            seen = self._seen[reading.exchanger] = set()
+            self._seen_order[reading.exchanger] = deque()
+        key = int(round(reading.timestamp * 1000))
+        if key in seen:
+            return False
+        order = self._seen_order[reading.exchanger]
+        seen.add(key)
+        order.append(key)
+        if len(order) > self.dedup_window:
+            seen.discard(order.popleft())
+        return True
+
+    async def _flush(self):
+        """Fan the current batch out to all consumers"""
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        for consumer in self.consumers.values():
+            await consumer.offer(batch)
+
+    async def _receive(self, ws):
+        """Receive messages until the connection closes"""
+        while True:
+            timeout = None
+            if self._batch:
+                timeout = max(self._batch_started + self.batch_interval - time.monotonic(), 0)
+            try:
+                message = await asyncio.wait_for(ws.recv(), timeout)
+            except asyncio.TimeoutError:
+                await self._flush()
+                continue
+            await self._handle(message)
+
+    async def run(self, max_reconnects: Optional[int] = None):
+        """
+        Receive and fan out readings, reconnecting with exponential backoff
+
+        Args:
+            max_reconnects: Stop after this many reconnects (default: run forever)
+        """
+        tasks = [asyncio.ensure_future(consumer.run()) for consumer in self.consumers.values()]
+        loop = asyncio.get_running_loop()
+        backoff = self.min_backoff
+        try:
+            while True:
+                try:
+                    # Blocking token request, keep it off the event loop
+                    url = await loop.run_in_executor(None, self.url_factory)
+                except Exception as e:
+                    # e.g. azure.core.exceptions.ServiceRequestError while the uplink is down
+                    log.warning(f"Could not get the websocket URL: {e}")
+                else:
+                    try:
+                        async with websockets.connect(url) as ws:
+                            log.info('connected')
+                            backoff = self.min_backoff
+                            await self._receive(ws)
+                    except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+                        log.warning(f"Connection lost: {e}")
+                await self._flush()
+
+                if max_reconnects is not None and self.reconnects >= max_reconnects:
+                    break
+                self.reconnects += 1
+                delay = backoff * random.uniform(0.5, 1.0)
+                log.info(f"Reconnecting in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                backoff = min(backoff * 2, self.max_backoff)
+
+            # Let the consumers drain what was received
+            for consumer in self.consumers.values():
+                await consumer.queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
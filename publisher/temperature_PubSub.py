@@ -5,6 +5,9 @@ from datetime import datetime
 from azure.messaging.webpubsubservice import WebPubSubServiceClient
 import logging
 import websockets
+from .encoding import (ENCODINGS, SENSORS, COMPACT_MESSAGE, COMPACT_BATCH, sample_row,
+                       encode_rows, pack_rows, decode_message)
+from .subscriber import StreamingSubscriber
 
 log = logging.getLogger(__name__)
 
@@ -13,50 +16,151 @@ class TemperaturePublisher:
     TemperaturePublisher publishes temperature data to Azure Web PubSub service.
     """
 
-    def __init__(self, connection_string: str, hub_name: str):
+    def __init__(self, connection_string: str, hub_name: str, encoding: str = 'json'):
         """
         Initialize the TemperaturePublisher
         
         Args:
             connection_string: Azure Web PubSub connection string
             hub_name: Name of the Web PubSub hub
+            encoding: Wire encoding, 'json' (verbose), 'compact' (JSON arrays)
+                      or 'binary' (packed rows), see publisher.encoding
         """
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding {encoding!r}, expected one of {ENCODINGS}")
         self.client = WebPubSubServiceClient.from_connection_string(
             connection_string, hub=hub_name
         )
         self.hub_name = hub_name
+        self.encoding = encoding
 
-    def publish_temperature(self, temperatures: dict):
+    def build_message(self, temperatures: dict, exchanger: str = None, timestamp: float = None):
         """
-        Publish temperature data to the Web PubSub service
+        Build the Web PubSub message for one set of temperature readings
         
         Args:
-            temperatures: Dictionary of temperature readings
+            temperatures: Reading (therm.reading), exchanger view or dictionary of
+                          temperature readings (T1..T4)
+            exchanger: Exchanger name added to the message (plant configurations)
+            timestamp: Epoch time the readings were taken (default: now)
+            
+        Returns:
+            Message dictionary or None if the readings are incomplete
         """
-        if len(temperatures) < 4:
+        if any(temperatures.get(name) is None for name in SENSORS):
             print("Insufficient temperature data to publish.")
-            return
+            return None
+
+        if self.encoding != 'json':
+            return {"data": sample_row(temperatures, timestamp, exchanger), "type": COMPACT_MESSAGE}
         
+        taken = datetime.now() if timestamp is None else datetime.fromtimestamp(timestamp)
         message = {
             "data": {
                 "temp1": temperatures['T1'],
                 "temp2": temperatures['T2'],
                 "temp3": temperatures['T3'],
                 "temp4": temperatures['T4'],
-                "timestamp": datetime.now().isoformat(),#'2025-10-26T17:10:47.757Z'
+                "timestamp": taken.isoformat(),#'2025-10-26T17:10:47.757Z'
                 },
             "type": 'temperature_message'
-        }        
+        }
+        if exchanger is not None:
+            message["data"]["exchanger"] = exchanger
+        return message
+
+    def build_exchanger_samples(self, exchanger_readings: dict, timestamp: float = None) -> list:
+        """
+        Build the message data payloads for several exchangers
         
-        self.client.send_to_all(message)
-        log.debug(f"Published temperatures to {self.hub_name}")
+        Args:
+            exchanger_readings: Dictionary with exchanger names as keys and
+                                {T1..T4: temperature} as values
+                                (see TemperatureCollector.exchanger_readings)
+            timestamp: Epoch time the readings were taken (default: now)
+            
+        Returns:
+            List of payloads for the exchangers with complete readings
+        """
+        samples = []
+        for exchanger, temperatures in exchanger_readings.items():
+            message = self.build_message(temperatures, exchanger=exchanger, timestamp=timestamp)
+            if message is not None:
+                samples.append(message["data"])
+        return samples
+
+    def send_message(self, message: dict):
+        """
+        Send a prebuilt message to all hub connections
+        
+        Args:
+            message: Message dictionary
+        """
+        if self.encoding == 'binary':
+            rows = message['data']['rows'] if message['type'] == COMPACT_BATCH else [message['data']]
+            self.client.send_to_all(pack_rows(rows), content_type='application/octet-stream')
+        else:
+            self.client.send_to_all(message)
+        log.debug(f"Published {message['type']} to {self.hub_name}")
+
+    def publish_temperature(self, temperatures: dict, timestamp: float = None):
+        """
+        Publish temperature data to the Web PubSub service
+        
+        Args:
+            temperatures: Dictionary of temperature readings
+            timestamp: Epoch time the readings were taken (default: now)
+        """
+        message = self.build_message(temperatures, timestamp=timestamp)
+        if message is None:
+            return
+        
+        self.send_message(message)
+
+    def publish_exchangers(self, exchanger_readings: dict, timestamp: float = None):
+        """
+        Publish the readings of several exchangers in a single batch message
+        
+        Args:
+            exchanger_readings: Dictionary with exchanger names as keys and
+                                {T1..T4: temperature} as values
+            timestamp: Epoch time the readings were taken (default: now)
+        """
+        self.publish_batch(self.build_exchanger_samples(exchanger_readings, timestamp))
+
+    def publish_batch(self, samples: list):
+        """
+        Publish several samples (message "data" payloads) in a single message
+        
+        Args:
+            samples: List of message data payloads, oldest first
+        """
+        if not samples:
+            return
+
+        if self.encoding == 'binary':
+            # Rows stay absolute here, pack_rows applies the delta encoding
+            self.send_message({"data": {"rows": samples, "delta": False}, "type": COMPACT_BATCH})
+            return
+        if self.encoding == 'compact':
+            self.send_message({
+                "data": {"rows": encode_rows(samples), "delta": True},
+                "type": COMPACT_BATCH
+            })
+            return
+        
+        self.send_message({
+            "data": samples,
+            "type": 'temperature_batch'
+        })
 
 
 async def connect(url):
     async with websockets.connect(url) as ws:
         log.info('connected')
         while True:
-            log.info('Received message: ' + await ws.recv())
+            for sample in decode_message(await ws.recv()):
+                log.info(f'Received sample: {sample}')
 
 class TemperatureSubscriber:
     """
@@ -76,6 +180,34 @@ class TemperatureSubscriber:
         )
         self.hub_name = hub_name
 
+    @staticmethod
+    def decode_message(message) -> list:
+        """
+        Decode a received message in any publisher encoding
+        
+        Args:
+            message: Raw websocket message (str or bytes) or parsed JSON
+            
+        Returns:
+            List of sample dictionaries with temp1..temp4 and timestamp
+        """
+        return decode_message(message)
+
+    def streaming_subscriber(self, **kwargs) -> StreamingSubscriber:
+        """
+        Create a reconnecting subscriber with batching and local fan-out.
+        A fresh client access token is requested on every (re)connect.
+        
+        Args:
+            **kwargs: Options for StreamingSubscriber (batch_size, batch_interval, ...)
+            
+        Returns:
+            StreamingSubscriber, register consumers then run it
+        """
+        return StreamingSubscriber(
+            lambda: self.client.get_client_access_token()['url'], **kwargs
+        )
+
     def receive_temperature(self, receiveClb = connect ):
         """
         Receive temperature data from the Web PubSub service
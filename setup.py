@@ -44,14 +44,15 @@ setup(
     include_package_data=True,
     entry_points={
         "console_scripts": [
-            "heat-exchanger-monitor=therm.temperature_collector:main",
-            "therm-collector=therm.temperature_collector:main",
+            "heat-exchanger-monitor=therm.cli:main",
+            "therm-collector=therm.cli:main",
         ],
     },
     install_requires=[
         "w1thermsensor>=1.0.5; platform_system=='Linux'",
     ],
     extras_require={
+        "pubsub": ["azure-messaging-webpubsubservice", "websockets"],
         "test": ["pytest>=6.0", "pytest-bdd>=6.0", "pytest-mock>=3.0"],
         "dev": ["pytest>=6.0", "pytest-bdd>=6.0", "pytest-mock>=3.0", "black", "flake8"]
     },
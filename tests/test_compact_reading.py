@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test file for the compact reading type using pytest-bdd
+"""
+
+import json
+import os
+import sys
+import pytest
+from pytest_bdd import scenario, given, when, then, parsers
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from therm.reading import Reading, SensorIndex
+from therm.temperature_collector import TemperatureCollector
+from publisher.encoding import sample_row
+
+
+SENSORS = ('T1', 'T2', 'T3', 'T4')
+
+
+# BDD Scenarios
+@scenario('../features/compact_reading.feature', 'Store temperatures as milli-degrees')
+def test_milli_degrees():
+    """Test fixed-point storage"""
+    pass
+
+@scenario('../features/compact_reading.feature', 'Dictionary view for backward compatibility')
+def test_dictionary_view():
+    """Test the mapping interface"""
+    pass
+
+@scenario('../features/compact_reading.feature', 'Collector readings share one sensor index')
+def test_collector_readings():
+    """Test readings from the collector"""
+    pass
+
+@scenario('../features/compact_reading.feature', 'Compact messages use the fixed-point values')
+def test_compact_row():
+    """Test compact encoding of a reading"""
+    pass
+
+# Step definitions
+@given('I have a reading for sensors T1, T2, T3 and T4')
+def empty_reading():
+    """Create an empty reading"""
+    pytest.reading = Reading(SensorIndex(SENSORS))
+
+@given('I have a collector with the dry-run backend')
+def dry_run_collector():
+    """Create a collector with deterministic sensors"""
+    pytest.collector = TemperatureCollector(watch_config=False, backend='dry-run')
+
+@when(parsers.parse('I set T1 to {value:f} degrees'))
+def set_t1(value):
+    """Set one sensor"""
+    pytest.reading['T1'] = value
+
+@when(parsers.parse('I set all sensors to {t1:f}, {t2:f}, {t3:f} and {t4:f} degrees'))
+def set_all(t1, t2, t3, t4):
+    """Set every sensor"""
+    pytest.temperatures = dict(zip(SENSORS, (t1, t2, t3, t4)))
+    pytest.reading.update(pytest.temperatures)
+
+@when('I read all temperatures twice')
+def read_twice():
+    """Read the sensors twice"""
+    pytest.readings = [pytest.collector.read_all_temperatures() for _ in range(2)]
+
+@when('I add the efficiencies to the first reading')
+def add_efficiencies():
+    """Add the efficiencies in place"""
+    pytest.collector.add_efficiencies(pytest.readings[0])
+
+@then(parsers.parse('T1 should be stored as {milli:d} milli-degrees'))
+def check_milli(milli):
+    """Verify the stored integer"""
+    assert pytest.reading.milli('T1') == milli
+
+@then(parsers.parse('T1 should read {value:f} degrees'))
+def check_degrees(value):
+    """Verify the value in degrees"""
+    assert pytest.reading['T1'] == value
+
+@then('the reading should only contain T1')
+def check_only_t1():
+    """Verify unset sensors are left out"""
+    assert list(pytest.reading) == ['T1']
+    assert len(pytest.reading) == 1
+    assert 'T2' not in pytest.reading
+    assert pytest.reading.get('T2') is None
+
+@then('the reading should equal the dictionary of the same temperatures')
+def check_dictionary():
+    """Verify the mapping interface"""
+    assert pytest.reading == pytest.temperatures
+    assert pytest.reading.as_dict() == pytest.temperatures
+    assert dict(pytest.reading.items()) == pytest.temperatures
+
+@then('the JSON encoding should decode to the same temperatures')
+def check_json():
+    """Verify the JSON encoding"""
+    assert json.loads(pytest.reading.to_json()) == pytest.temperatures
+
+@then('both readings should share the sensor index of the collector')
+def check_shared_index():
+    """Verify the readings share one index"""
+    for reading in pytest.readings:
+        assert isinstance(reading, Reading)
+        assert reading.index is pytest.collector.index
+    assert list(pytest.readings[1]) == list(pytest.collector.device_mapping)
+
+@then('the first reading should contain the efficiency')
+def check_efficiency():
+    """Verify the efficiency was stored in the reading"""
+    reading = pytest.readings[0]
+    expected = pytest.collector.calculate_efficiency(reading)
+    assert reading['Efficiency'] == pytest.approx(expected, abs=0.001)
+
+@then("the exchanger view should hold the first reading's temperatures by role")
+def check_exchanger_view():
+    """Verify the exchanger view"""
+    reading = pytest.readings[0]
+    view = pytest.collector.exchanger_readings(reading)['default']
+    assert view == reading.as_dict()
+    assert view.milli('T1') == reading.milli('T1')
+
+@then(parsers.parse('the compact row should hold {c1:d}, {c2:d}, {c3:d} and {c4:d} centi-degrees'))
+def check_compact_row(c1, c2, c3, c4):
+    """Verify the compact row"""
+    assert sample_row(pytest.reading, timestamp=1761498647.0)[1:] == [c1, c2, c3, c4]
+    assert sample_row(pytest.reading.as_dict(), timestamp=1761498647.0)[1:] == [c1, c2, c3, c4]
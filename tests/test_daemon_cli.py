@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Test file for the headless collector command line using pytest-bdd
+"""
+
+import json
+import os
+import sys
+import threading
+import pytest
+from pytest_bdd import scenario, given, when, then, parsers
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from therm.cli import main, publish_reading
+from therm.temperature_collector import TemperatureCollector
+
+
+# BDD Scenarios
+@scenario('../features/daemon_cli.feature', 'Run a bounded number of cycles without prompts')
+def test_bounded_cycles():
+    """Test a non-interactive run"""
+    pass
+
+@scenario('../features/daemon_cli.feature', 'Read the buses in acquisition processes')
+def test_bus_processes():
+    """Test the --processes option"""
+    pass
+
+@scenario('../features/daemon_cli.feature', 'Profile the dry-run backend')
+def test_profile_dry_run():
+    """Test the profiling mode"""
+    pass
+
+@scenario('../features/daemon_cli.feature', 'Dry-run sensors are deterministic')
+def test_dry_run_backend():
+    """Test the dry-run backend"""
+    pass
+
+@scenario('../features/daemon_cli.feature', 'Reject an unknown sink')
+def test_unknown_sink():
+    """Test an invalid sink option"""
+    pass
+
+@scenario('../features/daemon_cli.feature', 'Stop the registered sinks when startup fails')
+def test_startup_failure_closes_sinks():
+    """Test no sink worker is leaked by a failed startup"""
+    pass
+
+@scenario('../features/daemon_cli.feature', 'Publish a plant config with one named exchanger as exchanger readings')
+def test_publish_single_named_exchanger():
+    """Test the pubsub sink with a one-exchanger plant config"""
+    pass
+
+
+class RecordingPublisher:
+    """Records what the pubsub sink publishes"""
+
+    def __init__(self):
+        self.temperatures = []
+        self.exchangers = []
+
+    def publish_temperature(self, temperatures, timestamp=None):
+        self.temperatures.append(temperatures)
+
+    def publish_exchangers(self, exchanger_readings, timestamp=None):
+        self.exchangers.append({name: dict(group) for name, group in exchanger_readings.items()})
+
+# Step definitions
+@given('I have a file log sink option')
+def file_sink_option(tmp_path):
+    """Log to a temporary file"""
+    pytest.log_path = str(tmp_path / "temperature_log.txt")
+    pytest.sink_options = ['--sink', f'file:{pytest.log_path}']
+
+@given('I have a SQLite sink option')
+def sqlite_sink_option(tmp_path):
+    """Store in a temporary database"""
+    pytest.sink_options = ['--sink', f"sqlite:{tmp_path / 'readings.db'}"]
+
+@given(parsers.parse('I have a sink option "{spec}"'))
+def sink_option(spec):
+    """Use the given sink specification"""
+    pytest.sink_options = ['--sink', spec]
+
+@given(parsers.parse('I have a sink option "{spec}" after it'))
+def another_sink_option(spec):
+    """Add a sink specification after the previous ones"""
+    pytest.sink_options += ['--sink', spec]
+
+@given('I have a collector with the dry-run backend')
+def dry_run_collector():
+    """Create a collector with deterministic sensors"""
+    pytest.collector = TemperatureCollector(watch_config=False, backend='dry-run')
+
+@given(parsers.parse('I have a collector with a plant config of exchanger "{exchanger}"'))
+def single_exchanger_collector(exchanger, tmp_path):
+    """Create a collector with one named exchanger"""
+    config_path = tmp_path / "plant.json"
+    config_path.write_text(json.dumps({"exchangers": {exchanger: {"sensors": {
+        "T1": "28-000000000001", "T2": "28-000000000002",
+        "T3": "28-000000000003", "T4": "28-000000000004"}}}}))
+    pytest.collector = TemperatureCollector(str(config_path), watch_config=False, backend='dry-run')
+
+@when('I publish a reading through the pubsub sink path')
+def publish_through_sink_path():
+    """Publish one reading the way the pubsub sink does"""
+    pytest.publisher = RecordingPublisher()
+    temperatures = pytest.collector.read_all_temperatures()
+    pytest.collector.add_efficiencies(temperatures)
+    publish_reading(pytest.collector, pytest.publisher, temperatures)
+
+@when(parsers.parse('I run the collector with the mock backend for {cycles:d} cycles'))
+def run_mock_cycles(cycles):
+    """Run the command line for a number of cycles"""
+    pytest.exit_code = main(['--backend', 'mock', '--cycles', str(cycles), '--interval', '0',
+                             '--no-watch', '--log-level', 'ERROR'] + pytest.sink_options)
+
+@when(parsers.parse('I run the collector with the mock backend and bus processes for {cycles:d} cycles'))
+def run_bus_processes(cycles):
+    """Run the command line with one acquisition process per bus"""
+    pytest.exit_code = main(['--backend', 'mock', '--cycles', str(cycles), '--interval', '0.2',
+                             '--processes', '--no-watch', '--log-level', 'ERROR'] + pytest.sink_options)
+
+@when(parsers.parse('I run the collector with the dry-run backend in profile mode for {cycles:d} cycles'))
+def run_profile(cycles, capsys):
+    """Run the profiling mode"""
+    pytest.exit_code = main(['--dry-run', '--profile', str(cycles), '--no-watch',
+                             '--log-level', 'ERROR'] + pytest.sink_options)
+    pytest.report = capsys.readouterr().out.splitlines()
+
+@when('I read all temperatures twice')
+def read_twice():
+    """Read the sensors twice"""
+    pytest.readings = [pytest.collector.read_all_temperatures() for _ in range(2)]
+
+@then('the command should succeed')
+def check_success():
+    """Verify the exit code"""
+    assert pytest.exit_code == 0
+
+@then('the command should fail')
+def check_failure():
+    """Verify the exit code"""
+    assert pytest.exit_code == 1
+
+@then('no sink worker thread should be left running')
+def check_no_sink_threads():
+    """Verify the sinks registered before the failure were stopped"""
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith('sink-')]
+
+@then(parsers.parse('the log file should contain {count:d} readings'))
+def check_log_lines(count):
+    """Verify the logged readings"""
+    with open(pytest.log_path) as f:
+        assert len(f.read().splitlines()) == count
+
+@then(parsers.parse('the log file should contain at least {count:d} readings'))
+def check_log_lines_at_least(count):
+    """Verify the logged records, bus processes may write more than one per cycle"""
+    with open(pytest.log_path) as f:
+        assert len(f.read().splitlines()) >= count
+
+def report_row(name):
+    return next(line.split() for line in pytest.report if line.split()[:1] == [name])
+
+@then(parsers.parse('the profile should report {calls:d} calls of the read, efficiency and dispatch stages'))
+def check_profile_stages(calls):
+    """Verify the per-stage breakdown"""
+    for stage in ('read', 'efficiency', 'dispatch'):
+        assert int(report_row(stage)[1]) == calls
+
+@then(parsers.parse('the profile should report {count:d} readings written by the sqlite sink'))
+def check_profile_sink(count):
+    """Verify the sink breakdown"""
+    assert int(report_row('sqlite')[1]) == count
+
+@then('both readings should be identical')
+def check_identical():
+    """Verify deterministic readings"""
+    assert pytest.readings[0] == pytest.readings[1]
+    assert len(pytest.readings[0]) == 4
+
+@then(parsers.parse('the exchanger readings of "{exchanger}" should have been published'))
+def check_exchangers_published(exchanger):
+    """Verify the exchanger batch"""
+    assert len(pytest.publisher.exchangers) == 1
+    group = pytest.publisher.exchangers[0][exchanger]
+    assert set(group) == {'T1', 'T2', 'T3', 'T4', 'Efficiency'}
+
+@then('no plain temperature message should have been published')
+def check_no_plain_message():
+    """Verify the plain message path was not used"""
+    assert pytest.publisher.temperatures == []
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test file for the local dashboard server using pytest-bdd
+"""
+
+import json
+import os
+import sys
+import urllib.request
+import pytest
+from pytest_bdd import scenario, given, when, then, parsers
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from therm.history import ReadingHistory
+from therm.dashboard import DashboardServer
+
+
+EPOCH = 1761498647.0
+
+
+def add_readings(history, count):
+    for i in range(count):
+        history.append(EPOCH + i * 5, {'T1': 80.0 + i, 'T2': 50.0, 'T3': 20.0, 'T4': 40.0,
+                                       'Efficiency': 33.3})
+
+
+def start_server(history):
+    pytest.server = DashboardServer(history, host='127.0.0.1', port=0)
+    pytest.server.start()
+
+
+def url(path):
+    return f"http://127.0.0.1:{pytest.server.port}{path}"
+
+
+@pytest.fixture(autouse=True)
+def stop_server():
+    """Stop the dashboard after every scenario"""
+    pytest.server = None
+    pytest.stream = None
+    yield
+    if pytest.stream is not None:
+        pytest.stream.close()
+    if pytest.server is not None:
+        pytest.server.stop()
+
+
+def read_event(stream):
+    event = {}
+    for line in stream:
+        line = line.decode().rstrip('\n')
+        if not line:
+            return event
+        if line.startswith(':'):
+            continue
+        field, _, value = line.partition(': ')
+        event[field] = value
+    return event
+
+
+# BDD Scenarios
+@scenario('../features/local_dashboard.feature', 'Latest reading')
+def test_latest():
+    """Test the latest reading"""
+    pass
+
+@scenario('../features/local_dashboard.feature', 'Delta history since a cursor')
+def test_history_since():
+    """Test delta history queries"""
+    pass
+
+@scenario('../features/local_dashboard.feature', 'History by time range')
+def test_history_range():
+    """Test time range history queries"""
+    pass
+
+@scenario('../features/local_dashboard.feature', 'Cursor of readings that left the history')
+def test_history_reset():
+    """Test a cursor older than the history"""
+    pass
+
+@scenario('../features/local_dashboard.feature', 'Server-sent events resume from the last event ID')
+def test_events():
+    """Test server-sent events"""
+    pass
+
+@scenario('../features/local_dashboard.feature', 'Listen on localhost unless configured')
+def test_default_host():
+    """Test the unauthenticated dashboard is not exposed by default"""
+    pass
+
+# Step definitions
+@given(parsers.parse('I have a dashboard with {count:d} readings'))
+def dashboard_with_readings(count):
+    """Start a dashboard on a filled history"""
+    pytest.history = ReadingHistory()
+    add_readings(pytest.history, count)
+    start_server(pytest.history)
+
+@given(parsers.parse('I have a dashboard keeping {capacity:d} of {count:d} readings'))
+def dashboard_with_small_history(capacity, count):
+    """Start a dashboard on a history smaller than the readings"""
+    pytest.history = ReadingHistory(capacity)
+    add_readings(pytest.history, count)
+    start_server(pytest.history)
+
+@when(parsers.parse('I request "{path}"'))
+def request_path(path):
+    """Request a dashboard path"""
+    with urllib.request.urlopen(url(path), timeout=5) as response:
+        pytest.response = json.loads(response.read())
+
+@when('I request the history from the second to the fourth reading time')
+def request_time_range():
+    """Request a time range"""
+    request_path(f"/history?start={EPOCH + 5}&end={EPOCH + 15}")
+
+@when(parsers.parse('I open the event stream with last event ID {event_id:d}'))
+def open_event_stream(event_id):
+    """Open the server-sent event stream"""
+    request = urllib.request.Request(url("/events"), headers={'Last-Event-ID': str(event_id)})
+    pytest.stream = urllib.request.urlopen(request, timeout=5)
+
+@then(parsers.parse('the response reading should have cursor {cursor:d}'))
+def check_latest_cursor(cursor):
+    """Verify the latest reading"""
+    assert pytest.response['cursor'] == cursor
+    assert pytest.response['temperatures']['T1'] == 80.0 + cursor - 1
+
+@then(parsers.parse('the response should contain readings {first:d} to {last:d}'))
+def check_readings(first, last):
+    """Verify the returned readings"""
+    assert [r['cursor'] for r in pytest.response['readings']] == list(range(first, last + 1))
+
+@then(parsers.parse('the response cursor should be {cursor:d}'))
+def check_cursor(cursor):
+    """Verify the response cursor"""
+    assert pytest.response['cursor'] == cursor
+
+@then('the response should not be a reset')
+def check_no_reset():
+    """Verify no readings were missed"""
+    assert pytest.response['reset'] is False
+
+@then('the response should be a reset')
+def check_reset():
+    """Verify missed readings are reported"""
+    assert pytest.response['reset'] is True
+
+@then(parsers.parse('I should receive events {first:d} to {last:d}'))
+def check_events(first, last):
+    """Verify the replayed events"""
+    for cursor in range(first, last + 1):
+        event = read_event(pytest.stream)
+        assert event['id'] == str(cursor)
+        assert json.loads(event['data'])['cursor'] == cursor
+
+@then(parsers.parse('a new reading should be pushed as event {cursor:d}'))
+def check_pushed_event(cursor):
+    """Verify a new reading is pushed"""
+    add_readings(pytest.history, 1)
+    event = read_event(pytest.stream)
+    assert event['id'] == str(cursor)
+
+@given('I have a dashboard started with the default listen address')
+def default_host_dashboard():
+    """Start a dashboard without a host"""
+    pytest.server = DashboardServer(ReadingHistory(), port=0)
+    pytest.server.start()
+
+@then(parsers.parse('the dashboard should only listen on "{host}"'))
+def check_listen_address(host):
+    """Verify the listen address"""
+    assert pytest.server.server_address[0] == host
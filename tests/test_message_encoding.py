@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test file for the compact message encoding using pytest-bdd
+"""
+
+import os
+import sys
+import json
+import pytest
+from pytest_bdd import scenario, given, when, then, parsers
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from publisher.encoding import (sample_row, row_to_sample, encode_rows, decode_rows,
+                                pack_rows, decode_message, COMPACT_BATCH)
+
+
+EPOCH = 1761498647.757
+
+
+# BDD Scenarios
+@scenario('../features/message_encoding.feature', 'Encode a sample as fixed-point centi-degrees')
+def test_sample_row():
+    """Test fixed-point row encoding"""
+    pass
+
+@scenario('../features/message_encoding.feature', 'Delta encode a batch of samples')
+def test_delta_encoding():
+    """Test delta encoding"""
+    pass
+
+@scenario('../features/message_encoding.feature', 'Round trip a batch through the binary format')
+def test_binary_round_trip():
+    """Test binary encoding"""
+    pass
+
+@scenario('../features/message_encoding.feature', 'Fall back to absolute rows for large deltas')
+def test_binary_fallback():
+    """Test binary encoding with deltas out of range"""
+    pass
+
+@scenario('../features/message_encoding.feature', 'Decode a compact JSON batch message')
+def test_decode_compact_batch():
+    """Test compact batch decoding"""
+    pass
+
+# Step definitions
+@given(parsers.parse('I have temperature readings {t1:f}, {t2:f}, {t3:f} and {t4:f} at epoch {epoch:f}'))
+def single_reading(t1, t2, t3, t4, epoch):
+    """Set up a single reading"""
+    pytest.reading = ({'T1': t1, 'T2': t2, 'T3': t3, 'T4': t4}, epoch)
+
+@given(parsers.parse('I have a batch of {count:d} samples taken {seconds:d} seconds apart'))
+def sample_batch(count, seconds):
+    """Set up a batch of absolute rows"""
+    pytest.rows = [
+        sample_row({'T1': 85.0 + i * 0.1, 'T2': 45.0 - i * 0.05, 'T3': 15.0, 'T4': 55.0 + i}, EPOCH + i * seconds)
+        for i in range(count)
+    ]
+
+@given(parsers.parse('I have a batch of {count:d} samples {degrees:d} degrees apart'))
+def wide_batch(count, degrees):
+    """Set up a batch with deltas that do not fit 16 bits"""
+    pytest.rows = [
+        sample_row({'T1': -50.0 + i * degrees, 'T2': 0.0, 'T3': 0.0, 'T4': 0.0}, EPOCH + i)
+        for i in range(count)
+    ]
+
+@when('I build a compact row')
+def build_row():
+    """Build a compact row"""
+    temperatures, epoch = pytest.reading
+    pytest.row = sample_row(temperatures, epoch)
+
+@when('I delta encode the batch')
+def delta_encode():
+    """Delta encode the batch"""
+    pytest.encoded = encode_rows(pytest.rows)
+
+@when('I pack the batch as binary')
+def pack_batch():
+    """Pack the batch"""
+    pytest.packed = pack_rows(pytest.rows)
+
+@when('I decode a compact batch message of the batch')
+def decode_compact_batch():
+    """Decode a compact JSON batch as received over the websocket"""
+    message = {"data": {"rows": encode_rows(pytest.rows), "delta": True}, "type": COMPACT_BATCH}
+    pytest.samples = decode_message(json.dumps(message))
+
+@then(parsers.parse('the row should be {epoch_ms:d}, {t1:d}, {t2:d}, {t3:d} and {t4:d}'))
+def check_row(epoch_ms, t1, t2, t3, t4):
+    """Verify the compact row"""
+    assert pytest.row == [epoch_ms, t1, t2, t3, t4]
+    assert all(isinstance(value, int) for value in pytest.row)
+
+@then('every row after the first should hold differences')
+def check_deltas():
+    """Verify the delta rows"""
+    assert pytest.encoded[0] == pytest.rows[0]
+    assert pytest.encoded[1] == [5000, 10, -5, 0, 100]
+
+@then('decoding the batch should restore the samples')
+def check_delta_round_trip():
+    """Verify the delta decoding"""
+    assert decode_rows(pytest.encoded) == pytest.rows
+
+@then('the binary message should be smaller than the verbose JSON')
+def check_binary_size():
+    """Verify the binary message saves bytes"""
+    verbose = json.dumps({"data": [row_to_sample(row) for row in pytest.rows], "type": 'temperature_batch'})
+    assert len(pytest.packed) * 4 < len(verbose)
+
+@then(parsers.parse('decoding the binary message should give {count:d} samples'))
+def check_binary_decode(count):
+    """Verify the binary decoding"""
+    pytest.samples = decode_message(pytest.packed)
+    assert len(pytest.samples) == count
+
+@then('the decoded temperatures should match the samples')
+def check_decoded_values():
+    """Verify decoded values"""
+    for sample, row in zip(pytest.samples, pytest.rows):
+        assert sample['temp1'] == row[1] / 100
+
+@then(parsers.parse('I should get {count:d} verbose samples with temp1 to temp4'))
+def check_verbose_samples(count):
+    """Verify decoded verbose samples"""
+    assert len(pytest.samples) == count
+    for sample, row in zip(pytest.samples, pytest.rows):
+        assert set(sample) == {'temp1', 'temp2', 'temp3', 'temp4', 'timestamp'}
+        assert sample['temp4'] == row[4] / 100
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test file for multi-exchanger, multi-bus plant configurations using pytest-bdd
+"""
+
+import os
+import sys
+import time
+import threading
+import pytest
+from unittest.mock import patch
+from pytest_bdd import scenario, given, when, then, parsers
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Force mock mode for testing
+os.environ['USE_MOCK_SENSORS'] = 'true'
+
+from therm.temperature_collector import TemperatureCollector
+from therm.plant_config import parse_config
+from publisher.encoding import sample_row, pack_rows, decode_readings
+
+
+SENSOR_IDS = {"T1": "28-32323232323232", "T2": "28-323232545454545",
+              "T3": "28-567890123456789", "T4": "28-665656565656565"}
+
+
+def _list(text):
+    return [s.strip().strip('"') for s in text.split(',')]
+
+
+# BDD Scenarios
+@scenario('../features/plant_config.feature', 'Parse the plant config')
+def test_parse_plant_config():
+    """Test plant config parsing"""
+    pass
+
+@scenario('../features/plant_config.feature', 'Flat config is a single default exchanger')
+def test_flat_config():
+    """Test flat config compatibility"""
+    pass
+
+@scenario('../features/plant_config.feature', 'Read buses in parallel')
+def test_parallel_buses():
+    """Test parallel bus reading"""
+    pass
+
+@scenario('../features/plant_config.feature', 'Calculate efficiency per exchanger')
+def test_exchanger_efficiency():
+    """Test per-exchanger efficiency"""
+    pass
+
+@scenario('../features/plant_config.feature', 'Binary batches carry the exchanger names')
+def test_binary_exchangers():
+    """Test exchanger names in binary batches"""
+    pass
+
+# Step definitions
+@given(parsers.parse('I have a plant config with exchangers "{hx1}" and "{hx2}" on buses "{bus1}" and "{bus2}"'))
+def plant_config(hx1, hx2, bus1, bus2):
+    """Two exchangers, the second one with T4 on the first bus"""
+    hx2_sensors = {role: f"{device_id}0" for role, device_id in SENSOR_IDS.items()}
+    hx2_sensors["T4"] = {"id": hx2_sensors["T4"], "bus": bus1}
+    pytest.raw_config = {
+        "exchangers": {
+            hx1: {"bus": bus1, "sensors": dict(SENSOR_IDS)},
+            hx2: {"bus": bus2, "sensors": hx2_sensors},
+        }
+    }
+
+@given(parsers.parse('I have a flat config with sensors {sensors}'))
+def flat_config(sensors):
+    """Legacy flat config"""
+    pytest.raw_config = {name: SENSOR_IDS[name] for name in _list(sensors)}
+
+@given('I have a plant temperature collector')
+def plant_collector():
+    """Collector using the plant config"""
+    with patch.object(TemperatureCollector, '_load_device_mapping', return_value=pytest.raw_config):
+        pytest.collector = TemperatureCollector()
+
+@given('I have a plant temperature collector with slow sensors')
+def slow_plant_collector():
+    """Collector whose sensor reads take a while and record their thread"""
+    plant_collector()
+    pytest.read_threads = set()
+    read_temperature = pytest.collector.read_temperature
+
+    def slow_read(sensor_name, unit=None):
+        time.sleep(0.01)
+        pytest.read_threads.add(threading.current_thread().name)
+        return read_temperature(sensor_name, unit)
+
+    pytest.collector.read_temperature = slow_read
+
+@given(parsers.parse('I have compact rows for exchangers "{hx1}" and "{hx2}"'))
+def exchanger_rows(hx1, hx2):
+    """Rows of two exchangers taken at the same time"""
+    temperatures = {'T1': 85.0, 'T2': 45.0, 'T3': 15.0, 'T4': 55.0}
+    pytest.rows = [sample_row(temperatures, 1761498647.0, hx1), sample_row(temperatures, 1761498647.0, hx2)]
+
+@when('I parse the plant config')
+def parse_plant_config():
+    """Parse the config"""
+    pytest.config = parse_config(pytest.raw_config)
+
+@when('I read temperatures from all sensors')
+def read_all():
+    """Read all sensors"""
+    pytest.all_temperatures = pytest.collector.read_all_temperatures()
+
+@when('I read temperatures and add the efficiencies')
+def read_with_efficiencies():
+    """Read all sensors and add the exchanger efficiencies"""
+    pytest.all_temperatures = pytest.collector.read_all_temperatures()
+    pytest.efficiencies = pytest.collector.add_efficiencies(pytest.all_temperatures)
+
+@when('I pack the rows as binary and decode them')
+def pack_and_decode():
+    """Round trip through the binary format"""
+    pytest.readings = decode_readings(pack_rows(pytest.rows))
+
+@then(parsers.parse('it should have {count:d} sensors named by exchanger and role'))
+def check_sensor_names(count):
+    """Verify the qualified sensor names"""
+    assert len(pytest.config.device_mapping) == count
+    assert pytest.config.device_mapping["hx1.T1"] == SENSOR_IDS["T1"]
+    assert pytest.config.exchangers["hx2"]["T3"] == "hx2.T3"
+
+@then(parsers.parse('bus "{bus}" should hold the sensors of "{exchanger}"'))
+def check_bus_sensors(bus, exchanger):
+    """Verify the bus grouping"""
+    assert set(pytest.config.exchangers[exchanger].values()) <= set(pytest.config.buses[bus])
+
+@then(parsers.parse('sensor "{sensor}" should be on bus "{bus}"'))
+def check_sensor_bus(sensor, bus):
+    """Verify the per-sensor bus override"""
+    assert sensor in pytest.config.buses[bus]
+
+@then(parsers.parse('exchanger "{exchanger}" should map role "{role}" to sensor "{sensor}"'))
+def check_role(exchanger, role, sensor):
+    """Verify the exchanger roles"""
+    pytest.exchanger = exchanger
+    assert pytest.config.exchangers[exchanger][role] == sensor
+    assert list(pytest.config.buses) == ["default"]
+
+@then(parsers.parse('its efficiency key should be "{key}"'))
+def check_efficiency_key(key):
+    """Verify the legacy efficiency key"""
+    assert pytest.config.efficiency_key(pytest.exchanger) == key
+
+@then(parsers.parse('I should get readings from {count:d} sensors'))
+def check_reading_count(count):
+    """Verify the number of readings"""
+    assert len(pytest.all_temperatures) == count
+    assert list(pytest.all_temperatures) == list(pytest.collector.device_mapping)
+
+@then('the buses should have been read on separate threads')
+def check_threads():
+    """Verify one worker per bus"""
+    assert len(pytest.read_threads) == 2
+    assert all(name.startswith("w1-bus") for name in pytest.read_threads)
+
+@then(parsers.parse('"{key1}" and "{key2}" should be set'))
+def check_efficiencies(key1, key2):
+    """Verify the per-exchanger efficiencies"""
+    assert pytest.all_temperatures[key1] is not None
+    assert pytest.all_temperatures[key2] is not None
+    assert set(pytest.efficiencies) == {"hx1", "hx2"}
+
+@then(parsers.parse('the exchanger readings of "{exchanger}" should have roles {roles}'))
+def check_exchanger_readings(exchanger, roles):
+    """Verify the grouped readings"""
+    groups = pytest.collector.exchanger_readings(pytest.all_temperatures)
+    expected = [r.strip().strip('"') for r in roles.replace(' and ', ', ').split(',')]
+    assert sorted(groups[exchanger]) == sorted(expected)
+
+@then(parsers.parse('the decoded readings should be for exchangers "{hx1}" and "{hx2}"'))
+def check_decoded_exchangers(hx1, hx2):
+    """Verify the exchanger names survived"""
+    assert [r.exchanger for r in pytest.readings] == [hx1, hx2]
+    assert pytest.readings[1].temp1 == 85.0
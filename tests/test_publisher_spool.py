@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Test file for the publisher spool using pytest-bdd
+"""
+
+import os
+import sys
+import pytest
+from pytest_bdd import scenario, given, when, then, parsers
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from publisher.encoding import sample_row, pack_rows, unpack_rows, COMPACT_MESSAGE
+from publisher.spool import ReadingSpool, SpoolingPublisher
+
+
+class StubUplink:
+    """Stub publisher recording sent messages instead of calling Azure"""
+
+    def __init__(self):
+        self.online = True
+        self.sent = []
+        self.counter = 0
+
+    def build_message(self, temperatures, timestamp=None):
+        self.counter += 1
+        return {"data": dict(temperatures, seq=self.counter), "type": 'temperature_message'}
+
+    def send_message(self, message):
+        if not self.online:
+            raise ConnectionError("uplink down")
+        self.sent.append(message)
+
+    def publish_batch(self, samples):
+        self.send_message({"data": samples, "type": 'temperature_batch'})
+
+
+class EncodingUplink(StubUplink):
+    """Stub publisher building and batching payloads like TemperaturePublisher"""
+
+    def __init__(self, encoding):
+        super().__init__()
+        self.encoding = encoding
+
+    def build_message(self, temperatures, timestamp=None):
+        if self.encoding != 'json':
+            return {"data": sample_row(temperatures, timestamp), "type": COMPACT_MESSAGE}
+        return {"data": {"temp1": temperatures['T1'], "temp2": temperatures['T2'],
+                         "temp3": temperatures['T3'], "temp4": temperatures['T4'],
+                         "timestamp": "2025-10-26T17:10:47.757000"},
+                "type": 'temperature_message'}
+
+    def publish_batch(self, samples):
+        if self.encoding == 'binary':
+            # Raises like the real publisher when handed verbose samples
+            self.send_message({"data": pack_rows(samples), "type": 'binary'})
+        else:
+            self.send_message({"data": samples, "type": 'temperature_batch'})
+
+
+@pytest.fixture
+def spool_path(tmp_path):
+    """Path of the spool file"""
+    return str(tmp_path / "spool.db")
+
+
+# BDD Scenarios
+@scenario('../features/publisher_spool.feature', 'Spool readings while the uplink is down')
+def test_spool_while_down():
+    """Test spooling while offline"""
+    pass
+
+@scenario('../features/publisher_spool.feature', 'Backfill spooled readings once the uplink returns')
+def test_backfill():
+    """Test backfill after reconnect"""
+    pass
+
+@scenario('../features/publisher_spool.feature', 'Backfill one batch per live reading')
+def test_backfill_one_batch():
+    """Test live readings never wait for more than one backfill batch"""
+    pass
+
+@scenario('../features/publisher_spool.feature', 'Spool survives a restart')
+def test_spool_restart():
+    """Test spool persistence"""
+    pass
+
+@scenario('../features/publisher_spool.feature', 'Spool size is bounded')
+def test_spool_bounded():
+    """Test spool bounds"""
+    pass
+
+@scenario('../features/publisher_spool.feature', 'Backfill compact readings after a restart with the json encoding')
+def test_backfill_compact_as_json():
+    """Test spooled rows are converted to verbose samples"""
+    pass
+
+@scenario('../features/publisher_spool.feature', 'Backfill json readings after a restart with the binary encoding')
+def test_backfill_json_as_binary():
+    """Test spooled samples are converted to packed rows"""
+    pass
+
+@scenario('../features/publisher_spool.feature', 'Discard an unreadable spooled payload')
+def test_unreadable_payload():
+    """Test an unreadable payload does not block the spool"""
+    pass
+
+# Step definitions
+@given('I have a spooling publisher with a stub uplink')
+def spooling_publisher(spool_path):
+    """Create a spooling publisher"""
+    pytest.uplink = StubUplink()
+    pytest.spool = ReadingSpool(spool_path)
+    pytest.spooling_publisher = SpoolingPublisher(pytest.uplink, pytest.spool, batch_size=100)
+
+@given(parsers.parse('the spool holds at most {max_messages:d} messages'))
+def bounded_spool(spool_path, max_messages):
+    """Recreate the spool with a message bound"""
+    pytest.spool.close()
+    pytest.spool = ReadingSpool(spool_path, max_messages=max_messages)
+    pytest.spooling_publisher.spool = pytest.spool
+
+@given(parsers.parse('the uplink uses the {encoding} encoding'))
+def uplink_encoding(encoding):
+    """Replace the stub uplink with one using a message encoding"""
+    pytest.uplink = EncodingUplink(encoding)
+    pytest.spooling_publisher.publisher = pytest.uplink
+
+@given('the spool holds an unreadable payload')
+def unreadable_payload():
+    """Spool a payload in no known format"""
+    pytest.spool.append({"temp1": 85.0})
+
+@given('the uplink is down')
+def uplink_down():
+    """Take the uplink offline"""
+    pytest.uplink.online = False
+
+@when(parsers.parse('I publish {count:d} temperature readings'))
+def publish_readings(count):
+    """Publish a number of readings"""
+    for _ in range(count):
+        pytest.spooling_publisher.publish_temperature({'T1': 85.0, 'T2': 45.0, 'T3': 15.0, 'T4': 55.0})
+
+@when('the uplink comes back')
+def uplink_up():
+    """Bring the uplink online"""
+    pytest.uplink.online = True
+
+@when('the spool is reopened')
+def reopen_spool(spool_path):
+    """Simulate a restart by reopening the spool file"""
+    pytest.spool.close()
+    pytest.spool = ReadingSpool(spool_path)
+
+@when(parsers.parse('the publisher restarts with the {encoding} encoding'))
+def restart_with_encoding(spool_path, encoding):
+    """Simulate a restart with another encoding, the uplink is back"""
+    pytest.spool.close()
+    pytest.spool = ReadingSpool(spool_path)
+    pytest.uplink = EncodingUplink(encoding)
+    pytest.spooling_publisher = SpoolingPublisher(pytest.uplink, pytest.spool, batch_size=100)
+
+@then(parsers.parse('{count:d} readings should be spooled'))
+def check_spooled(count):
+    """Verify the spool length"""
+    assert len(pytest.spool) == count
+
+@then(parsers.parse('at most {count:d} readings should be spooled'))
+def check_spool_bound(count):
+    """Verify the spool bound"""
+    assert 0 < len(pytest.spool) <= count
+
+@then('the newest reading should still be spooled')
+def check_newest_kept():
+    """Verify the oldest readings are the ones discarded"""
+    payloads = [payload for _, payload in pytest.spool.peek(100)]
+    assert payloads[-1]['seq'] == pytest.uplink.counter
+
+@then('no messages should have been sent')
+def check_nothing_sent():
+    """Verify nothing reached the uplink"""
+    assert pytest.uplink.sent == []
+
+@then('the live reading should be sent before the backfill')
+def check_live_first():
+    """Verify live readings are not starved by the backfill"""
+    assert pytest.uplink.sent[0]['type'] == 'temperature_message'
+
+@then(parsers.parse('{count:d} readings should have been backfilled in {batches:d} batch'))
+def check_backfilled(count, batches):
+    """Verify the backfill batches"""
+    sent_batches = [m for m in pytest.uplink.sent if m['type'] == 'temperature_batch']
+    assert len(sent_batches) == batches
+    assert sum(len(m['data']) for m in sent_batches) == count
+    assert [s['seq'] for m in sent_batches for s in m['data']] == list(range(1, count + 1))
+
+@then(parsers.parse('{count:d} readings should have been backfilled as json samples'))
+def check_backfilled_json(count):
+    """Verify the spooled rows arrived as verbose samples"""
+    batch = pytest.uplink.sent[-1]
+    assert batch['type'] == 'temperature_batch'
+    assert len(batch['data']) == count
+    assert all(sample['temp1'] == 85.0 and sample['temp4'] == 55.0 for sample in batch['data'])
+
+@then(parsers.parse('{count:d} readings should have been backfilled as binary rows'))
+def check_backfilled_binary(count):
+    """Verify the spooled samples arrived as packed rows"""
+    rows = unpack_rows(pytest.uplink.sent[-1]['data'])
+    assert len(rows) == count
+    assert all(row[1:5] == [8500, 4500, 1500, 5500] for row in rows)
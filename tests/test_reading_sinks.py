@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test file for the collector reading sinks using pytest-bdd
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import pytest
+from unittest.mock import patch
+from pytest_bdd import scenario, given, when, then, parsers
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Force mock mode for testing
+os.environ['USE_MOCK_SENSORS'] = 'true'
+
+from therm.temperature_collector import TemperatureCollector
+from therm.sinks import Sink, SQLiteSink, FileLogSink, CallbackSink
+
+
+EPOCH = 1761498647.0
+
+
+class RecordingSink(Sink):
+    """Sink keeping every record in memory"""
+
+    def __init__(self, delay=0.0, failures=0):
+        self.records = []
+        self.delay = delay
+        self.failures = failures
+
+    def write(self, records):
+        time.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise IOError("sink unavailable")
+        self.records.extend(records)
+
+
+class FlakyCallback:
+    """Publish callback stand-in failing once at one call"""
+
+    def __init__(self, fail_at):
+        self.calls = []
+        self.fail_at = fail_at
+
+    def __call__(self, temperatures, timestamp):
+        if len(self.calls) + 1 == self.fail_at:
+            self.fail_at = None
+            raise ConnectionError("uplink down")
+        self.calls.append(timestamp)
+
+
+@pytest.fixture
+def temperature_collector():
+    """Fixture to create a temperature collector with mock config"""
+    config = {"T1": "28-32323232323232", "T2": "28-323232545454545",
+              "T3": "28-567890123456789", "T4": "28-665656565656565"}
+    with patch.object(TemperatureCollector, '_load_device_mapping', return_value=config):
+        collector = TemperatureCollector()
+    yield collector
+    collector.close_sinks()
+
+
+# BDD Scenarios
+@scenario('../features/reading_sinks.feature', 'Fan out readings to several sinks')
+def test_fan_out_sinks():
+    """Test sink fan-out"""
+    pass
+
+@scenario('../features/reading_sinks.feature', 'Slow sink does not delay acquisition or other sinks')
+def test_slow_sink():
+    """Test sink isolation"""
+    pass
+
+@scenario('../features/reading_sinks.feature', 'Failing sink with retry policy recovers')
+def test_retry_sink():
+    """Test retry error policy"""
+    pass
+
+@scenario('../features/reading_sinks.feature', 'Callback sink keeps reading timestamps and does not repeat a partial batch')
+def test_callback_sink_timestamps():
+    """Test record timestamps and partial batch retries of the callback sink"""
+    pass
+
+@scenario('../features/reading_sinks.feature', 'Store readings in SQLite')
+def test_sqlite_sink():
+    """Test SQLite sink"""
+    pass
+
+@scenario('../features/reading_sinks.feature', 'Log readings to a file')
+def test_file_log_sink():
+    """Test file log sink"""
+    pass
+
+# Step definitions
+@given('I have a temperature collector with mock sensors')
+def temperature_collector_context(temperature_collector):
+    """Set up temperature collector context"""
+    pytest.collector = temperature_collector
+    pytest.workers = {}
+
+@given(parsers.parse('the collector has a "{name}" recording sink'))
+def recording_sink(name):
+    """Register a recording sink"""
+    pytest.workers[name] = pytest.collector.add_sink(name, RecordingSink())
+
+@given(parsers.parse('the collector has a slow "{name}" sink with a queue of {maxsize:d}'))
+def slow_sink(name, maxsize):
+    """Register a slow sink with a small queue"""
+    pytest.workers[name] = pytest.collector.add_sink(name, RecordingSink(delay=0.05),
+                                                     maxsize=maxsize, batch_size=1)
+
+@given(parsers.parse('the collector has a "{name}" sink failing {failures:d} times with retry policy'))
+def flaky_sink(name, failures):
+    """Register a sink that fails a few times"""
+    pytest.workers[name] = pytest.collector.add_sink(name, RecordingSink(failures=failures),
+                                                     error_policy='retry', retry_delay=0.01)
+
+@given(parsers.parse('the collector has a "{name}" callback sink failing once at reading {fail_at:d} with retry policy'))
+def flaky_callback_sink(name, fail_at):
+    """Register a callback sink taking timestamps that fails once"""
+    pytest.callback = FlakyCallback(fail_at)
+    pytest.workers[name] = pytest.collector.add_sink(name, CallbackSink(pytest.callback, with_timestamp=True),
+                                                     error_policy='retry', retry_delay=0.01)
+
+@given('the collector has a SQLite sink')
+def sqlite_sink(tmp_path):
+    """Register a SQLite sink"""
+    pytest.db_path = str(tmp_path / "readings.db")
+    pytest.collector.add_sink('sqlite', SQLiteSink(pytest.db_path))
+
+@given('the collector has a file log sink')
+def file_log_sink(tmp_path):
+    """Register a file log sink"""
+    pytest.log_path = str(tmp_path / "temperature_log.txt")
+    pytest.collector.add_sink('file', FileLogSink(pytest.log_path))
+
+@when(parsers.parse('I dispatch {count:d} readings'))
+def dispatch_readings(count):
+    """Read and dispatch readings like monitor_continuous does"""
+    start = time.monotonic()
+    for _ in range(count):
+        temperatures = pytest.collector.read_all_temperatures()
+        temperatures['Efficiency'] = pytest.collector.calculate_efficiency(temperatures)
+        pytest.collector.dispatch(temperatures)
+    pytest.dispatch_time = time.monotonic() - start
+
+@when(parsers.parse('I dispatch {count:d} readings taken one second apart'))
+def dispatch_timed_readings(count):
+    """Dispatch readings with their acquisition timestamps"""
+    for i in range(count):
+        pytest.collector.dispatch(pytest.collector.read_all_temperatures(), EPOCH + i)
+    pytest.dispatched = count
+
+@when('the sinks are closed')
+@then('the sinks are closed')
+def close_sinks():
+    """Flush and stop the sinks"""
+    pytest.collector.close_sinks()
+    assert pytest.collector.sink_stats() == {}
+
+@then('dispatching should not have waited for the slow sink')
+def check_dispatch_time():
+    """Verify dispatching is non-blocking"""
+    assert pytest.dispatch_time < 0.5
+
+@then(parsers.parse('sink "{name}" should have written {count:d} readings'))
+def check_written(name, count):
+    """Verify the records written by a sink"""
+    stats = pytest.workers[name].stats()
+    assert stats['written'] == count
+    assert len(pytest.workers[name].sink.records) == count
+
+@then(parsers.parse('sink "{name}" should have dropped readings'))
+def check_dropped(name):
+    """Verify a sink dropped records"""
+    stats = pytest.workers[name].stats()
+    assert stats['dropped'] > 0
+    assert stats['written'] + stats['dropped'] == stats['submitted']
+
+@then(parsers.parse('sink "{name}" should have {count:d} errors'))
+def check_errors(name, count):
+    """Verify the error counter"""
+    assert pytest.workers[name].stats()['errors'] == count
+
+@then('the callback should have been called once per reading with its timestamp')
+def check_callback_timestamps():
+    """Verify no reading was published twice or restamped"""
+    assert pytest.callback.calls == [EPOCH + i for i in range(pytest.dispatched)]
+
+@then(parsers.parse('the SQLite database should hold {count:d} values'))
+def check_sqlite(count):
+    """Verify the stored rows"""
+    with sqlite3.connect(pytest.db_path) as db:
+        assert db.execute("SELECT COUNT(*) FROM readings").fetchone()[0] == count
+
+@then(parsers.parse('the log file should have {count:d} lines with efficiency'))
+def check_log_file(count):
+    """Verify the log file lines"""
+    with open(pytest.log_path) as f:
+        lines = f.readlines()
+    assert len(lines) == count
+    assert all(',T1:' in line and 'Efficiency:' in line for line in lines)
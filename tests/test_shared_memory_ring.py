@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Test file for the shared-memory reading ring and multi-process acquisition using pytest-bdd
+"""
+
+import os
+import sys
+import json
+import time
+import pytest
+from pytest_bdd import scenario, given, when, then, parsers
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Force mock mode for testing
+os.environ['USE_MOCK_SENSORS'] = 'true'
+
+from therm.temperature_collector import TemperatureCollector
+from therm.shm_ring import RingWriter, RingReader
+from therm.acquisition import MultiProcessAcquisition
+
+
+SENSOR_IDS = {"T1": "28-32323232323232", "T2": "28-323232545454545",
+              "T3": "28-567890123456789", "T4": "28-665656565656565"}
+
+
+@pytest.fixture
+def ring_name():
+    """Unique ring name, removed after the test"""
+    name = f"hemtest_{os.getpid()}_{time.monotonic_ns()}"
+    yield name
+    for obj in ('writer', 'reader'):
+        if getattr(pytest, obj, None) is not None:
+            getattr(pytest, obj).close()
+            setattr(pytest, obj, None)
+
+
+# BDD Scenarios
+@scenario('../features/shared_memory_ring.feature', 'Read records written to a ring')
+def test_read_records():
+    """Test reading ring records"""
+    pass
+
+@scenario('../features/shared_memory_ring.feature', 'Lagging reader skips overwritten records')
+def test_lagging_reader():
+    """Test reader lapped by the writer"""
+    pass
+
+@scenario('../features/shared_memory_ring.feature', 'Failed sensor reads are left out')
+def test_missing_values():
+    """Test missing sensor values"""
+    pass
+
+@scenario('../features/shared_memory_ring.feature', 'Acquire every bus in its own process')
+def test_multi_process_acquisition():
+    """Test multi-process acquisition"""
+    pass
+
+@scenario('../features/shared_memory_ring.feature', 'Reuse a stale ring left by a crashed run')
+def test_reuse_stale_ring():
+    """Test a stale ring with the same layout is reused"""
+    pass
+
+@scenario('../features/shared_memory_ring.feature', 'Replace a stale ring with a different layout')
+def test_replace_stale_ring():
+    """Test a stale ring with another layout is recreated"""
+    pass
+
+@scenario('../features/shared_memory_ring.feature', 'Restart a dead acquisition process')
+def test_restart_dead_process():
+    """Test the liveness check of the bus processes"""
+    pass
+
+@scenario('../features/shared_memory_ring.feature', 'Dispatch every ring record once with its own timestamp')
+def test_read_records_once():
+    """Test the cursor based record source"""
+    pass
+
+@scenario('../features/shared_memory_ring.feature', 'Restart a bus process when its sensors change')
+def test_restart_on_config_change():
+    """Test bus processes follow a config reload"""
+    pass
+
+# Step definitions
+@given(parsers.parse('I have a reading ring with sensors "{first}", "{second}" and capacity {capacity:d}'))
+def reading_ring(ring_name, first, second, capacity):
+    """Create a ring and attach a reader"""
+    pytest.writer = RingWriter(ring_name, [first, second], capacity)
+    pytest.reader = RingReader(ring_name)
+
+@given(parsers.parse('I have a plant config file with buses "{bus1}" and "{bus2}"'))
+def plant_config_file(tmp_path, bus1, bus2):
+    """Write a two-bus plant config"""
+    config = {"exchangers": {
+        "hx1": {"bus": bus1, "sensors": dict(SENSOR_IDS)},
+        "hx2": {"bus": bus2, "sensors": {role: f"{device_id}0" for role, device_id in SENSOR_IDS.items()}},
+    }}
+    pytest.config_file = tmp_path / "devicenames.json"
+    pytest.config_file.write_text(json.dumps(config))
+
+@when(parsers.parse('I write {count:d} records to the ring'))
+def write_records(count):
+    """Write records with increasing temperatures"""
+    for i in range(count):
+        pytest.writer.write({'T1': 85.0 + i, 'T2': 45.0}, timestamp=1761498647.0 + i)
+
+@when(parsers.parse('I write a record without "{sensor}"'))
+def write_partial_record(sensor):
+    """Write a record with one sensor missing"""
+    pytest.writer.write({'T1': 85.0})
+
+@when('I start multi-process acquisition')
+def start_acquisition():
+    """Start one process per bus"""
+    pytest.collector = TemperatureCollector(str(pytest.config_file), watch_config=False)
+    pytest.acquisition = MultiProcessAcquisition(pytest.collector, interval=0.05,
+                                                 prefix=f"hemtest_{os.getpid()}")
+    pytest.acquisition.start()
+
+@when('the writer crashes without removing the ring')
+def writer_crashes():
+    """Detach the writer like a killed process, leaving the segment behind"""
+    pytest.reader.close()
+    pytest.reader = None
+    pytest.writer.owner = False
+    pytest.writer.close()
+    pytest.writer = None
+
+@when(parsers.parse('I create the ring again with sensors "{first}", "{second}" and capacity {capacity:d}'))
+def recreate_ring(ring_name, first, second, capacity):
+    """Create the ring like a restarted parent"""
+    pytest.writer = RingWriter(ring_name, [first, second], capacity)
+    pytest.reader = RingReader(ring_name)
+
+@when(parsers.parse('the acquisition process of "{bus}" is killed'))
+def kill_process(bus):
+    """Kill one bus process once it has written"""
+    check_rings_written()
+    process = pytest.acquisition.processes[bus]
+    process.kill()
+    process.join(5)
+    pytest.write_counts = {name: pytest.acquisition.reader(name).write_count
+                           for name in pytest.acquisition.rings}
+
+@when('I read the acquired records twice')
+def read_records_twice():
+    """Read the records written so far, then the ones written since"""
+    assert pytest.acquisition.wait_for_records()
+    first = pytest.acquisition.read_records()
+    assert pytest.acquisition.wait_for_records()
+    pytest.acquired = first + pytest.acquisition.read_records()
+
+@when(parsers.parse('the sensors of "{bus}" are remapped in the config file'))
+def remap_bus(bus):
+    """Change the device IDs of one bus and reload the config"""
+    config = json.loads(pytest.config_file.read_text())
+    for exchanger in config["exchangers"].values():
+        if exchanger["bus"] == bus:
+            exchanger["sensors"] = {role: f"{device_id}1" for role, device_id in exchanger["sensors"].items()}
+    pytest.config_file.write_text(json.dumps(config))
+    pytest.processes = dict(pytest.acquisition.processes)
+    pytest.collector.reload_config()
+
+@then(parsers.parse('a reader should read {count:d} records since cursor {cursor:d}'))
+def check_read_since(count, cursor):
+    """Verify read_since"""
+    pytest.records, pytest.cursor = pytest.reader.read_since(cursor)
+    assert len(pytest.records) == count
+    seqs = [record[0] for record in pytest.records]
+    assert seqs == sorted(seqs)
+
+@then(parsers.parse('the reader cursor should be {cursor:d}'))
+def check_cursor(cursor):
+    """Verify the returned cursor"""
+    assert pytest.cursor == cursor
+
+@then('the latest record should have T1 in degrees')
+def check_latest():
+    """Verify the newest record"""
+    timestamp, temperatures = pytest.reader.latest()
+    assert timestamp == 1761498647.0 + 2
+    assert temperatures == {'T1': 87.0, 'T2': 45.0}
+
+@then(parsers.parse('the reader should have missed {count:d} records'))
+def check_missed(count):
+    """Verify the missed counter"""
+    assert pytest.reader.missed == count
+    assert pytest.records[-1][2][0] == 104000
+
+@then(parsers.parse('the latest record should only have "{sensor}"'))
+def check_partial_record(sensor):
+    """Verify missing values are left out"""
+    assert list(pytest.reader.latest()[1]) == [sensor]
+
+@then('the new writer should continue after 3 records')
+def check_reused():
+    """Verify the stale records were kept"""
+    assert pytest.reader.write_count == 3
+    pytest.writer.write({'T1': 90.0, 'T2': 45.0})
+    records, _ = pytest.reader.read_since(0)
+    assert [record[0] for record in records] == [0, 1, 2, 3]
+
+@then(parsers.parse('the new writer should start an empty ring with sensors "{first}" and "{second}"'))
+def check_replaced(first, second):
+    """Verify the stale ring was replaced"""
+    assert pytest.reader.write_count == 0
+    assert pytest.reader.slot_names == [first, second]
+
+@then(parsers.parse('the acquisition process of "{bus}" should be restarted'))
+def check_restarted(bus):
+    """Wait for the liveness check to restart the process"""
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline and not pytest.acquisition.restarts[bus]:
+        pytest.acquisition.check_processes()
+        time.sleep(0.05)
+    assert pytest.acquisition.restarts[bus] == 1
+    assert sum(pytest.acquisition.restarts.values()) == 1
+    assert pytest.acquisition.processes[bus].is_alive()
+
+@then('both bus rings should receive new records')
+def check_new_records():
+    """Wait for both processes to write after the restart"""
+    def written():
+        return all(pytest.acquisition.reader(bus).write_count > pytest.write_counts[bus]
+                   for bus in pytest.acquisition.rings)
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline and not written():
+        time.sleep(0.05)
+    assert written()
+
+@then('no record should have been read twice')
+def check_records_once():
+    """Verify the cursors advance"""
+    stamps = [(timestamp, tuple(reading)) for timestamp, reading in pytest.acquired]
+    assert len(stamps) == len(set(stamps))
+    assert [timestamp for timestamp, _ in pytest.acquired] == sorted(t for t, _ in pytest.acquired)
+
+@then('every record should keep its acquisition timestamp')
+def check_record_timestamps():
+    """Verify each record carries the timestamp written by its bus process"""
+    ring_stamps = {timestamp for bus in pytest.acquisition.rings
+                   for _, timestamp, _ in pytest.acquisition.reader(bus).read_since(0)[0]}
+    assert all(timestamp in ring_stamps for timestamp, _ in pytest.acquired)
+    # One bus per record: the 4 sensors of a single exchanger
+    assert {len(reading) for _, reading in pytest.acquired} == {4}
+
+@then(parsers.parse('reading the records should restart the acquisition of "{bus}" only'))
+def check_restart_on_change(bus):
+    """Verify only the changed bus got a new process"""
+    pytest.acquisition.read_records()
+    for name, process in pytest.acquisition.processes.items():
+        assert (process is not pytest.processes[name]) == (name == bus)
+    assert not pytest.processes[bus].is_alive()
+
+@then('both bus rings should receive records')
+def check_rings_written():
+    """Wait for both acquisition processes to write"""
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        if all(pytest.acquisition.reader(bus).write_count > 0 for bus in pytest.acquisition.rings):
+            break
+        time.sleep(0.05)
+    assert all(pytest.acquisition.reader(bus).write_count > 0 for bus in pytest.acquisition.rings)
+
+@then(parsers.parse('the merged readings should have {count:d} sensors'))
+def check_merged(count):
+    """Verify the merged latest readings"""
+    assert len(pytest.acquisition.read_all_temperatures()) == count
+
+@then('stopping the acquisition should remove the rings')
+def check_stop():
+    """Verify the rings are removed"""
+    names = list(pytest.acquisition.rings.values())
+    pytest.acquisition.stop()
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            RingReader(name)
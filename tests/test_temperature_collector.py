@@ -4,6 +4,7 @@ Test file for TemperatureCollector with mock sensors using pytest-bdd
 """
 
 import os
+import json
 import sys
 import pytest
 from unittest.mock import patch, MagicMock
@@ -250,3 +251,54 @@ def test_temperature_consistency_cold():
     """Test temperature consistency for cold sensors"""
     pass
 
+
+
+# Hot-reload of the device mapping
+@scenario('../features/temperature_collector.feature', 'Hot-reload device mapping from the config file')
+def test_hot_reload_config():
+    """Test hot-reload of devicenames.json"""
+    pass
+
+@given('I have a temperature collector watching a config file')
+def watched_config_collector(tmp_path, test_config):
+    """Create a collector loading its mapping from a temporary config file"""
+    config_file = tmp_path / "devicenames.json"
+    config_file.write_text(json.dumps(test_config))
+    pytest.config_file = config_file
+    pytest.collector = TemperatureCollector(config_file=str(config_file))
+    pytest.original_sensors = dict(pytest.collector.sensors)
+
+@when(parsers.parse('the config file remaps "{remapped}", removes "{removed}" and adds "{added}"'))
+def edit_config_file(test_config, remapped, removed, added):
+    """Rewrite the config file with a changed mapping"""
+    mapping = dict(test_config)
+    mapping[remapped] = "28-000000000001"
+    del mapping[removed]
+    mapping[added] = "28-000000000002"
+    pytest.config_file.write_text(json.dumps(mapping))
+    # Make sure the mtime differs even on coarse-grained filesystems
+    stat = os.stat(pytest.config_file)
+    os.utime(pytest.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+@then('the config change should be detected')
+def check_config_changed():
+    """Verify the mtime poll notices the edit"""
+    assert pytest.collector.config_changed()
+
+@then(parsers.parse('reloading should report added "{added}", removed "{removed}" and remapped "{remapped}"'))
+def check_reload_changes(added, removed, remapped):
+    """Verify the reported config diff"""
+    changes = pytest.collector.reload_config()
+    assert changes == {'added': [added], 'removed': [removed], 'remapped': [remapped]}
+    assert not pytest.collector.config_changed()
+
+@then(parsers.parse('sensor "{sensor_name}" should keep its sensor object'))
+def check_sensor_untouched(sensor_name):
+    """Verify unchanged sensors are not re-initialized"""
+    assert pytest.collector.sensors[sensor_name] is pytest.original_sensors[sensor_name]
+
+@then(parsers.parse('sensors "{sensors}" should be configured'))
+def check_sensors_configured(sensors):
+    """Verify the exact set of configured sensors"""
+    sensor_list = [s.strip().strip('"') for s in sensors.split(',')]
+    assert sorted(pytest.collector.sensors) == sorted(sensor_list)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test file for the streaming temperature subscriber using pytest-bdd
+A local websocket server stands in for Azure Web PubSub
+"""
+
+import os
+import sys
+import json
+import asyncio
+import pytest
+from pytest_bdd import scenario, given, when, then, parsers
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+websockets = pytest.importorskip("websockets")
+
+from publisher.encoding import sample_row, encode_rows, COMPACT_MESSAGE, COMPACT_BATCH
+from publisher.subscriber import StreamingSubscriber
+
+
+EPOCH = 1761498647.0
+
+
+def compact_message(index):
+    """Compact message for reading number index"""
+    return json.dumps({"data": compact_row(index), "type": COMPACT_MESSAGE})
+
+
+def compact_row(index):
+    """Compact row of reading number index"""
+    return sample_row({'T1': 85.0, 'T2': 45.0, 'T3': 15.0, 'T4': 55.0 + index / 100}, EPOCH + index)
+
+
+def compact_batch(indices):
+    """Compact batch message, like a spool backfill, of several readings"""
+    rows = encode_rows([compact_row(index) for index in indices])
+    return json.dumps({"data": {"rows": rows, "delta": True}, "type": COMPACT_BATCH})
+
+
+class UrlUnavailable(Exception):
+    """Stands in for azure.core.exceptions.ServiceRequestError"""
+
+
+# BDD Scenarios
+@scenario('../features/temperature_subscriber.feature', 'Fan out decoded readings to several consumers')
+def test_fan_out():
+    """Test fan-out to several consumers"""
+    pass
+
+@scenario('../features/temperature_subscriber.feature', 'Reconnect and resume without duplicates')
+def test_reconnect_resume():
+    """Test reconnect and resume"""
+    pass
+
+@scenario('../features/temperature_subscriber.feature', 'Slow consumer does not block the others')
+def test_slow_consumer():
+    """Test backpressure isolation"""
+    pass
+
+@scenario('../features/temperature_subscriber.feature', 'Deliver a spool backlog older than the live reading')
+def test_backlog_after_live():
+    """Test deduplication does not drop older backfilled readings"""
+    pass
+
+@scenario('../features/temperature_subscriber.feature', 'Back off when the websocket URL cannot be fetched')
+def test_url_factory_failure():
+    """Test reconnect after a failing URL factory"""
+    pass
+
+# Step definitions
+@given('I have a local websocket server standing in for Web PubSub')
+def local_server():
+    """Set up the per-connection message script"""
+    pytest.connections = []
+    pytest.url_failures = 0
+
+@given(parsers.parse('the server sends {count:d} compact temperature messages'))
+def server_sends(count):
+    """Script one connection"""
+    pytest.connections.append([compact_message(index) for index in range(1, count + 1)])
+
+@given(parsers.parse('the server sends readings {first:d} to {last:d} and drops the connection'))
+@given(parsers.parse('the server then resends readings {first:d} to {last:d}'))
+def server_sends_range(first, last):
+    """Script one connection with a range of readings"""
+    pytest.connections.append([compact_message(index) for index in range(first, last + 1)])
+
+@given(parsers.parse('the server sends reading {live:d} and then a backlog batch of readings {first:d} to {last:d}'))
+def server_sends_live_and_backlog(live, first, last):
+    """Script one connection with a live message followed by a spool backfill"""
+    pytest.connections.append([compact_message(live), compact_batch(range(first, last + 1))])
+
+@given('fetching the websocket URL fails once')
+def url_fails_once():
+    """Make the first URL request fail"""
+    pytest.url_failures = 1
+
+@given('I have a subscriber with a callback consumer and a queue consumer')
+def callback_and_queue_consumers():
+    """Set up the consumer layout"""
+    pytest.consumer_layout = 'callback_and_queue'
+
+@given('I have a subscriber with a fast consumer and a slow dropping consumer')
+def fast_and_slow_consumers():
+    """Set up the consumer layout"""
+    pytest.consumer_layout = 'fast_and_slow'
+
+@when('the subscriber runs until the server closes')
+def run_subscriber():
+    """Run the server and the subscriber"""
+    asyncio.run(_run_subscriber())
+
+async def _run_subscriber():
+    script = iter(pytest.connections)
+
+    async def handler(ws):
+        for message in next(script, ()):
+            await ws.send(message)
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        failures = [pytest.url_failures]
+
+        def url_factory():
+            if failures[0]:
+                failures[0] -= 1
+                raise UrlUnavailable("uplink down")
+            return f"ws://127.0.0.1:{port}"
+
+        subscriber = StreamingSubscriber(url_factory,
+                                         batch_size=100, batch_interval=0.05, min_backoff=0.01)
+        pytest.batches = {'callback': [], 'fast': [], 'slow': []}
+        pytest.queue = asyncio.Queue()
+
+        if pytest.consumer_layout == 'callback_and_queue':
+            subscriber.add_consumer('callback', pytest.batches['callback'].append)
+            subscriber.add_consumer('queue', pytest.queue, policy='block')
+        else:
+            async def slow(batch):
+                await asyncio.sleep(0.05)
+                pytest.batches['slow'].append(batch)
+            subscriber.batch_size = 1
+            subscriber.add_consumer('fast', pytest.batches['fast'].append, maxsize=1000)
+            pytest.slow = subscriber.add_consumer('slow', slow, maxsize=1, policy='drop_oldest')
+
+        await subscriber.run(max_reconnects=len(pytest.connections) - 1 + pytest.url_failures)
+        pytest.subscriber = subscriber
+
+    pytest.queued = []
+    while not pytest.queue.empty():
+        pytest.queued.append(pytest.queue.get_nowait())
+
+def _flatten(batches):
+    return [reading for batch in batches for reading in batch]
+
+@then(parsers.parse('both consumers should receive {count:d} typed readings in order'))
+def check_both_consumers(count):
+    """Verify both consumers got every reading once, in order"""
+    for readings in (_flatten(pytest.batches['callback']), _flatten(pytest.queued)):
+        assert len(readings) == count
+        assert [r.timestamp for r in readings] == [EPOCH + i for i in range(1, count + 1)]
+        assert readings[0].temp1 == 85.0
+
+@then('the readings should arrive in fewer batches than messages')
+def check_batched():
+    """Verify readings were batched"""
+    assert len(pytest.batches['callback']) < pytest.subscriber.received
+
+@then('the subscriber should have reconnected once')
+def check_reconnected():
+    """Verify the reconnect"""
+    assert pytest.subscriber.reconnects == 1
+
+@then(parsers.parse('the fast consumer should receive {count:d} typed readings'))
+def check_fast_consumer(count):
+    """Verify the fast consumer was not slowed down"""
+    assert len(_flatten(pytest.batches['fast'])) == count
+
+@then('the slow consumer should have dropped readings')
+def check_slow_consumer():
+    """Verify the slow consumer dropped instead of blocking"""
+    assert pytest.slow.dropped > 0
+    assert pytest.slow.stats()['dropped'] == pytest.slow.dropped
+
+@then(parsers.parse('both consumers should receive readings {first:d}, {second:d}, {third:d} and {fourth:d}'))
+def check_readings_in_arrival_order(first, second, third, fourth):
+    """Verify both consumers got every reading once, in arrival order"""
+    expected = [EPOCH + i for i in (first, second, third, fourth)]
+    for readings in (_flatten(pytest.batches['callback']), _flatten(pytest.queued)):
+        assert [r.timestamp for r in readings] == expected
+
+@then(parsers.parse('the subscriber should have skipped {count:d} duplicates'))
+def check_duplicates(count):
+    """Verify the resent readings were skipped"""
+    assert pytest.subscriber.stats()['duplicates'] == count
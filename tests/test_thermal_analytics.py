@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test file for the streaming thermal analytics using pytest-bdd
+"""
+
+import os
+import sys
+import pytest
+from pytest_bdd import scenario, given, when, then, parsers
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from therm.analytics import ThermalAnalytics, lmtd
+
+
+EPOCH = 1761498647.0
+HOUR = 3600.0
+
+
+def reading(t1, t2, t3, t4):
+    return {'T1': t1, 'T2': t2, 'T3': t3, 'T4': t4}
+
+
+# BDD Scenarios
+@scenario('../features/thermal_analytics.feature', 'Log mean temperature difference')
+def test_lmtd():
+    """Test LMTD"""
+    pass
+
+@scenario('../features/thermal_analytics.feature', 'Heat duty, UA and NTU with configured flows')
+def test_duty_ua_ntu():
+    """Test heat duty, UA and NTU"""
+    pass
+
+@scenario('../features/thermal_analytics.feature', 'Window summary')
+def test_window_summary():
+    """Test tumbling windows"""
+    pass
+
+@scenario('../features/thermal_analytics.feature', 'Detect fouling from the effectiveness trend')
+def test_fouling_detection():
+    """Test fouling detection"""
+    pass
+
+@scenario('../features/thermal_analytics.feature', 'Stable exchanger raises no alert')
+def test_no_fouling():
+    """Test no false fouling alert"""
+    pass
+
+@scenario('../features/thermal_analytics.feature', 'Crossed temperatures do not distort the UA trend')
+def test_crossed_window():
+    """Test windows without UA are skipped by the trend"""
+    pass
+
+# Step definitions
+@given(parsers.parse('I have temperature readings {t1:d}, {t2:d}, {t3:d} and {t4:d}'))
+def temperature_readings(t1, t2, t3, t4):
+    """Set up a reading"""
+    pytest.reading = reading(t1, t2, t3, t4)
+
+@given(parsers.parse('I have thermal analytics with hot and cold flows of {flow:f} kg/s'))
+def analytics_with_flows(flow):
+    """Analytics with flow rates"""
+    pytest.analytics = ThermalAnalytics(hot_flow=flow, cold_flow=flow)
+
+@given(parsers.parse('I have thermal analytics with a window of {seconds:d} seconds'))
+def analytics_with_window(seconds):
+    """Analytics with a short window"""
+    pytest.analytics = ThermalAnalytics(window=seconds)
+    pytest.windows = []
+
+@given('I have thermal analytics with hourly windows and a fouling alert')
+def analytics_with_alert():
+    """Analytics collecting alerts"""
+    pytest.alerts = []
+    pytest.analytics = ThermalAnalytics(window=HOUR, fouling_threshold=0.5,
+                                        on_alert=pytest.alerts.append)
+
+@given(parsers.parse('I have thermal analytics with flows of {flow:f} kg/s, hourly windows and a fouling alert'))
+def analytics_with_flows_and_alert(flow):
+    """Analytics with flows collecting alerts"""
+    pytest.alerts = []
+    pytest.windows = []
+    pytest.clock = 0.0
+    pytest.analytics = ThermalAnalytics(hot_flow=flow, cold_flow=flow, window=HOUR,
+                                        fouling_threshold=0.5, on_alert=pytest.alerts.append)
+
+@when('I calculate the LMTD')
+def calculate_lmtd():
+    """Calculate the LMTD"""
+    pytest.lmtd = lmtd(*(pytest.reading[name] for name in ('T1', 'T2', 'T3', 'T4')))
+
+@when(parsers.parse('I compute the values for temperature readings {t1:d}, {t2:d}, {t3:d} and {t4:d}'))
+def compute_values(t1, t2, t3, t4):
+    """Compute the instantaneous values"""
+    pytest.values = pytest.analytics.compute(reading(t1, t2, t3, t4))
+
+@when(parsers.parse('I add a reading every {step:d} seconds for {seconds:d} seconds'))
+def add_readings(step, seconds):
+    """Feed readings"""
+    for t in range(0, seconds + 1, step):
+        closed = pytest.analytics.update(reading(85.0, 45.0, 15.0, 55.0), EPOCH + t)
+        if closed:
+            pytest.windows.append(closed)
+
+def _feed_days(days, drop_per_day):
+    """Feed one reading every 10 minutes with a linear effectiveness drift"""
+    for step in range(int(days * 24 * 6) + 1):
+        t = step * 600.0
+        effectiveness = 60.0 - drop_per_day * t / 86400.0
+        # T1=80, T3=20 so that T4 = 20 + effectiveness% of 60
+        pytest.analytics.update(reading(80.0, 45.0, 20.0, 20.0 + 0.6 * effectiveness), EPOCH + t)
+
+@when(parsers.parse('the effectiveness drops {drop:d} percent per day for {days:d} days'))
+def effectiveness_drops(drop, days):
+    """Simulate fouling"""
+    _feed_days(days, drop)
+
+@when(parsers.parse('the effectiveness stays constant for {days:d} days'))
+def effectiveness_constant(days):
+    """Simulate a clean exchanger"""
+    _feed_days(days, 0)
+
+def _feed_until(seconds, temperatures):
+    """Feed one reading every 10 minutes from the current clock"""
+    end = pytest.clock + seconds
+    while pytest.clock < end:
+        closed = pytest.analytics.update(temperatures, EPOCH + pytest.clock)
+        if closed:
+            pytest.windows.append(closed)
+        pytest.clock += 600.0
+
+@when(parsers.parse('the temperatures stay constant for {days:d} days'))
+def temperatures_constant(days):
+    """Feed a steady exchanger"""
+    _feed_until(days * 86400.0, reading(85.0, 45.0, 15.0, 55.0))
+
+@when('the temperatures cross for one hour')
+def temperatures_cross():
+    """Feed one window where the cold outlet is above the hot inlet, so there is no LMTD"""
+    _feed_until(HOUR, reading(50.0, 45.0, 15.0, 55.0))
+    # Close the crossed window
+    _feed_until(600.0, reading(85.0, 45.0, 15.0, 55.0))
+
+@then(parsers.parse('the LMTD should be approximately {expected:f} K'))
+def check_lmtd(expected):
+    """Verify the LMTD"""
+    assert abs(pytest.lmtd - expected) < 0.01
+
+@then(parsers.parse('the heat duty should be approximately {expected:d} W'))
+def check_duty(expected):
+    """Verify the heat duty"""
+    assert abs(pytest.values['duty'] - expected) < 1
+
+@then(parsers.parse('the UA should be approximately {expected:f} W/K'))
+def check_ua(expected):
+    """Verify UA"""
+    assert abs(pytest.values['ua'] - expected) < 0.1
+
+@then(parsers.parse('the NTU should be approximately {expected:f}'))
+def check_ntu(expected):
+    """Verify NTU"""
+    assert abs(pytest.values['ntu'] - expected) < 0.001
+
+@then(parsers.parse('{count:d} window should have closed with {samples:d} samples'))
+def check_windows(count, samples):
+    """Verify the closed windows"""
+    assert len(pytest.windows) == count
+    assert pytest.windows[0]['samples'] == samples
+
+@then(parsers.parse('the window mean effectiveness should be approximately {expected:f} percent'))
+def check_window_mean(expected):
+    """Verify the window mean"""
+    assert abs(pytest.windows[0]['effectiveness'] - expected) < 0.1
+
+@then(parsers.parse('the effectiveness trend should be approximately {expected:f} percent per day'))
+def check_trend(expected):
+    """Verify the regression slope"""
+    assert abs(pytest.analytics.fouling_rate() - expected) < 0.05
+
+@then(parsers.parse('exactly {count:d} fouling alert should have been raised'))
+def check_alerts(count):
+    """Verify the alert is raised once"""
+    assert len(pytest.alerts) == count
+    assert pytest.alerts[0]['indicator'] == 'effectiveness'
+
+@then('the windows should trend the UA')
+def check_trend_indicator():
+    """Verify the indicator did not switch for the crossed window"""
+    assert pytest.windows[-1]['ua'] is None
+    assert {window['trend_indicator'] for window in pytest.windows} == {'ua'}
+
+@then('no fouling alert should have been raised')
+def check_no_alert():
+    """Verify no alert"""
+    assert pytest.alerts == []
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Multi-process acquisition for the Temperature Collector
+Every 1-Wire bus is read by its own process, which writes into a
+shared-memory reading ring (see therm.shm_ring). The logger, publisher,
+analytics or a `python -m therm.shm_ring <ring>` tail read the rings from
+other processes without blocking acquisition.
+"""
+
+import multiprocessing
+import time
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from .shm_ring import RingWriter, RingReader
+from .reading import Reading
+
+log = logging.getLogger(__name__)
+
+# Seconds between checks of the stop flag while a bus process waits for its next reading
+STOP_POLL = 0.1
+
+
+def ring_name(prefix: str, bus: str) -> str:
+    """Shared memory name of a bus ring"""
+    safe_bus = "".join(c if c.isalnum() else "_" for c in bus)
+    return f"{prefix}_{safe_bus}"
+
+
+def _acquire_bus(config_file: str, bus: str, name: str, interval: float, stop_flag,
+                 backend: Optional[str] = None):
+    """Acquisition process: read one bus and write the readings into its ring"""
+    # Imported here so the sensor backend is initialized in the child process
+    from .temperature_collector import TemperatureCollector
+
+    collector = TemperatureCollector(config_file, watch_config=False, backend=backend)
+    writer = RingWriter(name, create=False)
+    log.info(f"Acquiring bus {bus} into ring {name} (interval: {interval}s)")
+    try:
+        while not stop_flag.value:
+            deadline = time.monotonic() + interval
+            writer.write(collector.read_bus(bus))
+            # Poll the flag instead of waiting on a shared Event: an Event's
+            # condition blocks the parent when a waiting child is killed
+            while not stop_flag.value and time.monotonic() < deadline:
+                time.sleep(min(STOP_POLL, deadline - time.monotonic()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+
+
+class MultiProcessAcquisition:
+    """
+    Runs one acquisition process per bus and gives the parent (or any other
+    process) access to the rings.
+
+    Example:
+        >>> acquisition = MultiProcessAcquisition(collector, interval=5)
+        >>> acquisition.start()
+        >>> collector.monitor_continuous(5, record_source=acquisition.read_records)
+    """
+
+    def __init__(self, collector, interval: float = 30, capacity: int = 4096,
+                 prefix: str = "hem"):
+        """
+        Args:
+            collector: TemperatureCollector providing the config (its buses and config file)
+            interval: Reading interval of every bus process in seconds
+            capacity: Records per ring
+            prefix: Prefix of the shared memory ring names
+        """
+        self.collector = collector
+        self.interval = interval
+        self.capacity = capacity
+        self.prefix = prefix
+        self.rings: Dict[str, str] = {}
+        self.processes: Dict[str, multiprocessing.Process] = {}
+        self.restarts: Dict[str, int] = {}
+        self._writers: Dict[str, RingWriter] = {}
+        self._readers: Dict[str, RingReader] = {}
+        self._cursors: Dict[str, int] = {}
+        self._stop_flags = {}
+        self._started: Dict[str, float] = {}
+        # Bus -> {sensor name: device ID} the running processes were started with
+        self._layouts: Dict[str, Dict[str, str]] = {}
+
+    def _bus_layouts(self) -> Dict[str, Dict[str, str]]:
+        """Sensor names and device IDs of every bus in the collector config"""
+        mapping = self.collector.device_mapping
+        return {bus: {name: mapping[name] for name in sensor_names}
+                for bus, sensor_names in self.collector.buses.items()}
+
+    def start(self):
+        """Create the rings and start one acquisition process per bus"""
+        for bus, layout in self._bus_layouts().items():
+            self._start_bus(bus, layout)
+
+    def _start_bus(self, bus: str, layout: Dict[str, str]):
+        """Create the ring of a bus and start its process"""
+        name = ring_name(self.prefix, bus)
+        # The parent owns the segments so they outlive restarts of a bus process
+        self._writers[bus] = RingWriter(name, list(layout), self.capacity)
+        self._readers[bus] = RingReader(name)
+        # Records of a reused stale ring were written by a previous run, skip them
+        self._cursors[bus] = self._readers[bus].write_count
+        self.rings[bus] = name
+        self.restarts[bus] = 0
+        self._layouts[bus] = layout
+        self._spawn(bus)
+
+    def _spawn(self, bus: str):
+        """Start the acquisition process of a bus"""
+        name = self.rings[bus]
+        # Lock-free flag, a killed child can never leave it locked
+        stop_flag = multiprocessing.RawValue('b', 0)
+        process = multiprocessing.Process(
+            target=_acquire_bus,
+            args=(self.collector.config_file, bus, name, self.interval, stop_flag,
+                  self.collector.backend),
+            name=f"w1-bus-{bus}",
+            daemon=True,
+        )
+        process.start()
+        self.processes[bus] = process
+        self._stop_flags[bus] = stop_flag
+        self._started[bus] = time.monotonic()
+        log.info(f"Started acquisition process for bus {bus} (ring: {name})")
+
+    def _stop_bus(self, bus: str, timeout: float = 5.0):
+        """Stop the process of a bus and remove its ring"""
+        process = self.processes.pop(bus)
+        self._stop_flags.pop(bus).value = 1
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout)
+        self._readers.pop(bus).close()
+        self._writers.pop(bus).close()
+        for state in (self.rings, self.restarts, self._cursors, self._started, self._layouts):
+            state.pop(bus, None)
+
+    def check_processes(self) -> List[str]:
+        """
+        Restart acquisition processes that died, at most once per interval per bus
+
+        Returns:
+            Buses whose process was restarted
+        """
+        restarted = []
+        for bus, process in list(self.processes.items()):
+            if process.is_alive() or self._stop_flags[bus].value:
+                continue
+            if time.monotonic() - self._started[bus] < max(self.interval, 1.0):
+                # Crashed right after starting, don't respawn in a tight loop
+                continue
+            log.error(f"Acquisition process for bus {bus} died (exit code {process.exitcode}), restarting")
+            self.restarts[bus] += 1
+            self._spawn(bus)
+            restarted.append(bus)
+        return restarted
+
+    def sync_config(self) -> List[str]:
+        """
+        Follow a config reload of the collector: buses whose sensors or device
+        IDs changed are restarted with a new ring, removed buses are stopped
+        and added buses are started
+
+        Returns:
+            Buses that were stopped, restarted or started
+        """
+        layouts = self._bus_layouts()
+        changed = [bus for bus in set(self._layouts) | set(layouts)
+                   if self._layouts.get(bus) != layouts.get(bus)]
+        for bus in changed:
+            if bus in self.processes:
+                self._stop_bus(bus)
+            if bus in layouts:
+                self._start_bus(bus, layouts[bus])
+        if changed:
+            log.info(f"Restarted acquisition of buses {sorted(changed)} after a config change")
+        return changed
+
+    def reader(self, bus: str) -> RingReader:
+        """Ring reader of a bus"""
+        return self._readers[bus]
+
+    def _to_reading(self, reader: RingReader, values: list) -> Reading:
+        """Reading of one ring record"""
+        reading = self.collector.new_reading()
+        positions = reading.index.positions
+        # Rings hold the same milli-degrees, slots are copied as they are
+        for slot_name, value in zip(reader.slot_names, values):
+            if slot_name in positions:
+                reading.set_milli(slot_name, value)
+        return reading
+
+    def read_records(self) -> List[Tuple[float, Reading]]:
+        """
+        Every record written since the last call, for use as the record_source
+        of TemperatureCollector.monitor_continuous. Each record holds the
+        sensors of one bus and keeps its acquisition timestamp. Config changes
+        and dead acquisition processes are handled first (see sync_config and
+        check_processes).
+
+        Returns:
+            (epoch timestamp, reading) tuples, oldest first
+        """
+        self.sync_config()
+        self.check_processes()
+        records = []
+        for bus, reader in self._readers.items():
+            new_records, self._cursors[bus] = reader.read_since(self._cursors[bus])
+            records.extend((timestamp, self._to_reading(reader, values))
+                           for _, timestamp, values in new_records)
+        records.sort(key=lambda record: record[0])
+        return records
+
+    def wait_for_records(self, timeout: float = 10.0) -> bool:
+        """
+        Wait until every ring has a record that was not read yet
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if all rings have new records
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if all(reader.write_count > self._cursors[bus] for bus, reader in self._readers.items()):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    def read_all_temperatures(self, max_age: Optional[float] = None) -> Reading:
+        """
+        Merge the newest record of every bus ring into a snapshot, without
+        reading any sensor. Use read_records to process every record.
+
+        Args:
+            max_age: Ignore records older than this many seconds
+                     (default: 2 intervals, at least 1 second)
+
+        Returns:
+            Reading with sensor names as keys and temperatures as values
+        """
+        if max_age is None:
+            max_age = max(2 * self.interval, 1.0)
+        now = time.time()
+        reading = self.collector.new_reading()
+        positions = reading.index.positions
+        for reader in self._readers.values():
+            latest = reader.latest_values()
+            if latest is None or now - latest[0] > max_age:
+                continue
+            for slot_name, value in zip(reader.slot_names, latest[1]):
+                if slot_name in positions:
+                    reading.set_milli(slot_name, value)
+        return reading
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the acquisition processes and remove the rings"""
+        # Signal every process first so they shut down in parallel
+        for stop_flag in self._stop_flags.values():
+            stop_flag.value = 1
+        for bus in list(self.processes):
+            self._stop_bus(bus, timeout)
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Streaming thermal analytics for the Temperature Collector
+Incrementally maintains heat duty, LMTD, UA/NTU and a fouling trend per
+heat exchanger with O(1) memory: readings are folded into running sums of
+the current tumbling window and never stored.
+
+Assumes: T1=Hot_in, T2=Hot_out, T3=Cold_in, T4=Cold_out
+"""
+
+import math
+import time
+from typing import Callable, Dict, List, Optional
+import logging
+
+from .sinks import Sink, Record
+
+log = logging.getLogger(__name__)
+
+# Specific heat capacity of water in J/(kg*K)
+CP_WATER = 4186.0
+SECONDS_PER_DAY = 86400.0
+# Exchanger parameters of the plant config used by ThermalAnalytics
+FLOW_PARAMETERS = ('hot_flow', 'cold_flow', 'hot_cp', 'cold_cp', 'counterflow')
+
+
+def lmtd(t_hot_in: float, t_hot_out: float, t_cold_in: float, t_cold_out: float,
+         counterflow: bool = True) -> Optional[float]:
+    """
+    Log mean temperature difference
+
+    Args:
+        t_hot_in, t_hot_out, t_cold_in, t_cold_out: Temperatures in °C
+        counterflow: Counterflow (default) or parallel flow arrangement
+
+    Returns:
+        LMTD in K or None if the temperatures cross
+    """
+    if counterflow:
+        dt_a, dt_b = t_hot_in - t_cold_out, t_hot_out - t_cold_in
+    else:
+        dt_a, dt_b = t_hot_in - t_cold_in, t_hot_out - t_cold_out
+    if dt_a <= 0 or dt_b <= 0:
+        return None
+    if abs(dt_a - dt_b) < 1e-6:
+        return dt_a
+    return (dt_a - dt_b) / math.log(dt_a / dt_b)
+
+
+class RunningStats:
+    """Count, mean, min and max of a stream in O(1) memory"""
+
+    __slots__ = ('count', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: Optional[float]):
+        if value is None:
+            return
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+class StreamingRegression:
+    """
+    Least-squares line y = intercept + slope * x over a stream of points.
+    Keeps only running sums; with a half-life older points are exponentially
+    forgotten so the trend follows recent behaviour.
+    """
+
+    __slots__ = ('half_life', 'x0', 'weight', 'sx', 'sy', 'sxx', 'sxy', 'last_x')
+
+    def __init__(self, half_life: Optional[float] = None):
+        """
+        Args:
+            half_life: Forgetting half-life in x units (default: never forget)
+        """
+        self.half_life = half_life
+        self.x0 = None
+        self.weight = self.sx = self.sy = self.sxx = self.sxy = 0.0
+        self.last_x = None
+
+    def add(self, x: float, y: float):
+        """Add a point, x must not decrease"""
+        if self.x0 is None:
+            # Center x on the first point to keep the sums well conditioned
+            self.x0 = x
+        if self.half_life and self.last_x is not None and x > self.last_x:
+            decay = 0.5 ** ((x - self.last_x) / self.half_life)
+            self.weight *= decay
+            self.sx *= decay
+            self.sy *= decay
+            self.sxx *= decay
+            self.sxy *= decay
+        self.last_x = x
+        x -= self.x0
+        self.weight += 1.0
+        self.sx += x
+        self.sy += y
+        self.sxx += x * x
+        self.sxy += x * y
+
+    @property
+    def slope(self) -> Optional[float]:
+        denominator = self.weight * self.sxx - self.sx * self.sx
+        if self.weight < 2 or abs(denominator) < 1e-12:
+            return None
+        return (self.weight * self.sxy - self.sx * self.sy) / denominator
+
+    @property
+    def intercept(self) -> Optional[float]:
+        slope = self.slope
+        if slope is None:
+            return None
+        return (self.sy - slope * self.sx) / self.weight - slope * self.x0
+
+
+class ThermalAnalytics:
+    """
+    Streaming analytics of one heat exchanger
+
+    Every reading updates the running sums of the current window. When a
+    window closes its summary is emitted and its mean effectiveness (or UA
+    when flow rates are known) is fed to the fouling regression.
+    """
+
+    def __init__(self, hot_flow: Optional[float] = None, cold_flow: Optional[float] = None,
+                 hot_cp: float = CP_WATER, cold_cp: float = CP_WATER, counterflow: bool = True,
+                 window: float = 3600.0, trend_half_life_days: Optional[float] = 30.0,
+                 fouling_threshold: float = 0.5, min_trend_days: float = 3.0,
+                 on_alert: Optional[Callable[[dict], None]] = None):
+        """
+        Args:
+            hot_flow: Hot side mass flow in kg/s (enables heat duty, UA and NTU)
+            cold_flow: Cold side mass flow in kg/s
+            hot_cp: Hot side specific heat in J/(kg*K)
+            cold_cp: Cold side specific heat in J/(kg*K)
+            counterflow: Counterflow (default) or parallel flow arrangement
+            window: Window length in seconds
+            trend_half_life_days: Forgetting half-life of the fouling trend in days
+            fouling_threshold: Alert when effectiveness drops faster than this many
+                               percentage points per day (or UA by this many percent per day)
+            min_trend_days: Days of data needed before alerting
+            on_alert: Called with an alert dictionary when fouling is detected
+        """
+        self.hot_capacity = hot_flow * hot_cp if hot_flow else None
+        self.cold_capacity = cold_flow * cold_cp if cold_flow else None
+        self.counterflow = counterflow
+        self.window = window
+        self.fouling_threshold = fouling_threshold
+        self.min_trend_days = min_trend_days
+        self.on_alert = on_alert
+
+        self.stats = {name: RunningStats() for name in ('effectiveness', 'lmtd', 'duty', 'ua', 'ntu')}
+        self.trend = StreamingRegression(trend_half_life_days)
+        self.window_start = None
+        self.first_window_start = None
+        self.last_window: Optional[dict] = None
+        self.latest: Dict[str, Optional[float]] = {}
+        self.alerting = False
+
+    @property
+    def has_flows(self) -> bool:
+        return self.hot_capacity is not None and self.cold_capacity is not None
+
+    def compute(self, temperatures: Dict[str, float]) -> Dict[str, Optional[float]]:
+        """
+        Instantaneous values of one reading
+
+        Args:
+            temperatures: Dictionary with T1..T4
+
+        Returns:
+            Dictionary with effectiveness (%), lmtd (K), duty (W), ua (W/K) and ntu
+        """
+        t1, t2, t3, t4 = (temperatures[name] for name in ('T1', 'T2', 'T3', 'T4'))
+        values = {'effectiveness': None, 'lmtd': lmtd(t1, t2, t3, t4, self.counterflow),
+                  'duty': None, 'ua': None, 'ntu': None}
+        if t1 != t3:
+            values['effectiveness'] = (t4 - t3) / (t1 - t3) * 100
+
+        if self.has_flows:
+            # Average both sides, they differ by heat loss and sensor error
+            duty = (self.hot_capacity * (t1 - t2) + self.cold_capacity * (t4 - t3)) / 2
+            values['duty'] = duty
+            if values['lmtd']:
+                ua = duty / values['lmtd']
+                values['ua'] = ua
+                values['ntu'] = ua / min(self.hot_capacity, self.cold_capacity)
+        return values
+
+    def update(self, temperatures: Dict[str, float], timestamp: Optional[float] = None) -> Optional[dict]:
+        """
+        Fold one reading into the analytics
+
+        Args:
+            temperatures: Dictionary with T1..T4, incomplete readings are ignored
+            timestamp: Epoch time of the reading (default: now)
+
+        Returns:
+            Summary of the window closed by this reading, otherwise None
+        """
+        if any(temperatures.get(name) is None for name in ('T1', 'T2', 'T3', 'T4')):
+            return None
+        if timestamp is None:
+            timestamp = time.time()
+
+        closed = None
+        if self.window_start is None:
+            self.window_start = self.first_window_start = timestamp
+        elif timestamp - self.window_start >= self.window:
+            closed = self._close_window(timestamp)
+
+        self.latest = self.compute(temperatures)
+        for name, value in self.latest.items():
+            self.stats[name].add(value)
+        return closed
+
+    def _close_window(self, timestamp: float) -> dict:
+        """Emit the current window summary, update the trend and start a new window"""
+        summary = {'start': self.window_start, 'end': timestamp,
+                   'samples': self.stats['effectiveness'].count}
+        for name, stats in self.stats.items():
+            summary[name] = stats.mean
+            stats.reset()
+
+        # Fouling shows as falling UA; without flows use the effectiveness.
+        # The indicator is fixed per engine so the trend never mixes both, a
+        # window without a value (e.g. crossed temperatures) is skipped
+        indicator = 'ua' if self.has_flows else 'effectiveness'
+        if summary[indicator] is not None:
+            self.trend.add((self.window_start + timestamp) / 2 / SECONDS_PER_DAY, summary[indicator])
+        summary['trend_indicator'] = indicator
+        summary['trend_per_day'] = self.fouling_rate(indicator)
+
+        self.last_window = summary
+        self.window_start = timestamp
+        self._check_fouling(summary)
+        return summary
+
+    def fouling_rate(self, indicator: str = 'effectiveness') -> Optional[float]:
+        """
+        Trend of the fouling indicator per day
+
+        Returns:
+            Percentage points per day for effectiveness, percent of the fitted
+            value per day for UA, None until there are two windows
+        """
+        slope = self.trend.slope
+        if slope is None:
+            return None
+        if indicator == 'ua':
+            current = self.trend.intercept + slope * self.trend.last_x
+            return slope / current * 100 if current else None
+        return slope
+
+    def _check_fouling(self, summary: dict):
+        """Raise a fouling alert when the trend falls faster than the threshold"""
+        rate = summary['trend_per_day']
+        days = (summary['end'] - self.first_window_start) / SECONDS_PER_DAY
+        fouling = rate is not None and days >= self.min_trend_days and rate < -self.fouling_threshold
+        if fouling and not self.alerting:
+            alert = {'type': 'fouling', 'indicator': summary['trend_indicator'],
+                     'rate_per_day': rate, 'timestamp': summary['end']}
+            log.warning(f"Fouling detected: {summary['trend_indicator']} trend {rate:.2f}%/day")
+            if self.on_alert:
+                self.on_alert(alert)
+        self.alerting = fouling
+
+
+class PlantAnalytics(Sink):
+    """
+    Analytics of every exchanger of a collector, usable as a collector sink:
+
+        >>> collector.add_sink("analytics", PlantAnalytics(collector))
+
+    Flow rates are taken from the exchanger parameters of the plant config
+    (hot_flow, cold_flow, hot_cp, cold_cp) unless given explicitly.
+    """
+
+    def __init__(self, collector, flows: Optional[Dict[str, dict]] = None, **options):
+        """
+        Args:
+            collector: TemperatureCollector providing the exchanger grouping
+            flows: Exchanger name -> ThermalAnalytics flow options
+            **options: ThermalAnalytics options shared by all exchangers
+        """
+        self.collector = collector
+        self.flows = flows
+        self.options = options
+        self.exchangers: Dict[str, ThermalAnalytics] = {}
+        self.windows: Dict[str, dict] = {}
+
+    def _analytics(self, exchanger: str) -> ThermalAnalytics:
+        analytics = self.exchangers.get(exchanger)
+        if analytics is None:
+            if self.flows is not None:
+                flow_options = self.flows.get(exchanger, {})
+            else:
+                parameters = self.collector.config.parameters.get(exchanger, {})
+                flow_options = {key: value for key, value in parameters.items() if key in FLOW_PARAMETERS}
+            analytics = ThermalAnalytics(**dict(self.options, **flow_options))
+            self.exchangers[exchanger] = analytics
+        return analytics
+
+    def write(self, records: List[Record]):
+        for timestamp, temperatures in records:
+            for exchanger, group in self.collector.exchanger_readings(temperatures).items():
+                closed = self._analytics(exchanger).update(group, timestamp)
+                if closed is not None:
+                    self.windows[exchanger] = closed
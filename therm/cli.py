@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Headless command line entry point of the Temperature Collector
+Runs the monitoring loop unattended (e.g. as a systemd service) with the
+sensor backend, sinks and config chosen on the command line.
+
+    heat-exchanger-monitor --interval 5 --sink file --sink pubsub --sink dashboard:8080
+    heat-exchanger-monitor --backend dry-run --profile 1000 --sink sqlite:/tmp/readings.db
+    heat-exchanger-monitor --config plant.json --processes --sink file --sink dashboard
+
+Sinks (--sink, repeatable):
+    file[:path]         text log file (default: therm/temperature_log.txt)
+    sqlite[:path]       SQLite database (default: readings.db)
+    http(s)://...       POST readings as JSON to a URL
+    pubsub              Azure Web PubSub with on-disk spool (needs the secrets file)
+    dashboard[:port]    local live dashboard (default port: DASHBOARD_PORT secret or 8080,
+                        listening on DASHBOARD_HOST, default 127.0.0.1)
+    analytics           streaming thermal analytics
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+from typing import List, Optional, Tuple
+import logging
+
+from .temperature_collector import TemperatureCollector, BACKENDS
+from .sinks import Sink, FileLogSink, SQLiteSink, CallbackSink, HttpSink
+from .profiling import StageProfiler
+from .plant_config import DEFAULT_EXCHANGER
+
+log = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 30
+SINK_TYPES = ('file', 'sqlite', 'http', 'pubsub', 'dashboard', 'analytics')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options of the collector daemon"""
+    parser = argparse.ArgumentParser(
+        prog="heat-exchanger-monitor",
+        description="Collect heat exchanger temperatures and hand them to the configured sinks",
+    )
+    parser.add_argument("--config", default="devicenames.json",
+                        help="Device mapping / plant config file (default: %(default)s)")
+    parser.add_argument("--interval", type=float, default=None,
+                        help=f"Reading interval in seconds (default: {DEFAULT_INTERVAL}, 0 when profiling)")
+    parser.add_argument("--backend", choices=BACKENDS, default=None,
+                        help="Sensor backend (default: hardware if available, otherwise mock)")
+    parser.add_argument("--dry-run", dest="backend", action="store_const", const="dry-run",
+                        help="Shortcut for --backend dry-run: deterministic sensors without I/O")
+    parser.add_argument("--sink", dest="sinks", action="append", metavar="SPEC",
+                        help="Reading sink, repeatable (file[:path], sqlite[:path], http(s)://url, "
+                             "pubsub, dashboard[:port], analytics)")
+    parser.add_argument("--secrets", default=os.environ.get("HEM_SECRETS", "secrets.json"),
+                        help="Secrets file for the pubsub and dashboard sinks (default: %(default)s)")
+    parser.add_argument("--cycles", type=int, default=None,
+                        help="Stop after this many cycles (default: run until stopped)")
+    parser.add_argument("--profile", type=int, default=None, metavar="N",
+                        help="Run N cycles and print a per-stage time and allocation breakdown")
+    parser.add_argument("--no-tracemalloc", action="store_true",
+                        help="Profile times only, without allocation tracing")
+    parser.add_argument("--no-watch", action="store_true",
+                        help="Do not reload the config file when it changes")
+    parser.add_argument("--processes", action="store_true",
+                        help="Read every bus in its own process through shared-memory rings, "
+                             "bus processes are restarted when the config changes")
+    parser.add_argument("--log-level", default="INFO",
+                        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+                        help="Log level (default: %(default)s)")
+    return parser
+
+
+def load_secrets(path: str) -> dict:
+    """
+    Load the secrets file
+
+    Args:
+        path: Path to the secrets JSON file
+
+    Returns:
+        Secrets dictionary, empty if the file does not exist
+    """
+    if not os.path.exists(path):
+        log.info(f"No secrets file at {path}")
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _pubsub_sink(collector: TemperatureCollector, secrets: dict) -> Sink:
+    """Web PubSub publisher with on-disk spool, wrapped as a sink"""
+    # Imported here, the Azure SDK is only needed when publishing
+    try:
+        from publisher.temperature_PubSub import TemperaturePublisher
+        from publisher.spool import ReadingSpool, SpoolingPublisher
+    except ImportError as e:
+        raise ValueError(f"The pubsub sink needs the pubsub extra "
+                         f"(pip install 'HeatExchangerMonitor[pubsub]'): {e}") from e
+
+    connection_string = secrets.get("AZURE_WEBPUBSUB_CONNECTION_STRING")
+    if not connection_string:
+        raise ValueError("AZURE_WEBPUBSUB_CONNECTION_STRING missing from the secrets file")
+    publisher = TemperaturePublisher(connection_string=connection_string, hub_name="heat_exchanger_hub")
+    # Spool unsent readings on disk and backfill them when the uplink returns
+    publisher = SpoolingPublisher(publisher, ReadingSpool(secrets.get("SPOOL_PATH", "spool.db")))
+    return CallbackSink(lambda temperatures, timestamp:
+                        publish_reading(collector, publisher, temperatures, timestamp),
+                        with_timestamp=True)
+
+
+def publish_reading(collector: TemperatureCollector, publisher, temperatures,
+                    timestamp: Optional[float] = None):
+    """
+    Publish one reading, decided per reading so config reloads are followed
+
+    Args:
+        collector: Collector providing the current exchanger grouping
+        publisher: TemperaturePublisher or SpoolingPublisher
+        temperatures: Flat reading
+        timestamp: Epoch time the reading was taken (default: now)
+    """
+    if list(collector.exchangers) == [DEFAULT_EXCHANGER]:
+        # Flat config: sensors are named T1..T4, one plain message
+        publisher.publish_temperature(temperatures, timestamp)
+    else:
+        # Plant config (even with a single named exchanger): one batch message
+        # with the readings of every exchanger keyed by role
+        publisher.publish_exchangers(collector.exchanger_readings(temperatures), timestamp)
+
+
+def build_sink(spec: str, collector: TemperatureCollector, secrets: dict,
+               servers: list) -> Tuple[str, Optional[Sink]]:
+    """
+    Create a sink from a --sink specification
+
+    Args:
+        spec: Sink specification, e.g. "file", "sqlite:/var/lib/hem/readings.db"
+        collector: Collector the sink is attached to
+        secrets: Secrets dictionary
+        servers: Started servers (dashboard) are appended, stop them on exit
+
+    Returns:
+        (sink type, sink), the sink is None when it is disabled
+
+    Raises:
+        ValueError: If the specification is invalid
+    """
+    if spec.startswith(("http://", "https://")):
+        return 'http', HttpSink(spec)
+    kind, _, arg = spec.partition(":")
+    if kind == 'file':
+        return kind, FileLogSink(arg) if arg else FileLogSink()
+    if kind == 'sqlite':
+        return kind, SQLiteSink(arg or "readings.db")
+    if kind == 'pubsub':
+        return kind, _pubsub_sink(collector, secrets)
+    if kind == 'dashboard':
+        from .history import ReadingHistory
+        from .dashboard import DashboardServer, DEFAULT_HOST
+
+        port = int(arg) if arg else secrets.get("DASHBOARD_PORT", 8080)
+        if not port:
+            log.info("Dashboard disabled")
+            return kind, None
+        history = ReadingHistory()
+        # Unauthenticated, other hosts only get access when DASHBOARD_HOST says so
+        server = DashboardServer(history, host=secrets.get("DASHBOARD_HOST", DEFAULT_HOST),
+                                 port=int(port))
+        server.start()
+        servers.append(server)
+        return kind, history
+    if kind == 'analytics':
+        from .analytics import PlantAnalytics
+        return kind, PlantAnalytics(collector)
+    raise ValueError(f"Unknown sink {spec!r}, expected one of {SINK_TYPES} or an http(s) URL")
+
+
+def _terminate(signum, frame):
+    """Stop the monitoring loop on SIGTERM like on Ctrl+C, so the sinks are flushed"""
+    raise KeyboardInterrupt
+
+
+def main(argv: Optional[List[str]] = None, default_sinks=('file',), **defaults) -> int:
+    """
+    Run the collector daemon
+
+    Args:
+        argv: Command line arguments (default: sys.argv[1:])
+        default_sinks: Sinks used when no --sink option is given
+        **defaults: Option defaults overriding the parser defaults, e.g. interval=5
+
+    Returns:
+        Exit code
+    """
+    parser = build_parser()
+    parser.set_defaults(**defaults)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=getattr(logging, args.log_level),
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    interval = args.interval
+    if interval is None:
+        interval = 0 if args.profile else DEFAULT_INTERVAL
+    cycles = args.profile or args.cycles
+
+    servers = []
+    collector = None
+    acquisition = None
+    try:
+        collector = TemperatureCollector(args.config, watch_config=not args.no_watch,
+                                         backend=args.backend)
+        log.info(f"Temperature Collector {'MOCK' if collector.using_mock else 'HARDWARE'} mode "
+                 f"(backend: {args.backend or 'auto'})")
+
+        sink_specs = args.sinks or default_sinks
+        secrets = {}
+        if any(spec.split(":")[0] in ('pubsub', 'dashboard') for spec in sink_specs):
+            secrets = load_secrets(args.secrets)
+        workers = {}
+        for spec in sink_specs:
+            kind, sink = build_sink(spec, collector, secrets, servers)
+            if sink is not None:
+                name = kind if kind not in workers else f"{kind}{len(workers)}"
+                workers[name] = collector.add_sink(name, sink)
+
+        record_source = None
+        if args.processes:
+            from .acquisition import MultiProcessAcquisition
+            acquisition = MultiProcessAcquisition(collector, interval=interval)
+            acquisition.start()
+            # Let the first cycle find the first records of every bus
+            if not acquisition.wait_for_records():
+                log.warning("Not every bus process has written a reading yet")
+            record_source = acquisition.read_records
+    except Exception as e:
+        log.error(f"Error starting the collector: {e}")
+        for server in servers:
+            server.stop()
+        if acquisition:
+            acquisition.stop()
+        if collector is not None:
+            # Stop the workers of the sinks registered before the failure
+            collector.close_sinks()
+        return 1
+
+    profiler = None
+    if args.profile:
+        profiler = StageProfiler(trace_allocations=not args.no_tracemalloc)
+        profiler.start()
+
+    previous_handler = signal.signal(signal.SIGTERM, _terminate)
+    try:
+        collector.monitor_continuous(interval, cycles=cycles, profiler=profiler,
+                                     record_source=record_source)
+    except Exception as e:
+        log.error(f"Error in temperature collection: {e}")
+        return 1
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        for server in servers:
+            server.stop()
+        if acquisition:
+            acquisition.stop()
+        if profiler:
+            # monitor_continuous has flushed and closed the sinks
+            profiler.stop(workers)
+            print(profiler.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Local live dashboard for the Temperature Collector
+A lightweight HTTP server on the LAN serving the latest readings, history
+queries and server-sent events from the in-memory reading history. Viewers
+never trigger sensor reads, every sample is acquired once and encoded once.
+
+Endpoints:
+    GET /                       minimal live page
+    GET /latest                 newest reading
+    GET /history?since=<cursor> readings after a cursor ("everything since X")
+    GET /history?start=<epoch>&end=<epoch>
+                                readings in a time range
+    GET /events                 server-sent events, resumes from Last-Event-ID
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+import logging
+
+from .history import ReadingHistory
+
+log = logging.getLogger(__name__)
+
+# Maximum entries per history response, clients page with the returned cursor
+MAX_HISTORY = 5000
+HEARTBEAT_INTERVAL = 15.0
+# Listen address; the dashboard has no authentication, serve the LAN only when configured
+DEFAULT_HOST = "127.0.0.1"
+
+INDEX_PAGE = b"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Heat Exchanger Monitor</title></head>
+<body><h1>Heat Exchanger Monitor</h1><pre id="latest">waiting for data...</pre>
+<script>
+const events = new EventSource("/events");
+events.onmessage = (e) => {
+  const reading = JSON.parse(e.data);
+  document.getElementById("latest").textContent =
+    new Date(reading.timestamp * 1000).toLocaleString() + "\\n" +
+    JSON.stringify(reading.temperatures, null, 2);
+};
+</script></body></html>
+"""
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    """Request handler, the server provides the history"""
+
+    server_version = "HeatExchangerMonitor"
+
+    def log_message(self, format, *args):
+        log.debug("%s - %s" % (self.address_string(), format % args))
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_entries(self, entries, cursor: int, reset: bool = False):
+        # Entries are already JSON encoded, only the envelope is built here
+        body = b'{"cursor":%d,"reset":%s,"readings":[%s]}' % (
+            cursor, b"true" if reset else b"false", b",".join(entry[3] for entry in entries))
+        self._send(200, body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        history: ReadingHistory = self.server.history
+        try:
+            if url.path == "/":
+                self._send(200, INDEX_PAGE, "text/html; charset=utf-8")
+            elif url.path == "/latest":
+                entry = history.latest()
+                self._send(200, entry[3] if entry else b"null")
+            elif url.path == "/history":
+                self._history(history, query)
+            elif url.path == "/events":
+                self._events(history)
+            else:
+                self._send(404, b'{"error":"not found"}')
+        except (ValueError, KeyError) as e:
+            self._send(400, json.dumps({"error": str(e)}).encode())
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _history(self, history: ReadingHistory, query: dict):
+        limit = min(int(query.get("limit", [MAX_HISTORY])[0]), MAX_HISTORY)
+        if "since" in query:
+            since = int(query["since"][0])
+            # A cursor ahead of the history means the collector restarted, a cursor
+            # behind it means the client missed readings that were already dropped
+            reset = since > history.last_cursor or since + 1 < history.first_cursor
+            if since > history.last_cursor:
+                since = 0
+            entries = history.since(since, limit)
+            self._send_entries(entries, entries[-1][0] if entries else history.last_cursor, reset)
+            return
+        start = float(query["start"][0]) if "start" in query else None
+        end = float(query["end"][0]) if "end" in query else None
+        entries = history.between(start, end, limit)
+        self._send_entries(entries, entries[-1][0] if entries else history.last_cursor)
+
+    def _events(self, history: ReadingHistory):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+
+        last_event_id = self.headers.get("Last-Event-ID")
+        if last_event_id:
+            cursor = int(last_event_id)
+            if cursor > history.last_cursor:
+                # The collector restarted, resend everything kept
+                cursor = 0
+        else:
+            # Start new viewers with the current reading
+            cursor = max(history.last_cursor - 1, 0)
+
+        while not self.server.closing:
+            if not history.wait(cursor, HEARTBEAT_INTERVAL):
+                self.wfile.write(b": heartbeat\n\n")
+                self.wfile.flush()
+                continue
+            for entry in history.since(cursor, MAX_HISTORY):
+                self.wfile.write(b"id: %d\ndata: %s\n\n" % (entry[0], entry[3]))
+                cursor = entry[0]
+            self.wfile.flush()
+
+
+class DashboardServer(ThreadingHTTPServer):
+    """
+    Dashboard HTTP server running on a background thread
+
+    Example:
+        >>> history = ReadingHistory()
+        >>> collector.add_sink("history", history)
+        >>> dashboard = DashboardServer(history, port=8080)
+        >>> dashboard.start()
+        >>> collector.monitor_continuous(5)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, history: ReadingHistory, host: str = DEFAULT_HOST, port: int = 8080):
+        """
+        Args:
+            history: Reading history fed by the collector
+            host: Listen address, the dashboard has no authentication so it only
+                  listens locally unless e.g. "0.0.0.0" is given
+            port: Listen port (0 picks a free port)
+        """
+        super().__init__((host, port), DashboardHandler)
+        self.history = history
+        self.closing = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self):
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name="dashboard", daemon=True)
+        self._thread.start()
+        log.info(f"Dashboard listening on http://{self.server_address[0]}:{self.port}/")
+
+    def stop(self):
+        """Stop serving and end open event streams"""
+        self.closing = True
+        self.history.notify()
+        self.shutdown()
+        self.server_close()
+
+
+def start_dashboard(collector, port: int = 8080, host: str = DEFAULT_HOST,
+                    capacity: int = 17280) -> DashboardServer:
+    """
+    Attach a reading history to a collector and start the dashboard server
+
+    Args:
+        collector: TemperatureCollector to serve readings from
+        port: Listen port
+        host: Listen address (default: localhost only)
+        capacity: Number of readings kept in the history
+
+    Returns:
+        The running DashboardServer
+    """
+    history = ReadingHistory(capacity)
+    collector.add_sink("dashboard", history)
+    server = DashboardServer(history, host, port)
+    server.start()
+    return server
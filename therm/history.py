@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+In-memory reading history for the Temperature Collector
+A bounded ring of recent readings with monotonically increasing cursors,
+used as a collector sink and queried by the local dashboard.
+"""
+
+import json
+import threading
+from typing import List, Mapping, Optional, Tuple
+
+from .sinks import Sink, Record
+from .reading import to_json
+
+# History entry: (cursor, epoch timestamp, temperatures, JSON encoded entry)
+Entry = Tuple[int, float, Mapping[str, float], bytes]
+
+
+class ReadingHistory(Sink):
+    """
+    Bounded reading history. Every reading gets a cursor (1, 2, 3, ...);
+    clients ask for everything after the last cursor they have seen.
+    Each entry is JSON encoded once when it is added.
+    """
+
+    def __init__(self, capacity: int = 17280):
+        """
+        Args:
+            capacity: Number of readings kept (default: one day at 5 s intervals)
+        """
+        self.capacity = capacity
+        self._entries: List[Optional[Entry]] = [None] * capacity
+        self._last_cursor = 0
+        self._condition = threading.Condition()
+
+    @property
+    def last_cursor(self) -> int:
+        """Cursor of the newest reading, 0 when empty"""
+        return self._last_cursor
+
+    @property
+    def first_cursor(self) -> int:
+        """Cursor of the oldest reading still kept"""
+        return max(self._last_cursor - self.capacity + 1, 1)
+
+    def append(self, timestamp: float, temperatures: Mapping[str, float]) -> int:
+        """
+        Add a reading
+
+        Args:
+            timestamp: Epoch time of the reading
+            temperatures: Temperature readings (and efficiencies)
+
+        Returns:
+            Cursor of the reading
+        """
+        with self._condition:
+            cursor = self._last_cursor + 1
+            encoded = (f'{{"cursor":{cursor},"timestamp":{json.dumps(timestamp)},'
+                       f'"temperatures":{to_json(temperatures)}}}').encode()
+            self._entries[cursor % self.capacity] = (cursor, timestamp, temperatures, encoded)
+            self._last_cursor = cursor
+            self._condition.notify_all()
+        return cursor
+
+    def write(self, records: List[Record]):
+        for timestamp, temperatures in records:
+            self.append(timestamp, temperatures)
+
+    def _entry(self, cursor: int) -> Entry:
+        return self._entries[cursor % self.capacity]
+
+    def latest(self) -> Optional[Entry]:
+        """Newest entry or None when empty"""
+        with self._condition:
+            return self._entry(self._last_cursor) if self._last_cursor else None
+
+    def since(self, cursor: int, limit: Optional[int] = None) -> List[Entry]:
+        """
+        Entries newer than cursor, oldest first
+
+        Args:
+            cursor: Last cursor the client has seen (0 for everything kept)
+            limit: Maximum number of entries
+
+        Returns:
+            List of entries
+        """
+        with self._condition:
+            first = max(cursor + 1, self.first_cursor)
+            last = self._last_cursor
+            if limit is not None:
+                last = min(last, first + limit - 1)
+            return [self._entry(c) for c in range(first, last + 1)]
+
+    def _bisect(self, timestamp: float) -> int:
+        """First cursor with an entry timestamp >= timestamp"""
+        low, high = self.first_cursor, self._last_cursor + 1
+        while low < high:
+            middle = (low + high) // 2
+            if self._entry(middle)[1] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def between(self, start: Optional[float] = None, end: Optional[float] = None,
+                limit: Optional[int] = None) -> List[Entry]:
+        """
+        Entries with start <= timestamp < end, oldest first
+
+        Args:
+            start: Epoch start time (default: oldest kept)
+            end: Epoch end time (default: newest)
+            limit: Maximum number of entries
+
+        Returns:
+            List of entries
+        """
+        with self._condition:
+            if not self._last_cursor:
+                return []
+            first = self._bisect(start) if start is not None else self.first_cursor
+            last = self._bisect(end) - 1 if end is not None else self._last_cursor
+            if limit is not None:
+                last = min(last, first + limit - 1)
+            return [self._entry(c) for c in range(first, last + 1)]
+
+    def wait(self, cursor: int, timeout: float) -> bool:
+        """
+        Wait until there is a reading newer than cursor
+
+        Args:
+            cursor: Last cursor the caller has seen
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if a newer reading is available
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._last_cursor > cursor, timeout)
+
+    def notify(self):
+        """Wake up all waiters, e.g. on shutdown"""
+        with self._condition:
+            self._condition.notify_all()
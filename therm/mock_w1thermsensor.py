@@ -4,6 +4,7 @@ Mock W1ThermSensor for testing without hardware
 """
 
 import random
+import zlib
 from typing import Optional
 
 
@@ -98,6 +99,25 @@ class MockW1ThermSensor:
         ]
 
 
+class DryRunW1ThermSensor(MockW1ThermSensor):
+    """
+    Deterministic sensor without any I/O or randomness, used to measure the
+    capacity of the acquisition pipeline itself
+    """
+
+    def _get_base_temperature(self) -> float:
+        # Stable per sensor ID, spread over the mock temperature range
+        return 15.0 + zlib.crc32(str(self.sensor_id).encode()) % 7000 / 100
+
+    def get_temperature(self, unit=None) -> float:
+        unit = unit or MockUnit.DEGREES_C
+        if unit == MockUnit.DEGREES_F:
+            return self._base_temp * 9/5 + 32
+        elif unit == MockUnit.KELVIN:
+            return self._base_temp + 273.15
+        return self._base_temp
+
+
 # Export mock classes with same names as real library
 W1ThermSensor = MockW1ThermSensor
 Unit = MockUnit
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Plant configuration model for the Temperature Collector
+Groups sensors into named heat exchangers and 1-Wire buses
+
+Two config file formats are supported. The flat format maps sensor names
+to device IDs and describes a single exchanger on a single bus:
+
+    {"T1": "28-000000355881", "T2": "28-00000036240c", ...}
+
+The plant format groups sensors by exchanger. The bus can be set per
+exchanger or per sensor:
+
+    {
+        "exchangers": {
+            "hx1": {"bus": "w1_bus_master1",
+                    "sensors": {"T1": "28-...", "T2": "28-...", "T3": "28-...", "T4": "28-..."}},
+            "hx2": {"sensors": {"T1": {"id": "28-...", "bus": "w1_bus_master2"}, ...},
+                    "hot_flow": 0.5, "cold_flow": 0.4}
+        }
+    }
+
+Sensors of the plant format are named "<exchanger>.<role>", e.g. "hx1.T1".
+Any other exchanger keys (e.g. flow rates for therm.analytics) are kept as
+exchanger parameters.
+"""
+
+from typing import Dict, List, Optional
+
+DEFAULT_EXCHANGER = "default"
+DEFAULT_BUS = "default"
+
+# Sensor roles of one exchanger: T1=Hot_in, T2=Hot_out, T3=Cold_in, T4=Cold_out
+ROLES = ('T1', 'T2', 'T3', 'T4')
+
+
+class PlantConfig:
+    """Parsed plant configuration"""
+
+    def __init__(self, device_mapping: Dict[str, str], exchangers: Dict[str, Dict[str, str]],
+                 buses: Dict[str, List[str]], parameters: Optional[Dict[str, dict]] = None):
+        """
+        Args:
+            device_mapping: Sensor name -> device ID
+            exchangers: Exchanger name -> {role: sensor name}
+            buses: Bus name -> sensor names on that bus
+            parameters: Exchanger name -> extra exchanger settings
+        """
+        self.device_mapping = device_mapping
+        self.exchangers = exchangers
+        self.buses = buses
+        self.parameters = parameters or {}
+
+    def efficiency_key(self, exchanger: str) -> str:
+        """Key of an exchanger's efficiency in a flat reading dictionary"""
+        if exchanger == DEFAULT_EXCHANGER:
+            return 'Efficiency'
+        return f"{exchanger}.Efficiency"
+
+
+def parse_config(raw: dict) -> PlantConfig:
+    """
+    Parse a flat or plant format config file
+
+    Args:
+        raw: Parsed JSON content
+
+    Returns:
+        PlantConfig
+
+    Raises:
+        ValueError: If the config is malformed
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("Config must be a JSON object")
+
+    if "exchangers" not in raw:
+        mapping = dict(raw)
+        return PlantConfig(
+            device_mapping=mapping,
+            exchangers={DEFAULT_EXCHANGER: {name: name for name in mapping}},
+            buses={DEFAULT_BUS: list(mapping)},
+        )
+
+    device_mapping = {}
+    exchangers = {}
+    buses = {}
+    parameters = {}
+    for exchanger, spec in raw["exchangers"].items():
+        if "." in exchanger:
+            raise ValueError(f"Exchanger name '{exchanger}' must not contain '.'")
+        default_bus = spec.get("bus", DEFAULT_BUS)
+        roles = {}
+        for role, sensor in spec.get("sensors", {}).items():
+            if isinstance(sensor, dict):
+                device_id = sensor["id"]
+                bus = sensor.get("bus", default_bus)
+            else:
+                device_id = sensor
+                bus = default_bus
+            name = f"{exchanger}.{role}"
+            device_mapping[name] = device_id
+            roles[role] = name
+            buses.setdefault(bus, []).append(name)
+        exchangers[exchanger] = roles
+        parameters[exchanger] = {key: value for key, value in spec.items() if key not in ("bus", "sensors")}
+
+    return PlantConfig(device_mapping, exchangers, buses, parameters)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Profiling mode for the Temperature Collector
+Times every stage of the monitoring cycle and, with tracemalloc, measures
+the memory each stage allocates. Used by `--profile N` of therm.cli.
+"""
+
+import contextlib
+import time
+import tracemalloc
+from typing import Dict, Optional
+
+from .sinks import SinkWorker
+
+# tracemalloc.reset_peak is available from Python 3.9
+HAS_RESET_PEAK = hasattr(tracemalloc, "reset_peak")
+
+
+class StageStats:
+    """Accumulated time and memory of one stage"""
+
+    __slots__ = ('calls', 'total_time', 'max_time', 'net_bytes', 'peak_bytes')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.net_bytes = 0
+        self.peak_bytes = 0
+
+
+class StageProfiler:
+    """
+    Per-stage time and allocation profiler
+
+    Example:
+        >>> profiler = StageProfiler()
+        >>> workers = {"file": collector.add_sink("file", FileLogSink())}
+        >>> profiler.start()
+        >>> collector.monitor_continuous(0, cycles=100, profiler=profiler)
+        >>> profiler.stop(workers)
+        >>> print(profiler.report())
+    """
+
+    def __init__(self, trace_allocations: bool = True):
+        """
+        Args:
+            trace_allocations: Measure allocations with tracemalloc (slows down every stage)
+        """
+        self.trace_allocations = trace_allocations
+        self.stages: Dict[str, StageStats] = {}
+        self.sinks: Dict[str, dict] = {}
+        self.elapsed = 0.0
+        self._started: Optional[float] = None
+        self._started_tracing = False
+
+    def start(self):
+        """Start tracing allocations and the wall clock"""
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._started = time.perf_counter()
+
+    def stop(self, workers: Optional[Dict[str, SinkWorker]] = None):
+        """
+        Stop tracing
+
+        Args:
+            workers: Optional sink workers (name -> SinkWorker) to report,
+                     best passed after they have been flushed
+        """
+        if self._started is not None:
+            self.elapsed = time.perf_counter() - self._started
+        if workers:
+            self.record_sinks(workers)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def record_sinks(self, workers: Dict[str, SinkWorker]):
+        """Snapshot the throughput and write time of sink workers"""
+        for name, worker in workers.items():
+            self.sinks[name] = dict(worker.stats(), write_time=worker.write_time)
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Time (and trace) the enclosed block as one call of a stage"""
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats()
+        tracing = self.trace_allocations and tracemalloc.is_tracing()
+        if tracing:
+            if HAS_RESET_PEAK:
+                tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                stats.net_bytes += current - before
+                if HAS_RESET_PEAK:
+                    stats.peak_bytes = max(stats.peak_bytes, peak - before)
+
+    def report(self) -> str:
+        """
+        Format the per-stage breakdown
+
+        Returns:
+            Text table with time and memory per stage and the sink throughput
+        """
+        cycles = max((stats.calls for stats in self.stages.values()), default=0)
+        lines = [f"Profile: {cycles} cycles in {self.elapsed:.3f} s"]
+        if self.trace_allocations:
+            lines.append("(tracemalloc enabled: times include tracing overhead, memory includes "
+                         "concurrent sink worker allocations)")
+        lines.append(f"{'stage':<12}{'calls':>7}{'total ms':>11}{'mean ms':>10}{'max ms':>10}"
+                     f"{'net KiB':>10}{'peak KiB':>10}")
+        for name, stats in self.stages.items():
+            mean = stats.total_time / stats.calls if stats.calls else 0.0
+            lines.append(f"{name:<12}{stats.calls:>7}{stats.total_time * 1000:>11.3f}{mean * 1000:>10.3f}"
+                         f"{stats.max_time * 1000:>10.3f}{stats.net_bytes / 1024:>10.1f}"
+                         f"{stats.peak_bytes / 1024:>10.1f}")
+        if self.sinks:
+            lines.append(f"{'sink':<12}{'written':>9}{'dropped':>9}{'errors':>8}{'write ms':>11}")
+            for name, stats in self.sinks.items():
+                lines.append(f"{name:<12}{stats['written']:>9}{stats['dropped']:>9}{stats['errors']:>8}"
+                             f"{stats['write_time'] * 1000:>11.3f}")
+        return "\n".join(lines)
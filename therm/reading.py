@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Compact reading type for the Temperature Collector
+A reading stores one int32 per sensor (and per exchanger efficiency) in
+milli-degrees (milli-percent), at a fixed position taken from the device
+mapping. All readings of a config share one SensorIndex, so a reading is
+a small object plus an array instead of a dictionary of floats.
+
+Readings are mutable mappings of name -> degrees, code written for the
+previous dictionaries keeps working; as_dict() returns a plain copy.
+"""
+
+import json
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Iterable, Iterator, Optional
+
+MISSING = -0x80000000  # int32 marker for a failed sensor read
+_INT32_MAX = 0x7FFFFFFF
+
+
+class SensorIndex:
+    """Fixed positions of the sensor and efficiency values of a reading"""
+
+    __slots__ = ('names', 'positions', 'json_names')
+
+    def __init__(self, names: Iterable[str]):
+        """
+        Args:
+            names: Value names in reading order
+        """
+        self.names = tuple(names)
+        self.positions = {name: i for i, name in enumerate(self.names)}
+        # Encoded once, Reading.to_json only formats the values
+        self.json_names = tuple(json.dumps(name) for name in self.names)
+
+    @classmethod
+    def from_config(cls, config) -> 'SensorIndex':
+        """
+        Index of a plant config: the sensors in config order, then one
+        efficiency per exchanger
+
+        Args:
+            config: PlantConfig
+        """
+        return cls(list(config.device_mapping) +
+                   [config.efficiency_key(exchanger) for exchanger in config.exchangers])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class Reading(MutableMapping):
+    """
+    One set of readings in fixed-point milli-degrees
+
+    Example:
+        >>> reading = Reading(SensorIndex(['T1', 'T2']))
+        >>> reading['T1'] = 85.1234
+        >>> reading['T1'], reading.milli('T1'), reading.as_dict()
+        (85.123, 85123, {'T1': 85.123})
+    """
+
+    __slots__ = ('index', 'raw')
+
+    def __init__(self, index: SensorIndex, values: Optional[Iterable[int]] = None):
+        """
+        Args:
+            index: Shared sensor index
+            values: Milli-degree values in index order (default: all missing)
+        """
+        self.index = index
+        if values is None:
+            self.raw = array('i', [MISSING]) * len(index)
+        else:
+            self.raw = array('i', values)
+
+    def milli(self, name: str) -> int:
+        """Fixed-point value of name, MISSING when it was not read or is not indexed"""
+        position = self.index.positions.get(name)
+        return MISSING if position is None else self.raw[position]
+
+    def set_milli(self, name: str, value: int):
+        """Store a fixed-point value without converting from degrees"""
+        self.raw[self.index.positions[name]] = value
+
+    def __getitem__(self, name: str) -> float:
+        value = self.raw[self.index.positions[name]]
+        if value == MISSING:
+            raise KeyError(name)
+        return value / 1000
+
+    def __setitem__(self, name: str, value: Optional[float]):
+        position = self.index.positions.get(name)
+        if position is None:
+            raise KeyError(f"{name} is not in the sensor index")
+        if value is None:
+            self.raw[position] = MISSING
+            return
+        try:
+            self.raw[position] = int(round(value * 1000))
+        except OverflowError:
+            # Only absurd efficiencies (inlet temperatures nearly equal) get here
+            self.raw[position] = _INT32_MAX if value > 0 else MISSING + 1
+
+    def __delitem__(self, name: str):
+        if name not in self:
+            raise KeyError(name)
+        self.raw[self.index.positions[name]] = MISSING
+
+    def __contains__(self, name) -> bool:
+        position = self.index.positions.get(name)
+        return position is not None and self.raw[position] != MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        for name, value in zip(self.index.names, self.raw):
+            if value != MISSING:
+                yield name
+
+    def __len__(self) -> int:
+        return len(self.raw) - self.raw.count(MISSING)
+
+    def copy(self) -> 'Reading':
+        return Reading(self.index, self.raw)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Plain dictionary copy, name -> degrees"""
+        return {name: value / 1000
+                for name, value in zip(self.index.names, self.raw) if value != MISSING}
+
+    def to_json(self) -> str:
+        """JSON object of the readings, encoded without building a dictionary"""
+        return "{" + ",".join(f"{json_name}:{value / 1000!r}"
+                              for json_name, value in zip(self.index.json_names, self.raw)
+                              if value != MISSING) + "}"
+
+    def __repr__(self) -> str:
+        return f"Reading({self.as_dict()!r})"
+
+
+class ExchangerView(Mapping):
+    """
+    Read-only view of one exchanger's values of a flat reading, keyed by
+    role (T1..T4, Efficiency) instead of sensor name
+    """
+
+    __slots__ = ('reading', 'roles')
+
+    def __init__(self, reading: Mapping, roles: Dict[str, str]):
+        """
+        Args:
+            reading: Flat reading (Reading or dictionary)
+            roles: Role -> name in the flat reading
+        """
+        self.reading = reading
+        self.roles = roles
+
+    def milli(self, role: str) -> int:
+        """Fixed-point value of role, MISSING when it was not read"""
+        name = self.roles.get(role)
+        if isinstance(self.reading, Reading):
+            return self.reading.milli(name)
+        value = self.reading.get(name)
+        return MISSING if value is None else int(round(value * 1000))
+
+    def __getitem__(self, role: str) -> float:
+        return self.reading[self.roles[role]]
+
+    def __contains__(self, role) -> bool:
+        name = self.roles.get(role)
+        return name is not None and name in self.reading
+
+    def __iter__(self) -> Iterator[str]:
+        for role, name in self.roles.items():
+            if name in self.reading:
+                yield role
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Plain dictionary copy, role -> degrees"""
+        return {role: self.reading[name] for role, name in self.roles.items() if name in self.reading}
+
+    def __repr__(self) -> str:
+        return f"ExchangerView({self.as_dict()!r})"
+
+
+def to_json(temperatures: Mapping) -> str:
+    """
+    Encode readings as a JSON object
+
+    Args:
+        temperatures: Reading, ExchangerView or dictionary
+
+    Returns:
+        JSON text
+    """
+    if isinstance(temperatures, Reading):
+        return temperatures.to_json()
+    if isinstance(temperatures, ExchangerView):
+        temperatures = temperatures.as_dict()
+    return json.dumps(temperatures)
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Shared-memory ring of fixed-layout reading records
+
+One acquisition process writes into a ring, any number of processes attach
+to the same shared memory and read it without pipes or serialization. The
+writer never waits for readers; a reader that falls more than a ring length
+behind skips ahead and counts the missed records.
+
+Layout (little-endian):
+    header   magic, version, slots, capacity, record size, write count
+    names    JSON list of the slot (sensor) names, NAMES_SIZE bytes
+    records  capacity x (stamp, timestamp, slots x milli-degrees)
+
+A record stamp is odd while the record is being written and even once it
+is complete (seqlock), so readers can detect torn records.
+"""
+
+import argparse
+import json
+import struct
+import sys
+import threading
+import time
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+
+from .reading import Reading, MISSING
+
+log = logging.getLogger(__name__)
+
+MAGIC = b'HEMR'
+VERSION = 1
+NAMES_SIZE = 4096
+
+_HEADER = struct.Struct('<4sHHIIQ')  # magic, version, slots, capacity, record size, write count
+_WRITE_COUNT_OFFSET = 16
+_WRITE_COUNT = struct.Struct('<Q')
+_STAMP = struct.Struct('<Q')  # first field of every record
+_DATA_OFFSET = _HEADER.size + NAMES_SIZE
+
+_attach_lock = threading.Lock()
+
+
+def _record_struct(slots: int) -> struct.Struct:
+    return struct.Struct(f'<Qd{slots}i')
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without letting this process unlink it on exit"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Python < 3.13 registers attached segments with the resource tracker, which
+    # unlinks them when the attaching process exits. Skip the registration instead
+    # of unregistering, the tracker may be shared with the creating process.
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class RingWriter:
+    """Single writer of a reading ring"""
+
+    def __init__(self, name: str, slot_names: Optional[List[str]] = None,
+                 capacity: int = 4096, create: bool = True):
+        """
+        Create or attach to a ring
+
+        Args:
+            name: Shared memory name
+            slot_names: Sensor names, one fixed slot each (required when creating)
+            capacity: Number of records in the ring
+            create: Create the segment, otherwise attach to an existing one. A stale
+                    ring left by a crashed run is reused if its layout matches,
+                    otherwise replaced
+        """
+        if create:
+            names = json.dumps(slot_names).encode()
+            if len(names) > NAMES_SIZE:
+                raise ValueError(f"Too many sensor names for ring {name}")
+            record = _record_struct(len(slot_names))
+            size = _DATA_OFFSET + capacity * record.size
+            try:
+                self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+                reused = False
+            except FileExistsError:
+                # Left behind by a crashed run: reuse it if the layout is the same
+                self.shm = _reclaim(name, slot_names, capacity, record.size)
+                reused = self.shm is not None
+                if not reused:
+                    self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            if not reused:
+                buf = self.shm.buf
+                buf[_HEADER.size:_HEADER.size + len(names)] = names
+                _HEADER.pack_into(buf, 0, MAGIC, VERSION, len(slot_names), capacity, record.size, 0)
+        else:
+            self.shm = _attach(name)
+
+        _, _, slots, self.capacity, _, self._count = _HEADER.unpack_from(self.shm.buf, 0)
+        self.slot_names = slot_names or _read_names(self.shm.buf)
+        self._index = {slot_name: i for i, slot_name in enumerate(self.slot_names)}
+        self._record = _record_struct(slots)
+        self.owner = create
+
+    def write(self, temperatures: Dict[str, float], timestamp: Optional[float] = None):
+        """
+        Append one record, overwriting the oldest when the ring is full
+
+        Args:
+            temperatures: Sensor name -> degrees, unknown names are ignored
+            timestamp: Epoch time of the reading (default: now)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        if isinstance(temperatures, Reading):
+            # Same fixed-point format, copied without converting
+            values = [temperatures.milli(slot_name) for slot_name in self.slot_names]
+        else:
+            values = [MISSING] * len(self.slot_names)
+            for slot_name, value in temperatures.items():
+                i = self._index.get(slot_name)
+                if i is not None and value is not None:
+                    values[i] = int(round(value * 1000))
+
+        seq = self._count
+        buf = self.shm.buf
+        offset = _DATA_OFFSET + (seq % self.capacity) * self._record.size
+        _STAMP.pack_into(buf, offset, 2 * seq + 1)
+        self._record.pack_into(buf, offset, 2 * seq + 1, timestamp, *values)
+        _STAMP.pack_into(buf, offset, 2 * seq + 2)
+        self._count = seq + 1
+        _WRITE_COUNT.pack_into(buf, _WRITE_COUNT_OFFSET, self._count)
+
+    def close(self):
+        """Detach, and remove the segment if this writer created it"""
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _reclaim(name: str, slot_names: List[str], capacity: int,
+             record_size: int) -> Optional[shared_memory.SharedMemory]:
+    """
+    Take over a stale ring segment
+
+    Returns:
+        The attached segment if its layout matches, otherwise None after
+        unlinking it so it can be created again
+
+    Raises:
+        FileExistsError: If the segment is not a reading ring
+    """
+    # Attached with tracking, the caller owns the segment from now on
+    shm = shared_memory.SharedMemory(name=name)
+    magic, version, slots, old_capacity, old_record_size, count = _HEADER.unpack_from(shm.buf, 0)
+    if magic != MAGIC:
+        shm.close()
+        raise FileExistsError(f"Shared memory {name} exists and is not a reading ring")
+    if (version, old_capacity, old_record_size) == (VERSION, capacity, record_size) \
+            and _read_names(shm.buf) == list(slot_names):
+        log.warning(f"Reusing stale ring {name} ({count} records written)")
+        return shm
+    log.warning(f"Replacing stale ring {name} with a different layout")
+    shm.close()
+    shm.unlink()
+    return None
+
+
+def _read_names(buf) -> List[str]:
+    raw = bytes(buf[_HEADER.size:_HEADER.size + NAMES_SIZE]).rstrip(b'\0')
+    return json.loads(raw.decode())
+
+
+class RingReader:
+    """
+    Reader of a reading ring, usable from any process
+
+    Example:
+        >>> reader = RingReader("hem_default")
+        >>> cursor = 0
+        >>> records, cursor = reader.read_since(cursor)
+    """
+
+    def __init__(self, name: str):
+        """
+        Attach to a ring
+
+        Args:
+            name: Shared memory name
+        """
+        self.name = name
+        self.shm = _attach(name)
+        magic, version, slots, self.capacity, _, _ = _HEADER.unpack_from(self.shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Shared memory {name} is not a reading ring")
+        self.slot_names = _read_names(self.shm.buf)
+        self._record = _record_struct(slots)
+        self.missed = 0
+
+    @property
+    def write_count(self) -> int:
+        """Number of records written so far"""
+        return _WRITE_COUNT.unpack_from(self.shm.buf, _WRITE_COUNT_OFFSET)[0]
+
+    def _read(self, seq: int) -> Optional[Tuple[int, float, tuple]]:
+        """Read record seq straight from shared memory, None if it was overwritten or torn"""
+        buf = self.shm.buf
+        offset = _DATA_OFFSET + (seq % self.capacity) * self._record.size
+        stamp, timestamp, *values = self._record.unpack_from(buf, offset)
+        if stamp != 2 * seq + 2 or _STAMP.unpack_from(buf, offset)[0] != stamp:
+            return None
+        return seq, timestamp, values
+
+    def iter_since(self, cursor: int, end: Optional[int] = None) -> Iterator[Tuple[int, float, list]]:
+        """
+        Iterate over records written since cursor
+
+        Args:
+            cursor: Sequence number of the first record to read (0 for the start)
+            end: Stop before this sequence number (default: current write count)
+
+        Yields:
+            (sequence number, epoch timestamp, milli-degree values by slot)
+        """
+        if end is None:
+            end = self.write_count
+        if end - cursor > self.capacity:
+            skipped = end - self.capacity - cursor
+            self.missed += skipped
+            cursor = end - self.capacity
+        for seq in range(cursor, end):
+            record = self._read(seq)
+            if record is None:
+                # Overwritten while reading, the writer has lapped us
+                self.missed += 1
+                continue
+            yield record
+
+    def read_since(self, cursor: int) -> Tuple[List[Tuple[int, float, list]], int]:
+        """
+        Read records written since cursor
+
+        Args:
+            cursor: Sequence number of the first record to read
+
+        Returns:
+            (records, cursor for the next call)
+        """
+        end = self.write_count
+        return list(self.iter_since(cursor, end)), max(cursor, end)
+
+    def latest_values(self) -> Optional[Tuple[float, list]]:
+        """
+        Get the newest complete record
+
+        Returns:
+            (epoch timestamp, milli-degree values by slot) or None if nothing was written yet
+        """
+        end = self.write_count
+        for seq in range(end - 1, max(end - self.capacity, 0) - 1, -1):
+            record = self._read(seq)
+            if record is not None:
+                return record[1], record[2]
+        return None
+
+    def latest(self) -> Optional[Tuple[float, Dict[str, float]]]:
+        """
+        Get the newest complete record as degrees
+
+        Returns:
+            (epoch timestamp, sensor name -> degrees) or None if nothing was written yet
+        """
+        latest = self.latest_values()
+        if latest is None:
+            return None
+        return latest[0], self.to_temperatures(latest[1])
+
+    def to_temperatures(self, values: list) -> Dict[str, float]:
+        """Convert record values to sensor name -> degrees, leaving out failed reads"""
+        return {slot_name: value / 1000
+                for slot_name, value in zip(self.slot_names, values) if value != MISSING}
+
+    def close(self):
+        """Detach from the ring"""
+        self.shm.close()
+
+
+def tail(name: str, poll_interval: float = 0.5, history: int = 10):
+    """
+    Print records as they are written to a ring
+
+    Args:
+        name: Shared memory name
+        poll_interval: Seconds between polls
+        history: Number of already written records to print first
+    """
+    reader = RingReader(name)
+    cursor = max(reader.write_count - history, 0)
+    try:
+        while True:
+            records, cursor = reader.read_since(cursor)
+            for _, timestamp, values in records:
+                readings = ",".join(f"{slot_name}:{temp:.2f}"
+                                    for slot_name, temp in reader.to_temperatures(values).items())
+                print(f"{datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')},{readings}",
+                      flush=True)
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+def main():
+    """Follow a reading ring: python -m therm.shm_ring <ring name>"""
+    parser = argparse.ArgumentParser(description="Print readings from a shared-memory reading ring")
+    parser.add_argument("ring", help="Ring name, e.g. hem_default")
+    parser.add_argument("--interval", type=float, default=0.5, help="Poll interval in seconds")
+    parser.add_argument("--history", type=int, default=10, help="Number of past records to print first")
+    args = parser.parse_args()
+    try:
+        tail(args.ring, args.interval, args.history)
+    except FileNotFoundError:
+        print(f"Ring {args.ring} not found", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Reading sinks for the Temperature Collector
+Each registered sink runs on its own worker thread with its own queue,
+batching and error policy, so a slow or failing sink never delays
+acquisition or the other sinks.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from typing import Callable, Dict, List, Mapping, Tuple
+import logging
+
+from .reading import to_json
+
+log = logging.getLogger(__name__)
+
+# A sink record: (epoch timestamp, temperature readings), readings are
+# therm.reading.Reading objects from the collector or plain dictionaries
+Record = Tuple[float, Mapping[str, float]]
+
+ERROR_POLICIES = ('drop', 'retry')
+
+
+class PartialWriteError(Exception):
+    """A sink wrote the first records of a batch before failing"""
+
+    def __init__(self, written: int, error: Exception):
+        """
+        Args:
+            written: Number of records written before the failure
+            error: The failure
+        """
+        super().__init__(str(error))
+        self.written = written
+        self.error = error
+
+
+class Sink:
+    """Base class for reading sinks"""
+
+    def write(self, records: List[Record]):
+        """
+        Write a batch of records
+
+        Args:
+            records: List of (timestamp, temperatures), oldest first
+
+        Raises:
+            PartialWriteError: If the first records were written before a failure,
+                               so a retry does not repeat them
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release resources held by the sink"""
+        pass
+
+
+class FileLogSink(Sink):
+    """Append readings to a text log file"""
+
+    def __init__(self, path: str = os.path.join(os.path.dirname(__file__), "temperature_log.txt")):
+        self.path = path
+
+    def write(self, records: List[Record]):
+        lines = []
+        for timestamp, temperatures in records:
+            line = [datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')]
+            for name, temp in temperatures.items():
+                if temp is None:
+                    continue
+                if name == 'Efficiency':
+                    line.append(f"Efficiency:{temp:.1f}%")
+                else:
+                    line.append(f"{name}:{temp:.2f}")
+            lines.append(",".join(line) + "\n")
+        with open(self.path, 'a') as f:
+            f.writelines(lines)
+
+
+class SQLiteSink(Sink):
+    """Store readings in a SQLite database, one row per sensor value"""
+
+    def __init__(self, path: str = "readings.db"):
+        self.path = path
+        self._db = None
+
+    def _connect(self):
+        # Connect lazily so the connection belongs to the worker thread
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS readings ("
+            "timestamp REAL NOT NULL, sensor TEXT NOT NULL, value REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS readings_timestamp ON readings (timestamp)")
+
+    def write(self, records: List[Record]):
+        if self._db is None:
+            self._connect()
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO readings (timestamp, sensor, value) VALUES (?, ?, ?)",
+                [(timestamp, name, value)
+                 for timestamp, temperatures in records
+                 for name, value in temperatures.items()]
+            )
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class CallbackSink(Sink):
+    """Call a function with every reading, e.g. TemperaturePublisher.publish_temperature"""
+
+    def __init__(self, callback: Callable[..., None], with_timestamp: bool = False):
+        """
+        Args:
+            callback: Called with the temperatures of every record
+            with_timestamp: Also pass the record timestamp, callback(temperatures, timestamp),
+                            records are written later than they are taken
+        """
+        self.callback = callback
+        self.with_timestamp = with_timestamp
+
+    def write(self, records: List[Record]):
+        for written, (timestamp, temperatures) in enumerate(records):
+            try:
+                if self.with_timestamp:
+                    self.callback(temperatures, timestamp)
+                else:
+                    self.callback(temperatures)
+            except Exception as e:
+                if written:
+                    raise PartialWriteError(written, e) from e
+                raise
+
+
+class HttpSink(Sink):
+    """POST batches of readings as JSON to a (local) HTTP endpoint"""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def write(self, records: List[Record]):
+        body = ("[" + ",".join(
+            f'{{"timestamp":{json.dumps(timestamp)},"temperatures":{to_json(temperatures)}}}'
+            for timestamp, temperatures in records
+        ) + "]").encode()
+        request = urllib.request.Request(self.url, data=body, method='POST',
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class SinkWorker:
+    """
+    Worker thread feeding one sink from a bounded queue.
+    When the queue is full the oldest record is dropped.
+    """
+
+    def __init__(self, name: str, sink: Sink, maxsize: int = 1000, batch_size: int = 100,
+                 error_policy: str = 'drop', max_retries: int = 3, retry_delay: float = 1.0):
+        """
+        Start a sink worker
+
+        Args:
+            name: Sink name
+            sink: Sink to write to
+            maxsize: Maximum queued records
+            batch_size: Maximum records per write
+            error_policy: 'drop' discards a failed batch, 'retry' retries it
+                          max_retries times with growing delay before dropping it
+            max_retries: Retries per batch for the 'retry' policy
+            retry_delay: First retry delay in seconds
+        """
+        if error_policy not in ERROR_POLICIES:
+            raise ValueError(f"Unknown error policy {error_policy!r}, expected one of {ERROR_POLICIES}")
+        self.name = name
+        self.sink = sink
+        self.batch_size = batch_size
+        self.error_policy = error_policy
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.queue = queue.Queue(maxsize=maxsize)
+        # Counters are updated by the submitting thread and the worker thread
+        self._counter_lock = threading.Lock()
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        # Seconds spent in sink.write, used by the profiling mode
+        self.write_time = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"sink-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: Record):
+        """Queue a record without blocking"""
+        with self._counter_lock:
+            self.submitted += 1
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    continue
+                with self._counter_lock:
+                    self.dropped += 1
+
+    def _next_batch(self) -> List[Record]:
+        """Wait for a record and collect whatever else is queued up to batch_size"""
+        try:
+            batch = [self.queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[Record]):
+        """Write a batch applying the error policy"""
+        attempts = 1 + (self.max_retries if self.error_policy == 'retry' else 0)
+        for attempt in range(attempts):
+            started = time.perf_counter()
+            try:
+                self.sink.write(batch)
+                self._count(written=len(batch))
+                return
+            except Exception as e:
+                if isinstance(e, PartialWriteError):
+                    # Only the records after the written ones are retried
+                    self._count(written=e.written)
+                    batch = batch[e.written:]
+                self._count(errors=1)
+                log.warning(f"Sink {self.name} failed to write {len(batch)} records: {e}")
+            finally:
+                self.write_time += time.perf_counter() - started
+            if attempt + 1 < attempts:
+                # Returns early when stopping, the remaining retries then run back to back
+                self._stop.wait(self.retry_delay * 2 ** attempt)
+        self._count(dropped=len(batch))
+
+    def _count(self, **increments: int):
+        """Add to counters, shared with the submitting thread"""
+        with self._counter_lock:
+            for counter, increment in increments.items():
+                setattr(self, counter, getattr(self, counter) + increment)
+
+    def _run(self):
+        while not (self._stop.is_set() and self.queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+        # Close from the worker thread, sinks may hold thread-bound connections
+        try:
+            self.sink.close()
+        except Exception as e:
+            log.warning(f"Error closing sink {self.name}: {e}")
+
+    def stop(self, timeout: float = 5.0):
+        """Flush queued records, stop the worker and close the sink"""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Throughput and drop counters"""
+        with self._counter_lock:
+            return {
+                'submitted': self.submitted,
+                'written': self.written,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'queued': self.queue.qsize(),
+            }
@@ -4,14 +4,20 @@ Temperature Collector for Heat Exchanger Monitor
 Collects temperature readings from 4 DS18B20 sensors and calculates efficiency
 """
 
+import contextlib
 import json
 import time
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from .mock_w1thermsensor import W1ThermSensor as SimulatedW1ThermSensor
 from .mock_w1thermsensor import Sensor as MockSensor
+from .mock_w1thermsensor import DryRunW1ThermSensor
+from .sinks import Sink, SinkWorker, FileLogSink
+from .plant_config import parse_config, PlantConfig
+from .reading import Reading, SensorIndex, ExchangerView
 import logging
 
 log = logging.getLogger(__name__)
@@ -34,21 +40,35 @@ else:
         from .mock_w1thermsensor import W1ThermSensor, Unit, Sensor
         USING_MOCK = True
 
-
+# Sensor backends: real 1-Wire sensors, simulated sensors, or deterministic
+# sensors without any I/O for capacity checks
+BACKENDS = ('hardware', 'mock', 'dry-run')
 
 
 class TemperatureCollector:
-    def __init__(self, config_file: str = "devicenames.json"):
+    def __init__(self, config_file: str = "devicenames.json", watch_config: bool = True,
+                 backend: Optional[str] = None):
         """
         Initialize temperature collector
         
         Args:
             config_file: Path to JSON file with sensor mappings
+            watch_config: Reload the config file between cycles when it changes
+            backend: One of BACKENDS (default: hardware if available, otherwise mock)
         """
+        if backend is not None and backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
         self.config_file = config_file
-        self.device_mapping = self._load_device_mapping()
+        self.watch_config = watch_config
+        self.backend = backend
+        self._config_path = None
+        self._config_mtime = None
+        self._apply_config(parse_config(self._load_device_mapping()))
         self.sensors = {}
-        self.using_mock = USING_MOCK or USE_MOCK_OVERRIDE
+        self.sinks: Dict[str, SinkWorker] = {}
+        self._bus_executor = None
+        self._bus_workers = 0
+        self._select_backend()
         self._initialize_sensors()
     
     def _get_resource_path(self, relative_path: str) -> str:
@@ -72,8 +92,51 @@ class TemperatureCollector:
         
         return os.path.join(base_path, relative_path)
         
-    def _load_device_mapping(self) -> Dict[str, str]:
-        """Load sensor device mappings from JSON file"""
+    def _select_backend(self):
+        """Select the sensor class and unit of the configured backend"""
+        self._unit = Unit.DEGREES_C
+        if self.backend == 'hardware':
+            # Fails loudly instead of silently falling back to simulated readings
+            from w1thermsensor import W1ThermSensor as HardwareSensor, Unit as HardwareUnit, Sensor as HardwareType
+            self._sensor_class, self._sensor_type = HardwareSensor, HardwareType.DS18B20
+            self._unit = HardwareUnit.DEGREES_C
+            self.using_mock = False
+        elif self.backend == 'mock':
+            self._sensor_class, self._sensor_type = SimulatedW1ThermSensor, MockSensor.DS18B20
+            self.using_mock = True
+        elif self.backend == 'dry-run':
+            self._sensor_class, self._sensor_type = DryRunW1ThermSensor, MockSensor.DS18B20
+            self.using_mock = True
+        else:
+            self._sensor_class, self._sensor_type = W1ThermSensor, Sensor.DS18B20
+            self.using_mock = USING_MOCK or USE_MOCK_OVERRIDE
+
+    def _apply_config(self, config: PlantConfig):
+        """Make a parsed config current, with its reading index and exchanger views"""
+        self.config = config
+        self.device_mapping = config.device_mapping
+        self.index = SensorIndex.from_config(config)
+        self._exchanger_keys = {
+            exchanger: dict(roles, Efficiency=config.efficiency_key(exchanger))
+            for exchanger, roles in config.exchangers.items()
+        }
+
+    def new_reading(self) -> Reading:
+        """Empty reading with the sensor index of the current config"""
+        return Reading(self.index)
+
+    @property
+    def exchangers(self) -> Dict[str, Dict[str, str]]:
+        """Exchanger name -> {role: sensor name}"""
+        return self.config.exchangers
+
+    @property
+    def buses(self) -> Dict[str, List[str]]:
+        """Bus name -> sensor names on that bus"""
+        return self.config.buses
+
+    def _load_device_mapping(self) -> dict:
+        """Load sensor device mappings (flat or plant format, see therm.plant_config) from JSON file"""
         try:
             # Try multiple locations for the config file
             config_paths = [
@@ -100,6 +163,10 @@ class TemperatureCollector:
                     "\n".join(f"  - {path}" for path in config_paths)
                 )
             
+            # Take the mtime before reading, a write during the read then shows
+            # up as a change on the next check instead of being missed
+            self._config_path = config_path
+            self._config_mtime = os.stat(config_path).st_mtime_ns
             with open(config_path, 'r') as f:
                 mapping = json.load(f)
             log.info(f"Loaded device mapping: {mapping}")
@@ -114,17 +181,79 @@ class TemperatureCollector:
     def _initialize_sensors(self):
         """Initialize W1ThermSensor objects for each configured device"""
         for name, device_id in self.device_mapping.items():
-            try:
-                # Extract the sensor ID from the device path (remove "28-" prefix)
-                sensor_id = device_id.replace("28-", "")
-                if 'simulated' in sensor_id.lower():
-                    sensor = SimulatedW1ThermSensor(MockSensor.DS18B20, sensor_id)
-                else:
-                    sensor = W1ThermSensor(Sensor.DS18B20, sensor_id)
-                self.sensors[name] = sensor
-                log.info(f"Initialized sensor {name} (ID: {device_id})")
-            except Exception as e:
-                log.error(f"Failed to initialize sensor {name} (ID: {device_id}): {e}")
+            self._initialize_sensor(name, device_id)
+
+    def _initialize_sensor(self, name: str, device_id: str):
+        """Initialize (or re-initialize) the W1ThermSensor object for a single device"""
+        try:
+            # Extract the sensor ID from the device path (remove "28-" prefix)
+            sensor_id = device_id.replace("28-", "")
+            if 'simulated' in sensor_id.lower() and self.backend != 'dry-run':
+                sensor = SimulatedW1ThermSensor(MockSensor.DS18B20, sensor_id)
+            else:
+                sensor = self._sensor_class(self._sensor_type, sensor_id)
+            self.sensors[name] = sensor
+            log.info(f"Initialized sensor {name} (ID: {device_id})")
+        except Exception as e:
+            # Drop any stale sensor so a failed remap does not keep reading the old device
+            self.sensors.pop(name, None)
+            log.error(f"Failed to initialize sensor {name} (ID: {device_id}): {e}")
+
+    def config_changed(self) -> bool:
+        """
+        Check whether the config file has been modified since it was last loaded
+        
+        Returns:
+            True if the file mtime differs from the loaded one
+        """
+        if not self._config_path:
+            return False
+        try:
+            return os.stat(self._config_path).st_mtime_ns != self._config_mtime
+        except OSError:
+            # File is being replaced (e.g. editor swap file), try again next cycle
+            return False
+
+    def reload_config(self) -> Dict[str, list]:
+        """
+        Reload the device mapping and apply additions, removals and remaps.
+        Only sensors whose device ID changed are re-initialized, all other
+        sensor objects are kept as they are.
+        
+        Returns:
+            Dictionary with 'added', 'removed' and 'remapped' sensor names
+        """
+        old_mapping = self.device_mapping
+        try:
+            new_config = parse_config(self._load_device_mapping())
+        except (FileNotFoundError, json.JSONDecodeError, ValueError, KeyError, AttributeError) as e:
+            # Keep monitoring with the previous mapping; the mtime of the broken
+            # file was taken before reading it, so it is not retried until changed
+            log.error(f"Keeping previous device mapping, reload failed: {e}")
+            return {'added': [], 'removed': [], 'remapped': []}
+
+        new_mapping = new_config.device_mapping
+        changes = {
+            'added': [name for name in new_mapping if name not in old_mapping],
+            'removed': [name for name in old_mapping if name not in new_mapping],
+            'remapped': [name for name in new_mapping
+                         if name in old_mapping and new_mapping[name] != old_mapping[name]],
+        }
+
+        for name in changes['removed']:
+            self.sensors.pop(name, None)
+            log.info(f"Removed sensor {name} (ID: {old_mapping[name]})")
+        for name in changes['added'] + changes['remapped']:
+            self._initialize_sensor(name, new_mapping[name])
+
+        self._apply_config(new_config)
+        log.info(f"Reloaded device mapping: {changes}")
+        return changes
+
+    def _check_config_reload(self):
+        """Apply config file changes between monitoring cycles"""
+        if self.watch_config and self.config_changed():
+            self.reload_config()
 
     def read_temperature(self, sensor_name: str, unit = None) -> Optional[float]:
         """
@@ -143,7 +272,7 @@ class TemperatureCollector:
             
         # Set default unit if not provided
         if unit is None:
-            unit = Unit.DEGREES_C
+            unit = self._unit
             
         try:
             temperature = self.sensors[sensor_name].get_temperature(unit)
@@ -153,23 +282,51 @@ class TemperatureCollector:
             log.error(f"Error reading {sensor_name}: {e}")
             return None
             
-    def read_all_temperatures(self) -> Dict[str, float]:
+    def read_bus(self, bus: str, reading: Optional[Reading] = None) -> Reading:
+        """
+        Read temperatures from all sensors on one bus
+        
+        Args:
+            bus: Bus name
+            reading: Reading to fill in (default: a new one)
+            
+        Returns:
+            Reading with the sensor names of the bus as keys and temperatures as values
+        """
+        if reading is None:
+            reading = self.new_reading()
+        for sensor_name in self.buses.get(bus, []):
+            temp = self.read_temperature(sensor_name)
+            if temp is not None:
+                reading[sensor_name] = temp
+        return reading
+
+    def read_all_temperatures(self) -> Reading:
         """
         Read temperatures from all configured sensors
+        Buses are read in parallel, one worker per bus
         
         Returns:
-            Dictionary with sensor names as keys and temperatures as values
+            Reading with sensor names as keys and temperatures as values, in config order
         """
-        temperatures = {}
         log.info(f"Reading temperatures at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         log.info("-" * 50)
 
-        for sensor_name in self.device_mapping.keys():
-            temp = self.read_temperature(sensor_name)
-            if temp is not None:
-                temperatures[sensor_name] = temp
-                
-        return temperatures
+        reading = self.new_reading()
+        buses = list(self.buses)
+        if len(buses) == 1:
+            self.read_bus(buses[0], reading)
+        else:
+            # One worker per bus, recreated when a config reload adds buses
+            if self._bus_executor is None or self._bus_workers < len(buses):
+                if self._bus_executor is not None:
+                    self._bus_executor.shutdown(wait=False)
+                self._bus_executor = ThreadPoolExecutor(max_workers=len(buses),
+                                                        thread_name_prefix="w1-bus")
+                self._bus_workers = len(buses)
+            # Every bus fills its own slots of the shared reading
+            list(self._bus_executor.map(lambda bus: self.read_bus(bus, reading), buses))
+        return reading
         
     def calculate_efficiency(self, temperatures: Dict[str, float]) -> Optional[float]:
         """
@@ -218,103 +375,174 @@ class TemperatureCollector:
             log.error(f"Error calculating efficiency: {e}")
             return None
             
-    def monitor_continuous(self, interval: int = 30, callback=None):
+    def exchanger_readings(self, temperatures: Dict[str, float]) -> Dict[str, ExchangerView]:
+        """
+        Group flat sensor readings by exchanger, without copying them
+        
+        Args:
+            temperatures: Flat reading (or dictionary) with sensor names as keys
+            
+        Returns:
+            Dictionary with exchanger names as keys and {role: temperature} views as values,
+            including the exchanger efficiency if present in temperatures
+        """
+        return {exchanger: ExchangerView(temperatures, keys)
+                for exchanger, keys in self._exchanger_keys.items()}
+
+    def calculate_exchanger_efficiencies(self, temperatures: Dict[str, float]) -> Dict[str, Optional[float]]:
+        """
+        Calculate the efficiency of every configured exchanger
+        
+        Args:
+            temperatures: Flat dictionary with sensor names as keys
+            
+        Returns:
+            Dictionary with exchanger names as keys and efficiency percentages (or None) as values
+        """
+        return {
+            exchanger: self.calculate_efficiency(group)
+            for exchanger, group in self.exchanger_readings(temperatures).items()
+        }
+
+    def add_efficiencies(self, temperatures: Dict[str, float]) -> Dict[str, Optional[float]]:
+        """
+        Calculate all exchanger efficiencies and add them to the flat readings
+        ('Efficiency' for a single exchanger, '<exchanger>.Efficiency' otherwise)
+        
+        Args:
+            temperatures: Flat dictionary with sensor names as keys, updated in place
+            
+        Returns:
+            Dictionary with exchanger names as keys and efficiency percentages (or None) as values
+        """
+        efficiencies = self.calculate_exchanger_efficiencies(temperatures)
+        for exchanger, efficiency in efficiencies.items():
+            temperatures[self.config.efficiency_key(exchanger)] = efficiency
+        return efficiencies
+
+    def add_sink(self, name: str, sink: Sink, **options) -> SinkWorker:
+        """
+        Register a sink receiving every reading on its own worker thread
+        
+        Args:
+            name: Sink name
+            sink: Sink instance (see therm.sinks)
+            **options: SinkWorker options (maxsize, batch_size, error_policy, ...)
+            
+        Returns:
+            The started sink worker
+        """
+        if name in self.sinks:
+            self.remove_sink(name)
+        worker = SinkWorker(name, sink, **options)
+        self.sinks[name] = worker
+        log.info(f"Added sink {name} ({type(sink).__name__})")
+        return worker
+
+    def remove_sink(self, name: str):
+        """Flush and stop a registered sink"""
+        worker = self.sinks.pop(name, None)
+        if worker:
+            worker.stop()
+            log.info(f"Removed sink {name}")
+
+    def close_sinks(self):
+        """Flush and stop all registered sinks"""
+        for name in list(self.sinks):
+            self.remove_sink(name)
+
+    def sink_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-sink throughput and drop counters
+        
+        Returns:
+            Dictionary with sink names as keys and counter dictionaries as values
+        """
+        return {name: worker.stats() for name, worker in self.sinks.items()}
+
+    def dispatch(self, temperatures: Dict[str, float], timestamp: Optional[float] = None):
+        """
+        Hand a reading to all registered sinks without blocking
+        
+        Args:
+            temperatures: Temperature readings (and efficiency)
+            timestamp: Epoch time of the reading (default: now)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        for worker in self.sinks.values():
+            worker.submit((timestamp, temperatures))
+
+    def monitor_continuous(self, interval: int = 30, callback=None, source=None,
+                           cycles: Optional[int] = None, profiler=None, record_source=None):
         """
         Continuously monitor temperatures and efficiency
         
+        Readings are handed to the registered sinks. If no sink is registered
+        a file log sink is added.
+        
         Args:
             interval: Reading interval in seconds
+            callback: Optional function called with every reading on the monitoring thread
+            source: Optional function returning the readings instead of read_all_temperatures
+            cycles: Stop after this many cycles (default: run until interrupted)
+            profiler: Optional StageProfiler (see therm.profiling) timing every cycle stage
+            record_source: Optional function returning the (timestamp, reading) records
+                           acquired since its last call, each dispatched with its own
+                           timestamp, e.g. MultiProcessAcquisition.read_records
         """
+        if source is None:
+            source = self.read_all_temperatures
+        stage = profiler.stage if profiler else lambda name: contextlib.nullcontext()
         log.info(f"Starting continuous monitoring (interval: {interval}s)")
         log.info("Press Ctrl+C to stop")
+
+        if not self.sinks:
+            self.add_sink('file', FileLogSink())
         
         try:
-            while True:
-                temperatures = self.read_all_temperatures()
+            cycle = 0
+            while cycles is None or cycle < cycles:
+                with stage('config'):
+                    self._check_config_reload()
+                with stage('read'):
+                    if record_source is not None:
+                        records = record_source()
+                    else:
+                        records = [(None, source())]
                 
-                if temperatures:
-                    efficiency = self.calculate_efficiency(temperatures)
-                    temperatures['Efficiency'] = efficiency
+                for timestamp, temperatures in records:
+                    if temperatures:
+                        with stage('efficiency'):
+                            self.add_efficiencies(temperatures)
+                        
+                        with stage('dispatch'):
+                            self.dispatch(temperatures, timestamp)
                     
-                    # Log to file (optional)
-                    self._log_reading(temperatures, efficiency)
-                
-                if callback:
-                    callback(temperatures)
+                    if callback:
+                        with stage('callback'):
+                            callback(temperatures)
 
+                cycle += 1
+                if cycles is not None and cycle >= cycles:
+                    break
                 log.info(f"Next reading in {interval} seconds...")
                 time.sleep(interval)
                 
         except KeyboardInterrupt:
             log.info("Monitoring stopped by user")
-
-    def _log_reading(self, temperatures: Dict[str, float], efficiency: Optional[float]):
-        """Log reading to file (optional feature)"""
-        try:
-            log_file = os.path.join(os.path.dirname(__file__), "temperature_log.txt")
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            with open(log_file, 'a') as f:
-                f.write(f"{timestamp}")
-                for name, temp in temperatures.items():
-                    f.write(f",{name}:{temp:.2f}")
-                if efficiency is not None:
-                    f.write(f",Efficiency:{efficiency:.1f}%")
-                f.write("\n")
-                
-        except Exception as e:
-            log.warning(f"Could not write to log file: {e}")
+        finally:
+            self.close_sinks()
+            if self._bus_executor is not None:
+                self._bus_executor.shutdown(wait=False)
+                self._bus_executor = None
 
 
 def main():
-    """Main function"""
-    # set logger format 
-    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-    # output to console
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
-    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    logging.getLogger().addHandler(console_handler)
-
-    try:
-        # Initialize collector
-        collector = TemperatureCollector()
-        
-        # Show mode information
-        mode = "MOCK MODE" if collector.using_mock else "HARDWARE MODE"
-        print(f"\n=== Temperature Collector {mode} ===")
-        
-        if collector.using_mock:
-            print("Tip: Set environment variable USE_MOCK_SENSORS=false to use real hardware")
-        
-        # Single reading
-        log.info("\n=== Single Temperature Reading ===")
-        temperatures = collector.read_all_temperatures()
-        
-        if temperatures:
-            efficiency = collector.calculate_efficiency(temperatures)
-            log.info(f"temperature reading: {temperatures}, efficiency: {efficiency:.1f}%")
-        
-        # Ask if user wants continuous monitoring
-        log.info("\n" + "="*50)
-        response = input("Start continuous monitoring? (y/N): ").lower()
-        
-        if response in ['y', 'yes']:
-            try:
-                interval = int(input("Enter reading interval in seconds (default 30): ") or "30")
-                collector.monitor_continuous(interval)
-            except ValueError:
-                log.warning("Invalid interval, using default (30s)")
-                collector.monitor_continuous(30)
-        else:
-            log.info("Single reading complete.")
-
-    except Exception as e:
-        log.error(f"Error: {e}")
-        return 1
-        
-    return 0
+    """Console entry point, see therm.cli"""
+    from .cli import main as cli_main
+    return cli_main()
 
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(main())